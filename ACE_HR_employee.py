@@ -0,0 +1,249 @@
+# Employee dimensions and facts; waits on the source loads it reads
+from airflow import DAG
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+
+from ace_hr.common import dag_args, finish_dag
+from ace_hr.datasets import wait_for
+
+with DAG("ACE_HR_employee", **dag_args()) as dag:
+
+    loaddimemployee = BigQueryOperator(
+        task_id="loaddimemployee",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimEmployee`();"
+    )
+
+    loaddimlocation = BigQueryOperator(
+        task_id="loaddimlocation",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimLocation`();"
+    )
+
+    loaddimcertificate = BigQueryOperator(
+        task_id="loaddimcertificate",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimCertificate`();"
+    )
+
+    loaddimjobactionreason = BigQueryOperator(
+        task_id="loaddimjobactionreason",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimJobActionReason`();"
+    )
+
+    loaddimjobcode = BigQueryOperator(
+        task_id="loaddimjobcode",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimJobCode`();"
+    )
+
+    loaddimjobjunk = BigQueryOperator(
+        task_id="loaddimjobjunk",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimJobJunk`();"
+    )
+
+    loaddimdepartment = BigQueryOperator(
+        task_id="loaddimdepartment",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimDepartment`();"
+    )
+
+    loadfactcertificateexpiration = BigQueryOperator(
+        task_id="loadfactcertificateexpiration",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactCertificateExpiration`();"
+    )
+
+    loadfactjobaction = BigQueryOperator(
+        task_id="loadfactjobaction",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactJobAction`();"
+    )
+
+    loadfactjobfamily = BigQueryOperator(
+        task_id="loadfactjobfamily",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactJobFamily`();"
+    )
+
+    loadfactterminationtype = BigQueryOperator(
+        task_id="loadfactterminationtype",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactTerminationType`();"
+    )
+
+    loademployeecompensation = BigQueryOperator(
+        task_id="loademployeecompensation",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadEmployeeCompensation`();"
+    )
+
+    loadfactemployeecompensation = BigQueryOperator(
+        task_id="loadfactemployeecompensation",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactEmployeeCompensation`();"
+    )
+
+    loaddimcompensationratetype = BigQueryOperator(
+        task_id="loaddimcompensationratetype",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimCompensationRateType`();"
+    )
+
+    loadfactemployeecensusmonthly = BigQueryOperator(
+        task_id="loadfactemployeecensusmonthly",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactEmployeeCensusMonthly`();"
+    )
+
+    loaddimmonth = BigQueryOperator(
+        task_id="loaddimmonth",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimMonth`();"
+    )
+
+    loaddimjobcodehistoric = BigQueryOperator(
+        task_id="loaddimjobcodehistoric",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimJobCodeHistoric`();"
+    )
+
+    loaddimdateincremental = BigQueryOperator(
+        task_id="loaddimdateincremental",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimDateIncremental`();"
+    )
+
+# --------------------- LoadDimCertificate Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_JPM_CAT_ITEMS") >> loaddimcertificate
+
+# --------------------- LoadDimCompensationRateType Transform -----------------------
+loademployeecompensation >> loaddimcompensationratetype
+
+# --------------------- LoadDimDepartment Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_DEPT_TBL") >> loaddimdepartment
+
+# --------------------- LoadDimEmployee Transform -----------------------
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_JOB_DESCRIPTIONS") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_MARITAL_STATUSES") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_RACES") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_WORKER_BASE") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_WORKER_HOMEBRANCH") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_WORKER_STATUSES") >> loaddimemployee
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_WORKER_TYPES") >> loaddimemployee
+loaddimlocation >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_ADDRESSES") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_DEPT_TBL") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_DIVERS_ETHNIC") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_EMAIL_ADDRESSES") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_EMPLOYEES") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_ETHNIC_GRP_TBL") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBCODE_TBL") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_LOCATION_TBL") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PER_ORG_ASGN") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PERS_DATA_EFFDT") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PERS_NID") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PERSON") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PERSON_NAME") >> loaddimemployee
+wait_for(dag, "HRPRD_SC.dbo_PS_PERSON_PHONE") >> loaddimemployee
+wait_for(dag, "FSPRD_SC.dbo_XLATTABLE_VW") >> loaddimemployee
+
+# --------------------- LoadDimJobActionReason Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_ACTION_TBL") >> loaddimjobactionreason
+wait_for(dag, "HRPRD_SC.dbo_PS_ACTN_REASON_TBL") >> loaddimjobactionreason
+
+# --------------------- LoadDimJobCode Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB_FAMILY_TBL") >> loaddimjobcode
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBCODE_TBL") >> loaddimjobcode
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBFUNCTION_TBL") >> loaddimjobcode
+
+# --------------------- LoadDimJobCodeHistoric Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB_FAMILY_TBL") >> loaddimjobcodehistoric
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBCODE_TBL") >> loaddimjobcodehistoric
+
+# --------------------- LoadDimJobJunk Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loaddimjobjunk
+wait_for(dag, "HRPRD_SC.dbo_PS_PAYGROUP_TBL") >> loaddimjobjunk
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL") >> loaddimjobjunk
+wait_for(dag, "HRPRD_SC.dbo_PSXLATITEM") >> loaddimjobjunk
+
+# --------------------- LoadDimLocation Transform -----------------------
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_AGENCIES") >> loaddimlocation
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_AGENCIES_SERVICELINES_BRANCHES") >> loaddimlocation
+wait_for(dag, "HCHB_AMEDISYS_SC.dbo_BRANCHES") >> loaddimlocation
+wait_for(dag, "HCHB_INFINITY_SC.dbo_BRANCHES") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_BUS_UNIT_TBL_FS") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_EMAIL_ADDRESSES") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_LOCATION_TBL") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_PERSON_NAME") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_LOCATION_TBL") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_POD_CD_TBL") >> loaddimlocation
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_REGION_TBL") >> loaddimlocation
+wait_for(dag, "FSPRD_SC.dbo_PS_Z_AGNCY_INT_TBL") >> loaddimlocation
+wait_for(dag, "Agency_SC.dbo_Agency") >> loaddimlocation
+wait_for(dag, "Agency_SC.dbo_StandingType") >> loaddimlocation
+wait_for(dag, "Agency_SC.dbo_Status") >> loaddimlocation
+
+# --------------------- LoadDimMonth Transform -----------------------
+loaddimdateincremental >> loaddimmonth
+
+# --------------------- LoadEmployeeCompensation Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_COMP_RATECD_TBL") >> loademployeecompensation
+wait_for(dag, "HRPRD_SC.dbo_PS_COMPENSATION") >> loademployeecompensation
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loademployeecompensation
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBCD_COMP_RATE") >> loademployeecompensation
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_LOCATION_TBL") >> loademployeecompensation
+wait_for(dag, "HRPRD_SC.dbo_PSXLATITEM") >> loademployeecompensation
+
+# --------------------- LoadFactCertificateExpiration Transform -----------------------
+loaddimcertificate >> loadfactcertificateexpiration
+loaddimemployee >> loadfactcertificateexpiration
+loaddimlocation >> loadfactcertificateexpiration
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loadfactcertificateexpiration
+wait_for(dag, "HRPRD_SC.dbo_PS_JPM_CAT_ITEMS") >> loadfactcertificateexpiration
+wait_for(dag, "HRPRD_SC.dbo_PS_JPM_JP_ITEMS") >> loadfactcertificateexpiration
+wait_for(dag, "HRPRD_SC.dbo_PS_JPM_PROFILE") >> loadfactcertificateexpiration
+
+# --------------------- LoadFactEmployeeCensusMonthly Transform -----------------------
+loaddimemployee >> loadfactemployeecensusmonthly
+loaddimjobactionreason >> loadfactemployeecensusmonthly
+loaddimjobcode >> loadfactemployeecensusmonthly
+loaddimjobcodehistoric >> loadfactemployeecensusmonthly
+loaddimmonth >> loadfactemployeecensusmonthly
+loadfactjobaction >> loadfactemployeecensusmonthly
+
+# --------------------- LoadFactEmployeeCompensation Transform -----------------------
+loaddimcompensationratetype >> loadfactemployeecompensation
+loaddimemployee >> loadfactemployeecompensation
+loaddimjobcode >> loadfactemployeecompensation
+loaddimlocation >> loadfactemployeecompensation
+loademployeecompensation >> loadfactemployeecompensation
+
+# --------------------- LoadFactJobAction Transform -----------------------
+loaddimdateincremental >> loadfactjobaction
+loaddimdepartment >> loadfactjobaction
+loaddimemployee >> loadfactjobaction
+loaddimjobactionreason >> loadfactjobaction
+loaddimjobcode >> loadfactjobaction
+loaddimjobjunk >> loadfactjobaction
+loaddimlocation >> loadfactjobaction
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loadfactjobaction
+wait_for(dag, "HRPRD_SC.dbo_PS_PER_ORG_ASGN") >> loadfactjobaction
+wait_for(dag, "HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL") >> loadfactjobaction
+
+# --------------------- LoadFactJobFamily Transform -----------------------
+loaddimdateincremental >> loadfactjobfamily
+loaddimjobcode >> loadfactjobfamily
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB_FAMILY_TBL") >> loadfactjobfamily
+wait_for(dag, "HRPRD_SC.dbo_PS_JOBCODE_TBL") >> loadfactjobfamily
+
+# --------------------- LoadFactTerminationType Transform -----------------------
+loaddimdateincremental >> loadfactterminationtype
+loaddimjobactionreason >> loadfactterminationtype
+wait_for(dag, "HRPRD_SC.dbo_PS_ACTION_TBL") >> loadfactterminationtype
+wait_for(dag, "HRPRD_SC.dbo_PS_ACTN_REASON_TBL") >> loadfactterminationtype
+
+finish_dag(dag)
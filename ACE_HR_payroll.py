@@ -0,0 +1,147 @@
+# Paycheck dimensions and facts; waits on the pay merges and employee dimensions
+from airflow import DAG
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+
+from ace_hr.common import dag_args, finish_dag
+from ace_hr.datasets import wait_for
+from ace_hr.operators import BigQueryProcedureGroupOperator
+
+with DAG("ACE_HR_payroll", **dag_args()) as dag:
+
+    loadpaycheck = BigQueryOperator(
+        task_id="loadpaycheck",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadPaycheck`();"
+    )
+
+    loadpaycheckearnings = BigQueryOperator(
+        task_id="loadpaycheckearnings",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadPaycheckEarnings`();"
+    )
+
+    loadpaychecktax = BigQueryOperator(
+        task_id="loadpaychecktax",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadPaycheckTax`();"
+    )
+
+    loadfactpaychecktax = BigQueryOperator(
+        task_id="loadfactpaychecktax",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactPaycheckTax`();"
+    )
+
+    loadfactpaychecksummary = BigQueryOperator(
+        task_id="loadfactpaychecksummary",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactPaycheckSummary`();"
+    )
+
+    loadfactpaycheckearnings = BigQueryOperator(
+        task_id="loadfactpaycheckearnings",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactPaycheckEarnings`();"
+    )
+
+    loadfactpaycheckdeduction = BigQueryOperator(
+        task_id="loadfactpaycheckdeduction",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadFactPaycheckDeduction`();"
+    )
+
+    # LoadDimTaxClass and LoadDimTaxAuthority take seconds and only read
+    # the output of LoadPaycheckTax, so they run together in one task
+    loaddimtaxgroup = BigQueryProcedureGroupOperator(
+        task_id="loaddimtaxgroup",
+        procedures=[
+            "amed-dev-analyticsplatform.ETLConfigACE.LoadDimTaxClass",
+            "amed-dev-analyticsplatform.ETLConfigACE.LoadDimTaxAuthority"
+        ]
+    )
+
+    loaddimpaycheck = BigQueryOperator(
+        task_id="loaddimpaycheck",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimPaycheck`();"
+    )
+
+    loaddimearningstype = BigQueryOperator(
+        task_id="loaddimearningstype",
+        use_legacy_sql=False,
+        sql="CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimEarningsType`();"
+    )
+
+    # The small deduction dimensions are independent of each other and
+    # share one task
+    loaddimdeductiongroup = BigQueryProcedureGroupOperator(
+        task_id="loaddimdeductiongroup",
+        procedures=[
+            "amed-dev-analyticsplatform.ETLConfigACE.LoadDimBenefitPlan",
+            "amed-dev-analyticsplatform.ETLConfigACE.LoadDimDeductionClass",
+            "amed-dev-analyticsplatform.ETLConfigACE.LoadDimDeductionType"
+        ]
+    )
+
+# --------------------- LoadDimDeductionGroup Transform (LoadDimBenefitPlan, LoadDimDeductionClass, LoadDimDeductionType) -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_BENEF_PLAN_TBL") >> loaddimdeductiongroup
+wait_for(dag, "HRPRD_SC.dbo_PS_DEDUCTION_TBL") >> loaddimdeductiongroup
+wait_for(dag, "HRPRD_SC.dbo_PSXLATITEM") >> loaddimdeductiongroup
+
+# --------------------- LoadDimEarningsType Transform -----------------------
+loadpaycheckearnings >> loaddimearningstype
+wait_for(dag, "HRPRD_SC.dbo_PS_EARNINGS_SPCL") >> loaddimearningstype
+
+# --------------------- LoadDimPaycheck Transform -----------------------
+loadpaycheck >> loaddimpaycheck
+
+# --------------------- LoadDimTaxGroup Transform (LoadDimTaxAuthority, LoadDimTaxClass) -----------------------
+loadpaychecktax >> loaddimtaxgroup
+
+# --------------------- LoadFactPaycheckDeduction Transform -----------------------
+loaddimdeductiongroup >> loadfactpaycheckdeduction
+loaddimpaycheck >> loadfactpaycheckdeduction
+loadfactpaychecksummary >> loadfactpaycheckdeduction
+wait_for(dag, "HRPRD_SC.dbo_PS_PAY_DEDUCTION") >> loadfactpaycheckdeduction
+
+# --------------------- LoadFactPaycheckEarnings Transform -----------------------
+wait_for(dag, "ETLConfigACE.LoadDimDepartment") >> loadfactpaycheckearnings
+loaddimearningstype >> loadfactpaycheckearnings
+wait_for(dag, "ETLConfigACE.LoadDimJobCode") >> loadfactpaycheckearnings
+wait_for(dag, "ETLConfigACE.LoadDimLocation") >> loadfactpaycheckearnings
+loaddimpaycheck >> loadfactpaycheckearnings
+loadfactpaychecksummary >> loadfactpaycheckearnings
+loadpaycheckearnings >> loadfactpaycheckearnings
+
+# --------------------- LoadFactPaycheckSummary Transform -----------------------
+wait_for(dag, "ETLConfigACE.LoadDimEmployee") >> loadfactpaychecksummary
+wait_for(dag, "ETLConfigACE.LoadDimJobCode") >> loadfactpaychecksummary
+wait_for(dag, "ETLConfigACE.LoadDimLocation") >> loadfactpaychecksummary
+loadpaycheck >> loadfactpaychecksummary
+
+# --------------------- LoadFactPaycheckTax Transform -----------------------
+loaddimpaycheck >> loadfactpaychecktax
+loaddimtaxgroup >> loadfactpaychecktax
+loadfactpaychecksummary >> loadfactpaychecktax
+loadpaychecktax >> loadfactpaychecktax
+
+# --------------------- LoadPaycheck Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_JOB") >> loadpaycheck
+wait_for(dag, "HRPRD_SC.dbo_PS_LEAVE_ACCRUAL") >> loadpaycheck
+wait_for(dag, "HRPRD_SC.dbo_PS_PAY_CHECK") >> loadpaycheck
+wait_for(dag, "HRPRD_SC.dbo_PS_PAYGROUP_TBL") >> loadpaycheck
+wait_for(dag, "HRPRD_SC.dbo_PSXLATITEM") >> loadpaycheck
+
+# --------------------- LoadPaycheckEarnings Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_ACCT_CD_TBL") >> loadpaycheckearnings
+wait_for(dag, "HRPRD_SC.dbo_PS_EARNINGS_TBL") >> loadpaycheckearnings
+wait_for(dag, "HRPRD_SC.dbo_PS_PAY_EARNINGS") >> loadpaycheckearnings
+wait_for(dag, "HRPRD_SC.dbo_PS_PAY_OTH_EARNS") >> loadpaycheckearnings
+
+# --------------------- LoadPaycheckTax Transform -----------------------
+wait_for(dag, "HRPRD_SC.dbo_PS_LOCAL_TAX_TBL") >> loadpaychecktax
+wait_for(dag, "HRPRD_SC.dbo_PS_PAY_TAX") >> loadpaychecktax
+wait_for(dag, "HRPRD_SC.dbo_PS_STATE_TBL") >> loadpaychecktax
+wait_for(dag, "HRPRD_SC.dbo_PSXLATITEM") >> loadpaychecktax
+
+finish_dag(dag)
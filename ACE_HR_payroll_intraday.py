@@ -0,0 +1,49 @@
+# Intraday micro-batches of the incremental pay tables. Every 30 minutes, stages
+# the rows modified at the source since the last cycle, using the tables'
+# last-modified columns from the pay_modified_columns Variable, and merges them
+# by key. Tables without one are left to the nightly load, as are rows deleted
+# at the source. With no table configured, each cycle is skipped. Runs with its own staging and _MAX tables, and skips the
+# full-refresh source and dimension loads.
+# Each cycle logs its batch size and latency to ETLConfigACE.PayBatchLog.
+from airflow import DAG
+from airflow.operators.python_operator import PythonOperator
+
+from ace_hr.common import dag_args, default_args, finish_dag, pay_modified_columns
+from ace_hr.payincrement import modified_tables, no_modified_tables, pay_increment, record_pay_batch
+
+INTRADAY_MODE = "intraday"
+
+with DAG(
+    "ACE_HR_payroll_intraday",
+    **dag_args(
+        schedule_interval="*/30 * * * *",
+        # A cycle that fails is picked up by the next one, so no retry storm
+        # and no catch-up of missed cycles
+        default_args=dict(default_args, retries=1, email_on_retry=False),
+        concurrency=10,
+        max_active_runs=1,
+        catchup=False
+    )
+) as dag:
+
+    names = modified_tables(pay_modified_columns)
+    # The truncates create the intraday staging tables on first use
+    firsts = []
+    if not names:
+        PythonOperator(
+            task_id="no_modified_tables",
+            python_callable=no_modified_tables,
+            provide_context=True
+        )
+
+    for name in names:
+        first, merge = pay_increment(name, mode=INTRADAY_MODE, modified_column=pay_modified_columns[name])
+        firsts.append(first.task_id)
+        merge >> PythonOperator(
+            task_id="record_pay_{}_batch".format(name),
+            python_callable=record_pay_batch,
+            op_kwargs={"name": name, "mode": INTRADAY_MODE},
+            provide_context=True
+        )
+
+finish_dag(dag, ddl_task_ids=firsts)
@@ -0,0 +1,87 @@
+# Source table loads from Agency (AceIntegration_PROD03_GCP)
+from airflow import DAG
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+
+from ace_hr.common import dag_args, finish_dag, template, driverJars, driverClassName, \
+    connectionURL, bigQueryLoadingTemporaryDirectory, username, password
+from ace_hr.readiness import hold_until_ready
+from ace_hr.schemas import check_source_schemas
+
+with DAG("ACE_HR_sources_agency", **dag_args()) as dag:
+
+    agency_dbo_agency_truncate = BigQueryOperator(
+        task_id="agency_dbo_agency_truncate",
+        use_legacy_sql=False,
+        sql="truncate table Agency_SC.dbo_Agency"
+    )
+
+    agency_dbo_agency_etl = DataflowTemplateOperator(
+        task_id="agency_dbo_agency_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegration_PROD03_GCP.Agency.dbo_Agency",
+            "outputTable": "amed-dev-analyticsplatform:Agency_SC.dbo_Agency",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    agency_dbo_standingtype_truncate = BigQueryOperator(
+        task_id="agency_dbo_standingtype_truncate",
+        use_legacy_sql=False,
+        sql="truncate table Agency_SC.dbo_StandingType"
+    )
+
+    agency_dbo_standingtype_etl = DataflowTemplateOperator(
+        task_id="agency_dbo_standingtype_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegration_PROD03_GCP.Agency.dbo_StandingType",
+            "outputTable": "amed-dev-analyticsplatform:Agency_SC.dbo_StandingType",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    agency_dbo_status_truncate = BigQueryOperator(
+        task_id="agency_dbo_status_truncate",
+        use_legacy_sql=False,
+        sql="truncate table Agency_SC.dbo_Status"
+    )
+
+    agency_dbo_status_etl = DataflowTemplateOperator(
+        task_id="agency_dbo_status_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegration_PROD03_GCP.Agency.dbo_Status",
+            "outputTable": "amed-dev-analyticsplatform:Agency_SC.dbo_Status",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+# --------------------- Source Table Loads (Agency) ---------------------------
+agency_dbo_agency_truncate >> agency_dbo_agency_etl
+agency_dbo_standingtype_truncate >> agency_dbo_standingtype_etl
+agency_dbo_status_truncate >> agency_dbo_status_etl
+
+# --------------------- Source Schemas -----------------------
+check_source_schemas(dag, "agency")
+
+# --------------------- Source Readiness -----------------------
+hold_until_ready(dag, "agency")
+
+finish_dag(dag)
@@ -0,0 +1,265 @@
+# Source table loads from HCHB (AceIntegration_GCP: HCHBA and HCHBI)
+from airflow import DAG
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+
+from ace_hr.common import dag_args, finish_dag, template, driverJars, driverClassName, \
+    connectionURL, connectionURL2, bigQueryLoadingTemporaryDirectory, username, password
+from ace_hr.readiness import hold_until_ready
+from ace_hr.schemas import check_source_schemas
+
+with DAG("ACE_HR_sources_hchb", **dag_args()) as dag:
+
+    hchba_dbo_agencies_truncate = BigQueryOperator(
+        task_id="hchba_dbo_agencies_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_AGENCIES"
+    )
+
+    hchba_dbo_agencies_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_agencies_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_AGENCIES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_AGENCIES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_agencies_servicelines_branches_truncate = BigQueryOperator(
+        task_id="hchba_dbo_agencies_servicelines_branches_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_AGENCIES_SERVICELINES_BRANCHES"
+    )
+
+    hchba_dbo_agencies_servicelines_branches_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_agencies_servicelines_branches_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_AGENCIES_SERVICELINES_BRANCHES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_AGENCIES_SERVICELINES_BRANCHES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_branches_truncate = BigQueryOperator(
+        task_id="hchba_dbo_branches_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_BRANCHES"
+    )
+
+    hchba_dbo_branches_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_branches_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_BRANCHES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_BRANCHES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_job_descriptions_truncate = BigQueryOperator(
+        task_id="hchba_dbo_job_descriptions_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_JOB_DESCRIPTIONS"
+    )
+
+    hchba_dbo_job_descriptions_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_job_descriptions_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_JOB_DESCRIPTIONS",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_JOB_DESCRIPTIONS",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_marital_statuses_truncate = BigQueryOperator(
+        task_id="hchba_dbo_marital_statuses_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_MARITAL_STATUSES"
+    )
+
+    hchba_dbo_marital_statuses_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_marital_statuses_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_MARITAL_STATUSES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_MARITAL_STATUSES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_races_truncate = BigQueryOperator(
+        task_id="hchba_dbo_races_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_RACES"
+    )
+
+    hchba_dbo_races_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_races_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_RACES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_RACES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_worker_base_truncate = BigQueryOperator(
+        task_id="hchba_dbo_worker_base_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_WORKER_BASE"
+    )
+
+    hchba_dbo_worker_base_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_worker_base_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_WORKER_BASE",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_WORKER_BASE",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_worker_homebranch_truncate = BigQueryOperator(
+        task_id="hchba_dbo_worker_homebranch_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_WORKER_HOMEBRANCH"
+    )
+
+    hchba_dbo_worker_homebranch_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_worker_homebranch_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_WORKER_HOMEBRANCH",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_WORKER_HOMEBRANCH",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_worker_statuses_truncate = BigQueryOperator(
+        task_id="hchba_dbo_worker_statuses_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_WORKER_STATUSES"
+    )
+
+    hchba_dbo_worker_statuses_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_worker_statuses_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_WORKER_STATUSES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_WORKER_STATUSES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchba_dbo_worker_types_truncate = BigQueryOperator(
+        task_id="hchba_dbo_worker_types_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_AMEDISYS_SC.dbo_WORKER_TYPES"
+    )
+
+    hchba_dbo_worker_types_etl = DataflowTemplateOperator(
+        task_id="hchba_dbo_worker_types_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBA.dbo_WORKER_TYPES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_AMEDISYS_SC.dbo_WORKER_TYPES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    hchbi_dbo_branches_truncate = BigQueryOperator(
+        task_id="hchbi_dbo_branches_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HCHB_INFINITY_SC.dbo_BRANCHES"
+    )
+
+    hchbi_dbo_branches_etl = DataflowTemplateOperator(
+        task_id="hchbi_dbo_branches_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL2,
+            "query": "SELECT * FROM AceIntegration_GCP.HCHBI.dbo_BRANCHES",
+            "outputTable": "amed-dev-analyticsplatform:HCHB_INFINITY_SC.dbo_BRANCHES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+# --------------------- Source Table Loads (HCHBA) ---------------------------
+hchba_dbo_agencies_truncate >> hchba_dbo_agencies_etl
+hchba_dbo_agencies_servicelines_branches_truncate >> hchba_dbo_agencies_servicelines_branches_etl
+hchba_dbo_branches_truncate >> hchba_dbo_branches_etl
+hchba_dbo_job_descriptions_truncate >> hchba_dbo_job_descriptions_etl
+hchba_dbo_marital_statuses_truncate >> hchba_dbo_marital_statuses_etl
+hchba_dbo_races_truncate >> hchba_dbo_races_etl
+hchba_dbo_worker_base_truncate >> hchba_dbo_worker_base_etl
+hchba_dbo_worker_homebranch_truncate >> hchba_dbo_worker_homebranch_etl
+hchba_dbo_worker_statuses_truncate >> hchba_dbo_worker_statuses_etl
+hchba_dbo_worker_types_truncate >> hchba_dbo_worker_types_etl
+
+# --------------------- Source Table Loads (HCHBI) ---------------------------
+hchbi_dbo_branches_truncate >> hchbi_dbo_branches_etl
+
+# --------------------- Source Schemas -----------------------
+check_source_schemas(dag, "hchb")
+
+# --------------------- Source Readiness -----------------------
+hold_until_ready(dag, "hchb")
+
+finish_dag(dag)
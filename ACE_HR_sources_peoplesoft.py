@@ -0,0 +1,938 @@
+# Source table loads from PeopleSoft HR (AceIntegrationPROD09_GCP), including the
+# incremental pay tables
+from airflow import DAG
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+from airflow.operators.python_operator import PythonOperator
+
+from ace_hr.common import dag_args, finish_dag, checkpoint_location, project_id, template, \
+    driverJars, driverClassName, connectionURL, bigQueryLoadingTemporaryDirectory, username, \
+    password
+from ace_hr.layout import apply_layouts, log_merge_bytes_report
+from ace_hr.operators import ChunkedDataflowTemplateOperator
+from ace_hr.payincrement import PAY_TABLES, pay_increment
+from ace_hr.readiness import hold_until_ready
+from ace_hr.schemas import check_source_schemas
+
+with DAG("ACE_HR_sources_peoplesoft", **dag_args()) as dag:
+
+    peoplesoft_dbo_ps_acct_cd_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_acct_cd_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_ACCT_CD_TBL"
+    )
+
+    peoplesoft_dbo_ps_acct_cd_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_acct_cd_tbl_etl",
+        template=template,
+        priority_weight=1000,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_ACCT_CD_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ACCT_CD_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_action_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_action_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_ACTION_TBL"
+    )
+
+    peoplesoft_dbo_ps_action_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_action_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_ACTION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ACTION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_actn_reason_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_actn_reason_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_ACTN_REASON_TBL"
+    )
+
+    peoplesoft_dbo_ps_actn_reason_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_actn_reason_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_ACTN_REASON_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ACTN_REASON_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_addresses_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_addresses_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_ADDRESSES"
+    )
+
+    peoplesoft_dbo_ps_addresses_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_addresses_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_ADDRESSES",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ADDRESSES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_benef_plan_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_benef_plan_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_BENEF_PLAN_TBL"
+    )
+
+    peoplesoft_dbo_ps_benef_plan_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_benef_plan_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_BENEF_PLAN_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_BENEF_PLAN_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_bus_unit_tbl_fs_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_bus_unit_tbl_fs_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_BUS_UNIT_TBL_FS"
+    )
+
+    peoplesoft_dbo_ps_bus_unit_tbl_fs_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_bus_unit_tbl_fs_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_BUS_UNIT_TBL_FS",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_BUS_UNIT_TBL_FS",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_comp_ratecd_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_comp_ratecd_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_COMP_RATECD_TBL"
+    )
+
+    peoplesoft_dbo_ps_comp_ratecd_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_comp_ratecd_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_COMP_RATECD_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_COMP_RATECD_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_compensation_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_compensation_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_COMPENSATION"
+    )
+
+    peoplesoft_dbo_ps_compensation_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_compensation_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_COMPENSATION",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_COMPENSATION",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_deduction_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_deduction_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_DEDUCTION_TBL"
+    )
+
+    peoplesoft_dbo_ps_deduction_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_deduction_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_DEDUCTION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_DEDUCTION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_dept_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_dept_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_DEPT_TBL"
+    )
+
+    peoplesoft_dbo_ps_dept_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_dept_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_DEPT_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_DEPT_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_divers_ethnic_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_divers_ethnic_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_DIVERS_ETHNIC"
+    )
+
+    peoplesoft_dbo_ps_divers_ethnic_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_divers_ethnic_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_DIVERS_ETHNIC",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_DIVERS_ETHNIC",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_earnings_spcl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_earnings_spcl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_EARNINGS_SPCL"
+    )
+
+    peoplesoft_dbo_ps_earnings_spcl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_earnings_spcl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_EARNINGS_SPCL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_EARNINGS_SPCL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_earnings_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_earnings_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_EARNINGS_TBL"
+    )
+
+    peoplesoft_dbo_ps_earnings_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_earnings_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_EARNINGS_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_EARNINGS_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_email_addresses_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_email_addresses_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_EMAIL_ADDRESSES"
+    )
+
+    peoplesoft_dbo_ps_email_addresses_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_email_addresses_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_EMAIL_ADDRESSES",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_EMAIL_ADDRESSES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_employees_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_employees_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_EMPLOYEES"
+    )
+
+    peoplesoft_dbo_ps_employees_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_employees_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_EMPLOYEES",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_EMPLOYEES",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_ethnic_grp_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_ethnic_grp_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_ETHNIC_GRP_TBL"
+    )
+
+    peoplesoft_dbo_ps_ethnic_grp_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_ethnic_grp_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_ETHNIC_GRP_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ETHNIC_GRP_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_job_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_job_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JOB"
+    )
+
+    # Loaded in EFFDT chunks so a retry only reloads the chunks that did not land
+    peoplesoft_dbo_ps_job_etl = ChunkedDataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_job_etl",
+        template=template,
+        chunk_column="EFFDT",
+        chunk_bounds=["2010-01-01", "2015-01-01", "2018-01-01", "2020-01-01", "2022-01-01", "2024-01-01"],
+        manifest_location=checkpoint_location,
+        max_parallel_chunks=4,
+        # A rerun of the truncate starts a fresh manifest
+        reset_by="peoplesoft_dbo_ps_job_truncate",
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOB",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_job_family_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_job_family_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JOB_FAMILY_TBL"
+    )
+
+    peoplesoft_dbo_ps_job_family_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_job_family_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB_FAMILY_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOB_FAMILY_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jobcd_comp_rate_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jobcd_comp_rate_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JOBCD_COMP_RATE"
+    )
+
+    peoplesoft_dbo_ps_jobcd_comp_rate_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jobcd_comp_rate_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOBCD_COMP_RATE",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOBCD_COMP_RATE",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jobcode_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jobcode_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JOBCODE_TBL"
+    )
+
+    peoplesoft_dbo_ps_jobcode_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jobcode_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOBCODE_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOBCODE_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jobfunction_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jobfunction_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JOBFUNCTION_TBL"
+    )
+
+    peoplesoft_dbo_ps_jobfunction_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jobfunction_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOBFUNCTION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOBFUNCTION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jpm_cat_items_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jpm_cat_items_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JPM_CAT_ITEMS"
+    )
+
+    peoplesoft_dbo_ps_jpm_cat_items_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jpm_cat_items_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JPM_CAT_ITEMS",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JPM_CAT_ITEMS",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jpm_jp_items_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jpm_jp_items_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JPM_JP_ITEMS"
+    )
+
+    peoplesoft_dbo_ps_jpm_jp_items_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jpm_jp_items_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JPM_JP_ITEMS",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JPM_JP_ITEMS",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_jpm_profile_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_jpm_profile_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_JPM_PROFILE"
+    )
+
+    peoplesoft_dbo_ps_jpm_profile_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_jpm_profile_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JPM_PROFILE",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JPM_PROFILE",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_leave_accrual_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_leave_accrual_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_LEAVE_ACCRUAL"
+    )
+
+    peoplesoft_dbo_ps_leave_accrual_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_leave_accrual_etl",
+        template=template,
+        priority_weight=1000,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_LEAVE_ACCRUAL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_LEAVE_ACCRUAL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_local_tax_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_local_tax_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_LOCAL_TAX_TBL"
+    )
+
+    peoplesoft_dbo_ps_local_tax_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_local_tax_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_LOCAL_TAX_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_LOCAL_TAX_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_location_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_location_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_LOCATION_TBL"
+    )
+
+    peoplesoft_dbo_ps_location_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_location_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_LOCATION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_LOCATION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    # Creates the partitioned, clustered pay targets or migrates existing ones
+    # to the layout declared in ace_hr.layout.TABLE_LAYOUTS
+    pay_table_layout = PythonOperator(
+        task_id="pay_table_layout",
+        python_callable=apply_layouts,
+        op_kwargs={"project": project_id},
+        priority_weight=1000
+    )
+
+    # Incremental pay tables: staged from the PAY_END_DT watermark and merged
+    # by their MergePay* procedure, or on the row hash once listed in
+    # pay_row_hash_merges, see ace_hr.payincrement
+    pay_increments = [pay_increment(name) for name in PAY_TABLES]
+
+    # Logs bytes processed per pay merge, old procedure calls vs row-hash merges
+    pay_merge_bytes_report = PythonOperator(
+        task_id="pay_merge_bytes_report",
+        python_callable=log_merge_bytes_report
+    )
+
+    peoplesoft_dbo_ps_paygroup_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_paygroup_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PAYGROUP_TBL"
+    )
+
+    peoplesoft_dbo_ps_paygroup_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_paygroup_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PAYGROUP_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PAYGROUP_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_per_org_asgn_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_per_org_asgn_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PER_ORG_ASGN"
+    )
+
+    peoplesoft_dbo_ps_per_org_asgn_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_per_org_asgn_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PER_ORG_ASGN",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PER_ORG_ASGN",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_pers_data_effdt_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_pers_data_effdt_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PERS_DATA_EFFDT"
+    )
+
+    peoplesoft_dbo_ps_pers_data_effdt_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_pers_data_effdt_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PERS_DATA_EFFDT",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PERS_DATA_EFFDT",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_pers_nid_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_pers_nid_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PERS_NID"
+    )
+
+    peoplesoft_dbo_ps_pers_nid_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_pers_nid_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PERS_NID",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PERS_NID",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_person_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_person_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PERSON"
+    )
+
+    peoplesoft_dbo_ps_person_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_person_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PERSON",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PERSON",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_person_name_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_person_name_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PERSON_NAME"
+    )
+
+    peoplesoft_dbo_ps_person_name_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_person_name_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PERSON_NAME",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PERSON_NAME",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_person_phone_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_person_phone_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_PERSON_PHONE"
+    )
+
+    peoplesoft_dbo_ps_person_phone_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_person_phone_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PERSON_PHONE",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_PERSON_PHONE",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_state_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_state_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_STATE_TBL"
+    )
+
+    peoplesoft_dbo_ps_state_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_state_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_STATE_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_STATE_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_z_acq_cd_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_z_acq_cd_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL"
+    )
+
+    peoplesoft_dbo_ps_z_acq_cd_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_z_acq_cd_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_Z_ACQ_CD_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_z_location_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_z_location_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_Z_LOCATION_TBL"
+    )
+
+    peoplesoft_dbo_ps_z_location_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_z_location_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_Z_LOCATION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_Z_LOCATION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_z_pod_cd_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_z_pod_cd_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_Z_POD_CD_TBL"
+    )
+
+    peoplesoft_dbo_ps_z_pod_cd_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_z_pod_cd_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_Z_POD_CD_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_Z_POD_CD_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_ps_z_region_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_z_region_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PS_Z_REGION_TBL"
+    )
+
+    peoplesoft_dbo_ps_z_region_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_z_region_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_Z_REGION_TBL",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_Z_REGION_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoft_dbo_psxlatitem_truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_psxlatitem_truncate",
+        use_legacy_sql=False,
+        sql="truncate table HRPRD_SC.dbo_PSXLATITEM"
+    )
+
+    peoplesoft_dbo_psxlatitem_etl = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_psxlatitem_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PSXLATITEM",
+            "outputTable": "amed-dev-analyticsplatform:HRPRD_SC.dbo_PSXLATITEM",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+# --------------------- Source Table Loads (HRPRD) ---------------------------
+peoplesoft_dbo_ps_acct_cd_tbl_truncate >> peoplesoft_dbo_ps_acct_cd_tbl_etl
+peoplesoft_dbo_ps_action_tbl_truncate >> peoplesoft_dbo_ps_action_tbl_etl
+peoplesoft_dbo_ps_actn_reason_tbl_truncate >> peoplesoft_dbo_ps_actn_reason_tbl_etl
+peoplesoft_dbo_ps_addresses_truncate >> peoplesoft_dbo_ps_addresses_etl
+peoplesoft_dbo_ps_benef_plan_tbl_truncate >> peoplesoft_dbo_ps_benef_plan_tbl_etl
+peoplesoft_dbo_ps_bus_unit_tbl_fs_truncate >> peoplesoft_dbo_ps_bus_unit_tbl_fs_etl
+peoplesoft_dbo_ps_comp_ratecd_tbl_truncate >> peoplesoft_dbo_ps_comp_ratecd_tbl_etl
+peoplesoft_dbo_ps_compensation_truncate >> peoplesoft_dbo_ps_compensation_etl
+peoplesoft_dbo_ps_deduction_tbl_truncate >> peoplesoft_dbo_ps_deduction_tbl_etl
+peoplesoft_dbo_ps_dept_tbl_truncate >> peoplesoft_dbo_ps_dept_tbl_etl
+peoplesoft_dbo_ps_divers_ethnic_truncate >> peoplesoft_dbo_ps_divers_ethnic_etl
+peoplesoft_dbo_ps_earnings_spcl_truncate >> peoplesoft_dbo_ps_earnings_spcl_etl
+peoplesoft_dbo_ps_earnings_tbl_truncate >> peoplesoft_dbo_ps_earnings_tbl_etl
+peoplesoft_dbo_ps_email_addresses_truncate >> peoplesoft_dbo_ps_email_addresses_etl
+peoplesoft_dbo_ps_employees_truncate >> peoplesoft_dbo_ps_employees_etl
+peoplesoft_dbo_ps_ethnic_grp_tbl_truncate >> peoplesoft_dbo_ps_ethnic_grp_tbl_etl
+peoplesoft_dbo_ps_job_truncate >> peoplesoft_dbo_ps_job_etl
+peoplesoft_dbo_ps_job_family_tbl_truncate >> peoplesoft_dbo_ps_job_family_tbl_etl
+peoplesoft_dbo_ps_jobcd_comp_rate_truncate >> peoplesoft_dbo_ps_jobcd_comp_rate_etl
+peoplesoft_dbo_ps_jobcode_tbl_truncate >> peoplesoft_dbo_ps_jobcode_tbl_etl
+peoplesoft_dbo_ps_jobfunction_tbl_truncate >> peoplesoft_dbo_ps_jobfunction_tbl_etl
+peoplesoft_dbo_ps_jpm_cat_items_truncate >> peoplesoft_dbo_ps_jpm_cat_items_etl
+peoplesoft_dbo_ps_jpm_jp_items_truncate >> peoplesoft_dbo_ps_jpm_jp_items_etl
+peoplesoft_dbo_ps_jpm_profile_truncate >> peoplesoft_dbo_ps_jpm_profile_etl
+peoplesoft_dbo_ps_leave_accrual_truncate >> peoplesoft_dbo_ps_leave_accrual_etl
+peoplesoft_dbo_ps_local_tax_tbl_truncate >> peoplesoft_dbo_ps_local_tax_tbl_etl
+peoplesoft_dbo_ps_location_tbl_truncate >> peoplesoft_dbo_ps_location_tbl_etl
+peoplesoft_dbo_ps_paygroup_tbl_truncate >> peoplesoft_dbo_ps_paygroup_tbl_etl
+peoplesoft_dbo_ps_per_org_asgn_truncate >> peoplesoft_dbo_ps_per_org_asgn_etl
+peoplesoft_dbo_ps_pers_data_effdt_truncate >> peoplesoft_dbo_ps_pers_data_effdt_etl
+peoplesoft_dbo_ps_pers_nid_truncate >> peoplesoft_dbo_ps_pers_nid_etl
+peoplesoft_dbo_ps_person_truncate >> peoplesoft_dbo_ps_person_etl
+peoplesoft_dbo_ps_person_name_truncate >> peoplesoft_dbo_ps_person_name_etl
+peoplesoft_dbo_ps_person_phone_truncate >> peoplesoft_dbo_ps_person_phone_etl
+peoplesoft_dbo_ps_state_tbl_truncate >> peoplesoft_dbo_ps_state_tbl_etl
+peoplesoft_dbo_ps_z_acq_cd_tbl_truncate >> peoplesoft_dbo_ps_z_acq_cd_tbl_etl
+peoplesoft_dbo_ps_z_location_tbl_truncate >> peoplesoft_dbo_ps_z_location_tbl_etl
+peoplesoft_dbo_ps_z_pod_cd_tbl_truncate >> peoplesoft_dbo_ps_z_pod_cd_tbl_etl
+peoplesoft_dbo_ps_z_region_tbl_truncate >> peoplesoft_dbo_ps_z_region_tbl_etl
+peoplesoft_dbo_psxlatitem_truncate >> peoplesoft_dbo_psxlatitem_etl
+pay_table_layout >> [first for first, merge in pay_increments]
+[merge for first, merge in pay_increments] >> pay_merge_bytes_report
+
+# --------------------- Source Schemas -----------------------
+check_source_schemas(dag, "peoplesoft")
+
+# --------------------- Source Readiness -----------------------
+hold_until_ready(dag, "peoplesoft")
+
+finish_dag(dag)
@@ -0,0 +1,65 @@
+# Source table loads from PeopleSoft Financials (AceIntegrationFN92_GCP)
+from airflow import DAG
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+
+from ace_hr.common import dag_args, finish_dag, template, driverJars, driverClassName, \
+    connectionURL, bigQueryLoadingTemporaryDirectory, username, password
+from ace_hr.readiness import hold_until_ready
+from ace_hr.schemas import check_source_schemas
+
+with DAG("ACE_HR_sources_peoplesoftfs", **dag_args()) as dag:
+
+    peoplesoftfs_dbo_ps_z_agncy_int_tbl_truncate = BigQueryOperator(
+        task_id="peoplesoftfs_dbo_ps_z_agncy_int_tbl_truncate",
+        use_legacy_sql=False,
+        sql="truncate table FSPRD_SC.dbo_PS_Z_AGNCY_INT_TBL"
+    )
+
+    peoplesoftfs_dbo_ps_z_agncy_int_tbl_etl = DataflowTemplateOperator(
+        task_id="peoplesoftfs_dbo_ps_z_agncy_int_tbl_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationFN92_GCP.PeopleSoftFS.dbo_PS_Z_AGNCY_INT_TBL",
+            "outputTable": "amed-dev-analyticsplatform:FSPRD_SC.dbo_PS_Z_AGNCY_INT_TBL",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    peoplesoftfs_dbo_xlattable_vw_truncate = BigQueryOperator(
+        task_id="peoplesoftfs_dbo_xlattable_vw_truncate",
+        use_legacy_sql=False,
+        sql="truncate table FSPRD_SC.dbo_XLATTABLE_VW"
+    )
+
+    peoplesoftfs_dbo_xlattable_vw_etl = DataflowTemplateOperator(
+        task_id="peoplesoftfs_dbo_xlattable_vw_etl",
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": "SELECT * FROM AceIntegrationFN92_GCP.PeopleSoftFS.dbo_XLATTABLE_VW",
+            "outputTable": "amed-dev-analyticsplatform:FSPRD_SC.dbo_XLATTABLE_VW",
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+# --------------------- Source Table Loads (FSPRD) ---------------------------
+peoplesoftfs_dbo_ps_z_agncy_int_tbl_truncate >> peoplesoftfs_dbo_ps_z_agncy_int_tbl_etl
+peoplesoftfs_dbo_xlattable_vw_truncate >> peoplesoftfs_dbo_xlattable_vw_etl
+
+# --------------------- Source Schemas -----------------------
+check_source_schemas(dag, "peoplesoftfs")
+
+# --------------------- Source Readiness -----------------------
+hold_until_ready(dag, "peoplesoftfs")
+
+finish_dag(dag)
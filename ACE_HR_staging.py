@@ -0,0 +1,36 @@
+# Staging-area upkeep. Reports what the Dataflow staging prefixes hold, then
+# sweeps the per-job prefixes that failed jobs abandoned, see ace_hr.staging.
+# The age limit comes from the staging_max_age_hours Variable (default 24).
+from airflow import DAG
+from airflow.operators.python_operator import PythonOperator
+
+from ace_hr.common import dag_args, default_args, temp_location, bigQueryLoadingTemporaryDirectory
+from ace_hr.staging import log_staging_usage, sweep_staging
+
+STAGING_LOCATIONS = [temp_location, bigQueryLoadingTemporaryDirectory]
+
+with DAG(
+    "ACE_HR_staging",
+    **dag_args(
+        default_args=dict(default_args, retries=1, email_on_retry=False),
+        catchup=False
+    )
+) as dag:
+
+    staging_usage_report = PythonOperator(
+        task_id="staging_usage_report",
+        python_callable=log_staging_usage,
+        op_kwargs={"locations": STAGING_LOCATIONS}
+    )
+
+    sweep_abandoned_staging = PythonOperator(
+        task_id="sweep_abandoned_staging",
+        python_callable=sweep_staging,
+        op_kwargs={
+            "locations": STAGING_LOCATIONS,
+            "max_age_hours": "{{ var.value.get('staging_max_age_hours', 24) }}"
+        }
+    )
+
+# --------------------- Staging Upkeep -----------------------
+staging_usage_report >> sweep_abandoned_staging
@@ -0,0 +1,3 @@
+# Helper modules shared by the ACE HR DAGs. The dags folder is on sys.path,
+# so the DAG files import these as ace_hr.<module>. The folder is listed in
+# .airflowignore so the scheduler does not parse it looking for DAGs.
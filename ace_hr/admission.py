@@ -0,0 +1,256 @@
+"""Quota-aware admission control for Dataflow launches.
+
+The DAG's concurrency caps the number of running tasks, not the resources
+their Dataflow jobs take. When thirty jobs start together they can run
+past the regional vCPU quota or the free addresses of the shared VPC
+subnetwork, and then many of them fail at once.
+
+Before each launch the AdmissionController adds up the projected usage of
+every active job in the region. Pending and queued jobs count too, so
+jobs that were admitted but have no workers yet are included. The launch
+only goes ahead if it fits under the configured quotas. Otherwise admit()
+raises AdmissionDeferred, and the task gives up its worker slot and is
+rescheduled (reschedule_on_deferral) to check again, the way a
+reschedule-mode sensor waits.
+
+A launch that was admitted does not show up in the job list straight
+away. Admitted launches are therefore reserved under a lock shared by all
+workers (VariableReservationStore), and the check counts the reservations
+with the active jobs. Tasks admitted at the same moment are checked one
+after another, never against the same headroom. The jobs are listed
+before the lock is taken, so no lock is held across Dataflow API calls;
+a reservation is only left out of a check whose own listing already
+shows its job. A reservation ends when the launch returns or fails, or
+after reservation_ttl in case its worker died.
+"""
+import collections
+import contextlib
+import json
+import logging
+import re
+import datetime
+import threading
+import time
+
+# vCPUs per worker for the predefined machine families used with the JDBC
+# template; custom types carry the count in their name (custom-4-16384)
+SHARED_CORE_VCPUS = {'f1-micro': 1, 'g1-small': 1, 'e2-micro': 2, 'e2-small': 2, 'e2-medium': 2}
+
+Usage = collections.namedtuple('Usage', ['vcpus', 'ips', 'jobs'])
+
+log = logging.getLogger(__name__)
+
+
+def machine_vcpus(machine_type):
+    machine_type = machine_type.rsplit('/', 1)[-1]
+    if machine_type in SHARED_CORE_VCPUS:
+        return SHARED_CORE_VCPUS[machine_type]
+    match = re.search(r'custom-(\d+)-\d+', machine_type) or re.search(r'-(\d+)$', machine_type)
+    return int(match.group(1)) if match else 1
+
+
+def projected_usage(max_workers, machine_type):
+    # Each worker VM takes one address from the subnetwork
+    return Usage(vcpus=max_workers * machine_vcpus(machine_type), ips=max_workers, jobs=1)
+
+
+def total(usages):
+    return Usage(*[sum(values) for values in zip(Usage(0, 0, 0), *usages)])
+
+
+class AdmissionDeferred(Exception):
+    """No headroom for the launch yet; delay is the seconds until the next check."""
+
+    def __init__(self, message, delay):
+        super(AdmissionDeferred, self).__init__(message)
+        self.delay = delay
+
+
+class AdmissionTimeout(Exception):
+    pass
+
+
+class MemoryReservationStore(object):
+    """Reservations shared by the controllers of one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reservations = {}
+
+    @contextlib.contextmanager
+    def locked(self):
+        with self._lock:
+            yield self.reservations
+
+
+class VariableReservationStore(object):
+    """Keeps the reservations in an Airflow Variable, locked with SELECT ... FOR UPDATE.
+
+    Every worker admitting a launch locks the same row of the metadata
+    database until it has made its decision, so the check and the
+    reservation are one step. Nothing but the decision happens under the
+    lock.
+    """
+
+    def __init__(self, key='dataflow_reservations'):
+        self.key = key
+
+    @contextlib.contextmanager
+    def locked(self):
+        from airflow.models import Variable
+        from airflow.utils.db import create_session
+        from sqlalchemy.exc import IntegrityError
+        with create_session() as session:
+            if not session.query(Variable).filter(Variable.key == self.key).count():
+                # Another worker may create the row first
+                try:
+                    session.add(Variable(key=self.key, val='{}'))
+                    session.commit()
+                except IntegrityError:
+                    session.rollback()
+            variable = session.query(Variable).filter(Variable.key == self.key).with_for_update().one()
+            reservations = json.loads(variable.val or '{}')
+            yield reservations
+            variable.val = json.dumps(reservations, sort_keys=True)
+
+
+class AdmissionController(object):
+    """Holds launches until the region has headroom for them.
+
+    quotas maps 'vcpus', 'ips' and 'jobs' to limits; a missing key is not
+    enforced, and any other key is a ValueError. Active jobs whose worker
+    settings can't be read are costed with default_max_workers workers of
+    default_machine_type. A deferred launch is checked again after
+    poll_interval seconds.
+    """
+
+    def __init__(self, service, project, quotas, default_max_workers=10,
+                 default_machine_type='n1-standard-1', poll_interval=60,
+                 store=None, reservation_ttl=15 * 60, num_retries=0, clock=time.time):
+        unknown = sorted(set(quotas) - set(Usage._fields))
+        if unknown:
+            raise ValueError("Unknown dataflow_quotas keys {}, expected some of {}".format(
+                unknown, list(Usage._fields)))
+        invalid = sorted(key for key, limit in quotas.items()
+                         if isinstance(limit, bool) or not isinstance(limit, int) or limit < 0)
+        if invalid:
+            raise ValueError("dataflow_quotas limits must be non-negative integers: {}".format(
+                dict((key, quotas[key]) for key in invalid)))
+        self.service = service
+        self.project = project
+        self.quotas = quotas
+        self.default_max_workers = default_max_workers
+        self.default_machine_type = default_machine_type
+        self.poll_interval = poll_interval
+        self.store = store if store is not None else MemoryReservationStore()
+        self.reservation_ttl = reservation_ttl
+        self.num_retries = num_retries
+        self._clock = clock
+        self._costs = {}
+
+    def _job_usage(self, region, job):
+        if job['id'] not in self._costs:
+            described = self.service.projects().locations().jobs().get(
+                projectId=self.project, location=region, jobId=job['id'],
+                view='JOB_VIEW_DESCRIPTION'
+            ).execute(num_retries=self.num_retries)
+            pools = described.get('environment', {}).get('workerPools', [])
+            pool = pools[0] if pools else {}
+            max_workers = (pool.get('autoscalingSettings', {}).get('maxNumWorkers')
+                           or pool.get('numWorkers') or self.default_max_workers)
+            self._costs[job['id']] = projected_usage(
+                int(max_workers), pool.get('machineType') or self.default_machine_type)
+        return self._costs[job['id']]
+
+    def demand(self, environment):
+        # Projected usage of a launch with the given RuntimeEnvironment
+        return projected_usage(int(environment.get('maxWorkers') or self.default_max_workers),
+                               environment.get('machineType') or self.default_machine_type)
+
+    def active_jobs(self, region):
+        jobs = self.service.projects().locations().jobs()
+        request = jobs.list(projectId=self.project, location=region, filter='ACTIVE')
+        active = []
+        while request is not None:
+            response = request.execute(num_retries=self.num_retries)
+            active.extend(response.get('jobs', []))
+            request = jobs.list_next(previous_request=request, previous_response=response)
+        return active
+
+    def active_usage(self, region):
+        return total(self._job_usage(region, job) for job in self.active_jobs(region))
+
+    def fits(self, usage, demand):
+        projected = total([usage, demand])
+        return all(getattr(projected, key) <= limit for key, limit in self.quotas.items())
+
+    def _reserved_usage(self, reservations, region, active_names, name):
+        # Drops the reservations that expired and the stale one of a retried
+        # launch with the same name. A reservation whose job this check
+        # lists is counted as that job; it stays for the other workers,
+        # whose listing may be older.
+        now = self._clock()
+        for key, reservation in list(reservations.items()):
+            if key == name or reservation['expires'] <= now:
+                del reservations[key]
+        return total(Usage(*[reservation[field] for field in Usage._fields])
+                     for key, reservation in reservations.items()
+                     if reservation['region'] == region and key not in active_names)
+
+    def admit(self, region, demand, name=None):
+        """Admits demand if it fits next to the region's active jobs and reservations.
+
+        Raises AdmissionDeferred when it does not fit yet, and ValueError
+        when it could never fit under the quotas. With a name, the demand
+        stays reserved under it until release(name).
+        """
+        if not self.quotas:
+            return
+        if not self.fits(Usage(0, 0, 0), demand):
+            raise ValueError("Dataflow launch {} needs {}, more than the quotas {} allow".format(
+                name, demand, self.quotas))
+        jobs = self.active_jobs(region)
+        active = total(self._job_usage(region, job) for job in jobs)
+        with self.store.locked() as reservations:
+            usage = total([active, self._reserved_usage(reservations, region,
+                                                        set(job['name'] for job in jobs), name)])
+            if self.fits(usage, demand):
+                if name is not None:
+                    reservations[name] = dict(demand._asdict(), region=region,
+                                              expires=self._clock() + self.reservation_ttl)
+                return
+        log.info("No headroom in %s yet: active and reserved %s + requested %s, quotas %s",
+                 region, usage, demand, self.quotas)
+        raise AdmissionDeferred("No Dataflow headroom in {} for {}: active and reserved {} + requested {}, "
+                                "limits {}".format(region, name, usage, demand, self.quotas), self.poll_interval)
+
+    def release(self, name):
+        if not self.quotas:
+            return
+        with self.store.locked() as reservations:
+            reservations.pop(name, None)
+
+
+def reschedule_on_deferral(execute, timeout=3 * 60 * 60):
+    """Wraps an operator's execute so a deferred launch reschedules the task.
+
+    The task gives up its worker slot until the controller's poll_interval
+    has passed; the operator needs ReadyToRescheduleDep among its deps, or
+    the scheduler runs it again at once. Once the task has waited timeout
+    seconds in this try, AdmissionTimeout fails it to Airflow's retries.
+    """
+    def _execute(operator, context):
+        from airflow.exceptions import AirflowRescheduleException
+        from airflow.models import TaskReschedule
+        from airflow.utils import timezone
+        try:
+            return execute(operator, context)
+        except AdmissionDeferred as e:
+            now = timezone.utcnow()
+            reschedules = TaskReschedule.find_for_task_instance(context['ti'])
+            waited = (now - reschedules[0].start_date).total_seconds() if reschedules else 0
+            if waited >= timeout:
+                raise AdmissionTimeout("Gave up after waiting {:.0f} minutes: {}".format(waited / 60, e))
+            raise AirflowRescheduleException(now + datetime.timedelta(seconds=e.delay))
+    _execute.__wrapped__ = execute
+    return _execute
@@ -0,0 +1,147 @@
+"""Columnar extract batches with Apache Arrow.
+
+Fetching rows as tuples and converting every date, decimal and string in
+Python makes a Python extract CPU-bound on the wide PeopleSoft tables
+(dbo_PS_JOB, dbo_PS_PAY_EARNINGS). fetch_record_batches() turns each
+fetched batch into an Arrow RecordBatch instead. Each column is
+converted to its Arrow type in one call. Low-cardinality code columns
+(COMPANY, PAYGROUP, ERNCD...) are dictionary-encoded. If the driver can
+fetch Arrow batches itself (turbodbc's fetcharrowbatches), those are
+used directly. write_parquet() writes the batches to Parquet straight
+from their Arrow buffers.
+
+pyarrow is optional. It is only imported by these functions, so the rest
+of ace_hr works without it. benchmarks/arrow_extract.py compares this
+path with tuple-at-a-time conversion.
+"""
+import logging
+
+# PeopleSoft code columns with few distinct values, always dictionary-encoded
+DICTIONARY_COLUMNS = frozenset([
+    'SETID', 'COMPANY', 'PAYGROUP', 'BUSINESS_UNIT', 'DEPTID', 'LOCATION', 'JOBCODE',
+    'EMPL_STATUS', 'EMPL_CLASS', 'EMPL_TYPE', 'REG_TEMP', 'FULL_PART_TIME', 'FLSA_STATUS',
+    'ACTION', 'ACTION_REASON', 'ERNCD', 'DEDCD', 'PLAN_TYPE', 'BENEFIT_PLAN', 'TAX_CLASS',
+    'STATE', 'LOCALITY', 'PAY_FREQUENCY', 'OFF_CYCLE', 'PAYCHECK_STATUS', 'CURRENCY_CD',
+])
+
+# Other string columns are dictionary-encoded when the first batch has at
+# most this share of distinct values
+DICTIONARY_RATIO = 0.05
+
+log = logging.getLogger(__name__)
+
+
+def arrow_type(column_type):
+    import pyarrow
+    return {
+        'STRING': pyarrow.string(),
+        'INT64': pyarrow.int64(), 'INTEGER': pyarrow.int64(),
+        'FLOAT64': pyarrow.float64(), 'FLOAT': pyarrow.float64(),
+        'BOOL': pyarrow.bool_(), 'BOOLEAN': pyarrow.bool_(),
+        'BYTES': pyarrow.binary(),
+        'NUMERIC': pyarrow.decimal128(38, 9),
+        'BIGNUMERIC': pyarrow.decimal256(76, 38),
+        'DATE': pyarrow.date32(),
+        'DATETIME': pyarrow.timestamp('us'),
+        'TIMESTAMP': pyarrow.timestamp('us', tz='UTC'),
+        'TIME': pyarrow.time64('us'),
+    }[column_type]
+
+
+def arrow_schema(schema):
+    """Arrow schema for a list of (column, BigQuery type)."""
+    import pyarrow
+    return pyarrow.schema([pyarrow.field(name, arrow_type(column_type)) for name, column_type in schema])
+
+
+def column_array(values, type_):
+    """values as an Arrow array of type_, converted in one call.
+
+    Values the driver returns as strings (dates and decimals from some
+    drivers) are cast from an Arrow string array.
+    """
+    import pyarrow
+    try:
+        return pyarrow.array(values, type=type_)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        return pyarrow.array(values).cast(type_)
+
+
+def dictionary_columns(batch, candidates=DICTIONARY_COLUMNS, ratio=DICTIONARY_RATIO):
+    """Names of the string columns of batch to dictionary-encode."""
+    import pyarrow
+    import pyarrow.compute
+    names = set()
+    for field, column in zip(batch.schema, batch.columns):
+        if not pyarrow.types.is_string(field.type):
+            continue
+        if field.name in candidates or (
+                len(column) and len(pyarrow.compute.unique(column)) <= ratio * len(column)):
+            names.add(field.name)
+    return names
+
+
+def encode_dictionaries(batch, names):
+    import pyarrow
+    arrays = [column.dictionary_encode() if field.name in names else column
+              for field, column in zip(batch.schema, batch.columns)]
+    return pyarrow.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def fetch_record_batches(connection, query, schema, batch_rows=65536,
+                         candidates=DICTIONARY_COLUMNS, ratio=DICTIONARY_RATIO):
+    """Record batches of query from a DB-API connection.
+
+    schema is a list of (column, BigQuery type) in the query's column
+    order. The columns to dictionary-encode are picked on the first batch
+    and kept for the rest, so every batch has the same schema.
+    """
+    import pyarrow
+    target = arrow_schema(schema)
+    cursor = connection.cursor()
+    encoded = None
+    try:
+        cursor.execute(query)
+        if hasattr(cursor, 'fetcharrowbatches'):
+            # An empty batch becomes a table without batches, and is skipped
+            # as the fetchmany path skips an empty fetch
+            batches = (pyarrow.Table.from_batches([b]).cast(target).to_batches()[0]
+                       for b in cursor.fetcharrowbatches() if b.num_rows)
+        else:
+            batches = _columnar_batches(cursor, target, batch_rows)
+        for batch in batches:
+            if encoded is None:
+                encoded = dictionary_columns(batch, candidates, ratio)
+                log.info("Dictionary-encoding %s", sorted(encoded))
+            yield encode_dictionaries(batch, encoded)
+    finally:
+        cursor.close()
+
+
+def _columnar_batches(cursor, target, batch_rows):
+    import pyarrow
+    while True:
+        rows = cursor.fetchmany(batch_rows)
+        if not rows:
+            break
+        columns = list(zip(*rows))
+        yield pyarrow.RecordBatch.from_arrays(
+            [column_array(list(values), field.type) for values, field in zip(columns, target)],
+            schema=target)
+
+
+def write_parquet(batches, path, compression='snappy'):
+    """Writes record batches to one Parquet file; returns the row count."""
+    import pyarrow.parquet
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, batch.schema, compression=compression)
+            writer.write_table(pyarrow.Table.from_batches([batch]))
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,137 @@
+"""Parallel, resumable backfill of the incremental pay tables.
+
+Rebuilding pay history used to mean forcing the _MAX watermark back to
+1901-01-01 and pulling decades of payroll in one Dataflow job. backfill()
+instead splits a PAY_END_DT range into quarters. Each quarter is staged
+into its own table and merged into the target on the row hash, scoped to
+that quarter. Quarters run in parallel up to a limit.
+
+The merge only touches the rows of its own quarter and is idempotent, so
+quarters cannot interfere with each other, and a quarter can be run again
+safely. Progress is kept in a checkpoint manifest (ace_hr.checkpoint). Run
+the same command again and it resumes with the quarters that have not
+landed. Afterwards the _MAX watermark is rebuilt from the target, so the
+next nightly run continues from the right PAY_END_DT.
+
+Usage:
+    python -m ace_hr.backfill earnings 2015-01-01 2020-01-01 [--parallel 4]
+"""
+import argparse
+import datetime
+import logging
+
+from ace_hr.checkpoint import Chunk, CheckpointManifest, chunk_predicate, chunk_query, \
+    manifest_store, run_chunks
+from ace_hr.rowhash import hashed_source_query, pay_tables, watermark_sql, window_hash_merge_sql
+
+PARTITION_COLUMN = 'PAY_END_DT'
+
+log = logging.getLogger(__name__)
+
+
+def quarter_chunks(start, end, column=PARTITION_COLUMN):
+    """Chunks of column from start (inclusive) to end (exclusive), one per calendar quarter.
+
+    start and end are dates or 'YYYY-MM-DD' strings; the first and last
+    chunks are cut to the range.
+    """
+    start, end = _date(start), _date(end)
+    chunks = []
+    lower = start
+    while lower < end:
+        quarter = (lower.month - 1) // 3
+        next_quarter = datetime.date(lower.year + (quarter == 3), (quarter + 1) % 4 * 3 + 1, 1)
+        upper = min(next_quarter, end)
+        chunks.append(Chunk('{}q{}'.format(lower.year, quarter + 1), column,
+                            lower.isoformat(), upper.isoformat(), False))
+        lower = upper
+    return chunks
+
+
+def _date(value):
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class PayBackfill(object):
+    """Backfill of PS_PAY_<name>, one quarter at a time."""
+
+    def __init__(self, name, dataflow_options, template, jdbc_parameters,
+                 bigquery_conn_id='bigquery_default', gcp_conn_id='google_cloud_default'):
+        self.name = name
+        self.target, self.staging, self.watermark = pay_tables(name)
+        self.dataflow_options = dataflow_options
+        self.template = template
+        self.jdbc_parameters = jdbc_parameters
+        self.bigquery_conn_id = bigquery_conn_id
+        self.gcp_conn_id = gcp_conn_id
+
+    def _run(self, sql):
+        from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+        # One cursor per call, since quarters run on separate threads
+        cursor = BigQueryHook(bigquery_conn_id=self.bigquery_conn_id,
+                              use_legacy_sql=False).get_conn().cursor()
+        log.info("Running: %s", sql)
+        cursor.run_query(sql=sql)
+
+    def chunk_staging(self, chunk):
+        return '{}_BACKFILL_{}'.format(self.target, chunk.chunk_id.upper())
+
+    def _launch(self, job_name, parameters):
+        from airflow.contrib.hooks.gcp_dataflow_hook import DataFlowHook
+        DataFlowHook(gcp_conn_id=self.gcp_conn_id).start_template_dataflow(
+            job_name, self.dataflow_options, parameters, self.template)
+
+    def load_chunk(self, chunk):
+        staging = self.chunk_staging(chunk)
+        self._run('CREATE OR REPLACE TABLE {} LIKE {}'.format(staging, self.staging))
+        parameters = dict(self.jdbc_parameters)
+        parameters['query'] = chunk_query(hashed_source_query(
+            'AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PAY_' + self.name.upper()), chunk)
+        parameters['outputTable'] = 'amed-dev-analyticsplatform:' + staging
+        self._launch('backfill_pay_{}_{}'.format(self.name, chunk.chunk_id), parameters)
+        window = chunk_predicate(chunk._replace(column='T.' + chunk.column))
+        self._run(window_hash_merge_sql(self.target, staging, window))
+        self._run('DROP TABLE IF EXISTS ' + staging)
+
+    def run(self, start, end, manifest_location, max_parallel=4):
+        """Backfills [start, end) and rebuilds the watermark; returns (loaded, skipped) quarters."""
+        key = 'backfill/{}/{}_{}'.format(self.target, _date(start).isoformat(), _date(end).isoformat())
+        manifest = CheckpointManifest(manifest_store(manifest_location), key)
+        loaded, skipped = run_chunks(quarter_chunks(start, end), manifest, self.load_chunk,
+                                     max_parallel=max_parallel)
+        log.info("Backfilled %s quarters of %s, %s already landed", len(loaded), self.target, len(skipped))
+        self._run(watermark_sql(self.target, self.watermark))
+        return loaded, skipped
+
+
+def backfill(name, start, end, max_parallel=4, run_id=None):
+    """Backfills PS_PAY_<name> using the DAGs' Dataflow settings and checkpoint location."""
+    from ace_hr import common
+    common.patch_dataflow_hook()
+    run_id = run_id or 'bf{}{}'.format(_date(start).strftime('%Y%m%d'), _date(end).strftime('%Y%m%d'))
+    # runScope is normally rendered from the DAG run; a backfill scopes its
+    # job names by its own range, so a resumed backfill reattaches to its jobs
+    options = dict(common.default_args['dataflow_default_options'], runScope=run_id, runDag='pay_backfill')
+    jdbc_parameters = {
+        'driverJars': common.driverJars,
+        'driverClassName': common.driverClassName,
+        'connectionURL': common.connectionURL,
+        'bigQueryLoadingTemporaryDirectory': common.bigQueryLoadingTemporaryDirectory,
+        'username': common.username,
+        'password': common.password,
+    }
+    return PayBackfill(name, options, common.template, jdbc_parameters).run(
+        start, end, common.checkpoint_location, max_parallel)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('name', help='pay table: check, tax, earnings, oth_earns or deduction')
+    parser.add_argument('start', help='first PAY_END_DT, YYYY-MM-DD')
+    parser.add_argument('end', help='PAY_END_DT to stop before, YYYY-MM-DD')
+    parser.add_argument('--parallel', type=int, default=4, help='quarters loaded at once')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    backfill(args.name, args.start, args.end, args.parallel)
@@ -0,0 +1,185 @@
+"""Checkpointed, resumable extraction in committed chunks.
+
+A large extract is split into chunks on a key or date column. Each chunk
+is recorded in a per-run manifest as 'started' before it is loaded and
+'landed' once its load has committed. A retry of the same task in the
+same run skips landed chunks. A chunk left 'started' by a failed try is
+cleared from the target before it is loaded again, so partial loads are
+never duplicated.
+
+The manifest is only valid while the target still holds what it records.
+When a cleared run empties the target again, its key has to change too,
+so manifest_key() takes the try number of the task that empties it.
+"""
+import collections
+import json
+import os
+import re
+import tempfile
+import threading
+
+STARTED = 'started'
+LANDED = 'landed'
+
+# lower/upper are None for the open-ended chunks at either end, and
+# is_null marks the chunk that picks up rows with a NULL chunk column
+Chunk = collections.namedtuple('Chunk', ['chunk_id', 'column', 'lower', 'upper', 'is_null'])
+
+# A trailing ORDER BY of the whole query, which SQL Server does not allow
+# in a derived table; the order rows are loaded in does not matter
+TRAILING_ORDER_BY = re.compile(r'\s+ORDER\s+BY\s+[^()]*$', re.IGNORECASE)
+
+
+def _literal(value):
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def range_chunks(column, bounds):
+    """Splits the whole value range of column at the given bounds.
+
+    The chunks cover everything below the first bound, between each pair
+    of bounds, at or above the last bound, and the NULLs, so no row can
+    fall outside a chunk.
+    """
+    edges = [None] + list(bounds) + [None]
+    chunks = [Chunk('c{:02d}'.format(i), column, lower, upper, False)
+              for i, (lower, upper) in enumerate(zip(edges, edges[1:]))]
+    chunks.append(Chunk('null', column, None, None, True))
+    return chunks
+
+
+def chunk_predicate(chunk):
+    if chunk.is_null:
+        return '{} IS NULL'.format(chunk.column)
+    terms = []
+    if chunk.lower is not None:
+        terms.append('{} >= {}'.format(chunk.column, _literal(chunk.lower)))
+    if chunk.upper is not None:
+        terms.append('{} < {}'.format(chunk.column, _literal(chunk.upper)))
+    return ' AND '.join(terms) or '1 = 1'
+
+
+def chunk_query(query, chunk):
+    """Restricts a SELECT to one chunk.
+
+    The query becomes a derived table, so its own WHERE (with ORs or
+    subqueries) is left intact. chunk.column must be a column of its
+    result.
+    """
+    query = TRAILING_ORDER_BY.sub('', query.strip().rstrip(';').rstrip())
+    return 'SELECT * FROM ({}) q WHERE {}'.format(query, chunk_predicate(chunk))
+
+
+def manifest_key(dag_id, ts_nodash, task_id, reset_by=None, reset_try=None):
+    """Manifest key of a task in a run, renewed each time reset_by (the truncate) runs again."""
+    parts = [dag_id, ts_nodash, task_id]
+    if reset_by is not None:
+        parts[-1] += '.{}-{}'.format(reset_by, reset_try)
+    return '/'.join(parts)
+
+
+class LocalManifestStore(object):
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def read(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def write(self, key, manifest):
+        path = self._path(key)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+class GcsManifestStore(object):
+    def __init__(self, location, gcp_conn_id='google_cloud_default'):
+        from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
+        self.bucket, _, self.prefix = location[len('gs://'):].partition('/')
+        self.hook = GoogleCloudStorageHook(google_cloud_storage_conn_id=gcp_conn_id)
+
+    def _object(self, key):
+        return '/'.join(p for p in [self.prefix.strip('/'), key + '.json'] if p)
+
+    def read(self, key):
+        if not self.hook.exists(self.bucket, self._object(key)):
+            return {}
+        return json.loads(self.hook.download(self.bucket, self._object(key)))
+
+    def write(self, key, manifest):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.flush()
+            self.hook.upload(self.bucket, self._object(key), f.name,
+                             mime_type='application/json')
+
+
+def manifest_store(location):
+    if location.startswith('gs://'):
+        return GcsManifestStore(location)
+    return LocalManifestStore(location)
+
+
+class CheckpointManifest(object):
+    """Chunk states for one task in one run, persisted after every change."""
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self._lock = threading.Lock()
+        self.chunks = store.read(key)
+
+    def state(self, chunk_id):
+        return self.chunks.get(chunk_id, {}).get('state')
+
+    def mark(self, chunk_id, state, **info):
+        with self._lock:
+            entry = dict(self.chunks.get(chunk_id, {}), state=state)
+            entry.update(info)
+            self.chunks[chunk_id] = entry
+            self.store.write(self.key, self.chunks)
+
+
+def run_chunks(chunks, manifest, load_chunk, clear_chunk=None, max_parallel=1):
+    """Loads every chunk that has not landed yet.
+
+    clear_chunk is called first for chunks a previous try started but did
+    not finish. Chunks run on up to max_parallel threads. All chunks are
+    attempted even if some fail, then the first failure is re-raised, so
+    one bad chunk does not throw away the work of the others.
+    Returns the ids of the chunks loaded and skipped.
+    """
+    pending = [c for c in chunks if manifest.state(c.chunk_id) != LANDED]
+    skipped = [c.chunk_id for c in chunks if manifest.state(c.chunk_id) == LANDED]
+    errors = []
+
+    def _run(chunk):
+        try:
+            if manifest.state(chunk.chunk_id) == STARTED and clear_chunk is not None:
+                clear_chunk(chunk)
+            manifest.mark(chunk.chunk_id, STARTED)
+            load_chunk(chunk)
+            manifest.mark(chunk.chunk_id, LANDED)
+        except Exception as e:
+            errors.append(e)
+
+    if max_parallel > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            list(pool.map(_run, pending))
+    else:
+        for chunk in pending:
+            _run(chunk)
+    if errors:
+        raise errors[0]
+    return [c.chunk_id for c in pending], skipped
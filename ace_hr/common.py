@@ -0,0 +1,281 @@
+"""Configuration shared by the ACE HR DAGs.
+
+The pipeline is split into one DAG per source system plus the employee
+and payroll transforms. This module holds what they all need: the
+Dataflow hook patch, the Airflow Variables, the default_args and the
+common schedule. Every DAG runs on SCHEDULE, so the runs of one night
+share an execution_date. ace_hr.datasets relies on that to wait across
+DAGs.
+
+Every DAG file imports this module, and the scheduler parses each file
+in a fresh process. So only what the parse itself runs is imported up
+front. The operator patches are applied by finish_dag to the operators
+the DAG uses, so a DAG file does not import the Dataflow or BigQuery
+operators it has no tasks of; the modules the tasks and the patched hook
+use are imported when they first run.
+"""
+from airflow import models
+from airflow.ti_deps.deps.ready_to_reschedule import ReadyToRescheduleDep
+from airflow.utils.dates import days_ago
+from datetime import timedelta
+
+# ##################################################################################
+# ############### BEGINNING OF MONKEY PATCH ########################################
+# ##################################################################################
+# We redefine the function that handles the environment keys 
+# that are used to build the RuntimeEnvironment, to include 'ipConfiguration'
+def _start_template_dataflow(self, name, variables, parameters,
+                             dataflow_template):
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    from airflow.contrib.hooks.gcp_dataflow_hook import _DataflowJob
+    from ace_hr.admission import AdmissionController, VariableReservationStore
+    from ace_hr.dataflow import TemplateLauncher, VariableZoneStore, parse_zones
+    from ace_hr.extractcache import ExtractCache
+    from ace_hr.fanout import fan_out
+    from ace_hr.staging import cleanup, staging_prefix
+    # Builds RuntimeEnvironment from variables dictionary
+    # https://cloud.google.com/dataflow/docs/reference/rest/v1b3/RuntimeEnvironment
+    environment = {}
+    for key in ['numWorkers', 'maxWorkers', 'zone', 'serviceAccountEmail',
+                'tempLocation', 'bypassTempDirValidation', 'machineType',
+                'additionalExperiments', 'network', 'subnetwork', 'additionalUserLabels',
+                'ipConfiguration']:
+        if key in variables:
+            environment.update({key: variables[key]})
+    # The hook appends a random suffix to the task name, so every retry would
+    # launch a new job. Swap it for the run scope so all tries of a task in
+    # the same DAG run share one job name.
+    if variables.get('runScope'):
+        name = name.rsplit('-', 1)[0] + '-' + variables['runScope']
+    # Each job stages its load and temp files under its own prefixes, which
+    # are removed once it succeeds, see ace_hr.staging
+    staging = []
+    if parameters.get('bigQueryLoadingTemporaryDirectory'):
+        parameters = dict(parameters, bigQueryLoadingTemporaryDirectory=staging_prefix(
+            parameters['bigQueryLoadingTemporaryDirectory'], variables.get('runScope'), name))
+        staging.append(parameters['bigQueryLoadingTemporaryDirectory'])
+    if variables.get('temp_location') and 'tempLocation' not in environment:
+        environment['tempLocation'] = staging_prefix(variables['temp_location'], variables.get('runScope'), name)
+        staging.append(environment['tempLocation'])
+    # Admission costs each job at its maxWorkers, so the cap is only set
+    # while quotas are enforced; otherwise jobs autoscale as before
+    quotas = variables.get('quotas') or {}
+    if quotas and 'maxWorkers' not in environment:
+        environment['maxWorkers'] = variables.get('admissionMaxWorkers', 10)
+    variables = self._set_variables(variables)
+    def wait(job_id, region):
+        _DataflowJob(self.get_conn(), variables['project'], name, region,
+                     self.poll_sleep, job_id=job_id,
+                     num_retries=self.num_retries).wait_for_done()
+    # A launch goes ahead once the region's active jobs leave room for it
+    # under the configured vCPU, address and job quotas; until then the
+    # task is rescheduled. Admitted launches are reserved in the metadata
+    # database so simultaneous ones are checked against each other.
+    admission = AdmissionController(self.get_conn(), variables['project'], quotas,
+                                    default_max_workers=environment.get('maxWorkers', 10),
+                                    store=VariableReservationStore(),
+                                    num_retries=self.num_retries)
+    # The launcher reattaches to a job a previous try left running, and
+    # otherwise launches in the first of 'zones' with capacity
+    launcher = TemplateLauncher(self.get_conn(), variables['project'], variables['region'],
+                                parse_zones(variables.get('zones') or variables.get('zone', '')),
+                                wait, zone_store=VariableZoneStore(variables.get('runDag')), admission=admission,
+                                num_retries=self.num_retries)
+    # A shared source table another DAG landed recently is copied from there
+    # instead of extracted again, see ace_hr.extractcache
+    bigquery = BigQueryHook(use_legacy_sql=False).get_service()
+    cache = ExtractCache.from_variable(bigquery, variables['project'], num_retries=self.num_retries)
+    if cache is not None and cache.reuse(parameters, name):
+        response = {'cached': True}
+    else:
+        response = launcher.launch(name, parameters, environment, dataflow_template,
+                                   scope=variables.get('runScope'))
+        cleanup(staging)
+        if cache is not None:
+            cache.record(parameters, name)
+    # The landed table is copied to the other configured environments rather
+    # than extracted again for each, see ace_hr.fanout. Chunked loads turn
+    # this off and fan out once every chunk has landed.
+    if variables.get('fanOut', True):
+        fan_out(bigquery, variables['project'], parameters['outputTable'], num_retries=self.num_retries)
+    return response
+# Monkey patching
+def patch_dataflow_hook():
+    """Patches DataFlowHook; for code launching templates outside a DAG's tasks."""
+    from airflow.contrib.hooks.gcp_dataflow_hook import DataFlowHook
+    DataFlowHook._start_template_dataflow = _start_template_dataflow
+
+
+def _controlled(execute, reschedule=False):
+    """Wraps an operator's execute in the controls below, imported on its first call."""
+    if getattr(execute, '_controlled', False):
+        return execute
+    controlled = []
+
+    def _execute(operator, context):
+        if not controlled:
+            from ace_hr.admission import reschedule_on_deferral
+            from ace_hr.retry import RetryController
+            wrapped = RetryController().wrap_execute(execute)
+            controlled.append(reschedule_on_deferral(wrapped) if reschedule else wrapped)
+        return controlled[0](operator, context)
+    _execute._controlled = True
+    _execute.__wrapped__ = execute
+    return _execute
+# Failures are classified before Airflow sees them: transient and lock
+# timeout errors are retried in-task with a short backoff, permanent SQL or
+# schema errors fail the task at once, quota and anything else fall back to
+# the exponentially backed-off retries in default_args (ace_hr.retry).
+# A Dataflow task without quota headroom is also rescheduled instead of
+# holding its worker slot while it waits, see ace_hr.admission. As for a
+# reschedule-mode sensor, ReadyToRescheduleDep keeps it until its time.
+# (module, class) of each operator patched -> whether it is a Dataflow launch
+PATCHED_OPERATORS = {
+    ('airflow.contrib.operators.dataflow_operator', 'DataflowTemplateOperator'): True,
+    ('airflow.contrib.operators.bigquery_operator', 'BigQueryOperator'): False,
+    ('ace_hr.operators', 'ChunkedDataflowTemplateOperator'): True,
+    ('ace_hr.operators', 'BigQueryProcedureGroupOperator'): False,
+}
+
+
+def patch_operators(tasks):
+    """Applies the patches to the operators of tasks and to the classes they derive from.
+
+    The classes are found through the tasks, so only the operator modules
+    the DAG file imported itself are patched. Patching twice is a no-op.
+    """
+    for operator in set(type(task) for task in tasks):
+        for cls in operator.__mro__:
+            launch = PATCHED_OPERATORS.get((cls.__module__, cls.__name__))
+            if launch is None:
+                continue
+            cls.execute = _controlled(cls.__dict__['execute'], reschedule=launch)
+            if launch:
+                cls.deps = property(lambda self: models.BaseOperator.deps.fget(self) | {ReadyToRescheduleDep()})
+                patch_dataflow_hook()
+# ##################################################################################
+# ############### END OF MONKEY PATCH ##############################################
+# ##################################################################################
+
+bucket_path = models.Variable.get("bucket_path")
+temp_location = bucket_path + "/tmp/"
+checkpoint_location = temp_location + "checkpoints"
+schema_location = bucket_path + "/schemas"
+project_id = models.Variable.get("project_id")
+gce_zone = models.Variable.get("gce_zone")
+gce_zones = models.Variable.get("gce_zones", default_var=gce_zone)
+gce_region = models.Variable.get("gce_region")
+network = models.Variable.get("network")
+subnetwork = models.Variable.get("subnetwork")
+ipConfiguration = models.Variable.get("ipConfiguration")
+template = models.Variable.get("template")
+driverJars = models.Variable.get("driverJars")
+driverClassName = models.Variable.get("driverClassName")
+connectionURL = models.Variable.get("connectionURL")
+connectionURL2 = models.Variable.get("connectionURL2")
+bigQueryLoadingTemporaryDirectory = models.Variable.get("bigQueryLoadingTemporaryDirectory")
+username = models.Variable.get("username")
+dataflow_max_workers = int(models.Variable.get("dataflow_max_workers", default_var=10))
+dataflow_quotas = models.Variable.get("dataflow_quotas", default_var={}, deserialize_json=True)
+# {"check": "LASTUPDDTTM", ...}: last-modified column of each pay table the intraday DAG loads
+pay_modified_columns = models.Variable.get("pay_modified_columns", default_var={}, deserialize_json=True)
+# ["check", ...]: pay tables whose nightly merge is the row-hash merge rather than their
+# MergePay* procedure, once checked and compared with "python -m ace_hr.layout"
+pay_row_hash_merges = models.Variable.get("pay_row_hash_merges", default_var=[], deserialize_json=True)
+password = models.Variable.get("password")
+
+default_args = {
+    "start_date": days_ago(1),
+    "email": ["michael.helms@amedisys.com","benjamin.claxton@amedisys.com"],
+    "email_on_failure": True,
+    "email_on_retry": True,
+    "retries": 5,
+    "retry_delay": timedelta(minutes=2),
+    # 2, 4, 8, 16 then 30 minutes: long enough for an exhausted quota to clear
+    "retry_exponential_backoff": True,
+    "max_retry_delay": timedelta(minutes=30),
+    "dataflow_default_options": {
+        "project": project_id, # "amed-dev-analyticsplatform"
+        "region": gce_region, # "us-central1"
+        "zone": gce_zone, # "us-central1-a"
+        "zones": gce_zones, # "us-central1-a,us-central1-b,us-central1-f" tried in order on capacity errors
+        "temp_location": temp_location, # "gs://us-central1-amed-dev-compos-1b78d420-bucket/dags/tmp"
+        "network": network, # "amedisys-shared-vpc"
+        "subnetwork": subnetwork, # "https://www.googleapis.com/compute/v1/projects/amedisys-shared-services/regions/us-central1/subnetworks/amed-us-central1"
+        "ipConfiguration": ipConfiguration, # "WORKER_IP_PRIVATE"
+        "admissionMaxWorkers": dataflow_max_workers, # maxWorkers of each job while quotas are enforced, used to project its usage
+        "quotas": dataflow_quotas, # {"vcpus": 240, "ips": 200, "jobs": 25}, limits left empty are not enforced
+        "runScope": "{{ ts_nodash | lower }}", # deterministic job name suffix per DAG run
+        "runDag": "{{ dag.dag_id }}" # keys the zone that last worked for the DAG
+    },
+}
+
+# UTC Minute Hour (3:06pm CDT = 06 20). Ahead of the sources' refresh: each
+# source DAG's source_ready sensor (ace_hr.readiness) starts its loads once
+# the source is ready, and the transforms wait for the loads they read.
+SCHEDULE = "06 20 * * *"
+
+
+def dag_args(**kwargs):
+    """Keyword arguments of DAG() shared by the ACE HR DAGs.
+
+    Each DAG file builds its DAG itself, DAG(dag_id, **dag_args()): with
+    dag_discovery_safe_mode, Airflow only parses files that contain both
+    "airflow" and "DAG".
+    """
+    kwargs.setdefault("default_args", default_args)
+    kwargs.setdefault("schedule_interval", SCHEDULE)
+    kwargs.setdefault("concurrency", 30)
+    return kwargs
+
+
+def preflight_callable(**context):
+    # python_callable of the pre-flight task, see ace_hr.preflight
+    from ace_hr.preflight import preflight_callable
+    return preflight_callable(**context)
+
+
+def profile_procedure_call(context):
+    # on_success_callback of the CALL tasks, see ace_hr.profiler
+    from ace_hr.profiler import profile_procedure_call
+    profile_procedure_call(context)
+
+
+def finish_dag(dag, ddl_task_ids=None):
+    """Patches a DAG's operators, adds its load quality checks, pre-flight task and procedure profiling.
+
+    Each load of a keyed table is followed by its quality check
+    (ace_hr.quality.check_loads). Call once all tasks and edges are in
+    place: the pre-flight runs ahead of
+    every root, failing on missing tables, routines or permissions and
+    logging the estimated bytes, cost and projected run duration. Where the
+    DAG has DDL tasks (ddl_task_ids) it runs after them instead, and ahead
+    of everything that followed them, so it sees the tables they create.
+    By default the DDL tasks are ace_hr.preflight.DDL_TASK_IDS.
+    """
+    from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+    from airflow.operators.python_operator import PythonOperator
+    from ace_hr.preflight import DDL_TASK_IDS
+    from ace_hr.quality import check_loads
+    if ddl_task_ids is None:
+        ddl_task_ids = DDL_TASK_IDS
+    patch_operators(dag.tasks)
+    check_loads(dag)
+    roots = dag.roots
+    ddl = [task for task in dag.tasks if task.task_id in ddl_task_ids]
+    bigquery_preflight = PythonOperator(
+        task_id="bigquery_preflight",
+        python_callable=preflight_callable,
+        provide_context=True,
+        priority_weight=1000,
+        dag=dag
+    )
+    if ddl:
+        followers = [task for d in ddl for task in d.downstream_list if task not in ddl]
+        ddl >> bigquery_preflight
+        bigquery_preflight >> followers
+    else:
+        bigquery_preflight >> roots
+    for task in dag.tasks:
+        if hasattr(task, 'procedures') or (isinstance(task, BigQueryOperator) and task.sql.lstrip().upper().startswith('CALL')):
+            task.on_success_callback = profile_procedure_call
@@ -0,0 +1,117 @@
+"""The ACE HR DAG files: building their DAGs, and the deploy-time check.
+
+The scheduler parses the ACE_HR_*.py files themselves. Each parse imports
+ace_hr and the operators the file uses, reads the Variables, builds every
+operator and patches the operator classes (ace_hr.common.finish_dag),
+about six seconds for all files on one core (see benchmarks/dag_parse.py).
+
+Serving the scheduler DAGs deserialized from an artifact built at deploy
+time parses seven times faster, but it cannot be done on 1.10. Its
+scheduler only schedules from real operators: a SerializedBaseOperator
+has no sensor mode, so ReadyToRescheduleDep passes at once for the
+reschedule-mode wait_* and source_ready sensors, and they would be run
+again as soon as they reschedule.
+
+check() runs at deploy time instead. It imports every DAG file and
+fails on an import error or a cycle, and reports each file's DAGs and
+tasks and the Variables the parse read. file_dags() builds
+DAGs from their files for the command-line tools, without the folder
+scan of a DagBag.
+
+Usage, where the environment's Airflow and Variables are reachable:
+    python -m ace_hr.dagfiles [--dags-folder DIR]
+"""
+import argparse
+import glob
+import importlib.util
+import logging
+import os
+import sys
+import traceback
+
+DAG_FILES = 'ACE_HR_*.py'
+
+log = logging.getLogger(__name__)
+
+
+def default_dags_folder():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def dag_files(dags_folder):
+    return sorted(glob.glob(os.path.join(dags_folder, DAG_FILES)))
+
+
+def parse_dag_files(paths):
+    """DAG id -> DAG built from the DAG files at paths, and path -> traceback of the files that failed."""
+    from airflow.models import DAG
+    dags, errors = {}, {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            spec = importlib.util.spec_from_file_location('ace_hr_dagfile_' + name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:
+            errors[path] = traceback.format_exc()
+            continue
+        for value in list(vars(module).values()):
+            if isinstance(value, DAG):
+                # Workers run tasks from the file that built them
+                value.fileloc = value.full_filepath = path
+                dags[value.dag_id] = value
+    return dags, errors
+
+
+def file_dags(dag_ids, dags_folder=None):
+    """The DAGs dag_ids built from their files, with the real operators, for the command-line tools."""
+    dags_folder = dags_folder or default_dags_folder()
+    dags, errors = parse_dag_files(dag_files(dags_folder))
+    missing = [dag_id for dag_id in dag_ids if dag_id not in dags]
+    if missing:
+        raise ValueError('DAGs not found in {}: {} {}'.format(dags_folder, missing, errors))
+    return [dags[dag_id] for dag_id in dag_ids]
+
+
+def check(dags_folder=None):
+    """Imports and validates every DAG file of dags_folder; returns file name -> {dag_id: tasks}."""
+    from airflow import models
+    dags_folder = dags_folder or default_dags_folder()
+    # Record what the parse reads through Variable.get
+    keys = set()
+    get = models.Variable.__dict__['get']
+    original = models.Variable.get
+
+    def recording_get(key, *args, **kwargs):
+        keys.add(key)
+        return original(key, *args, **kwargs)
+    models.Variable.get = staticmethod(recording_get)
+    report, failed = {}, {}
+    try:
+        for path in dag_files(dags_folder):
+            dags, errors = parse_dag_files([path])
+            failed.update(errors)
+            for dag in dags.values():
+                dag.test_cycle()
+            report[os.path.basename(path)] = dict((dag_id, len(dag.tasks)) for dag_id, dag in dags.items())
+            log.info("%-32s %s", os.path.basename(path), ', '.join(
+                '{} ({} tasks)'.format(dag_id, n) for dag_id, n in sorted(report[os.path.basename(path)].items())))
+    finally:
+        models.Variable.get = get
+    if failed:
+        raise ValueError('DAG files failed to import:\n' + '\n'.join(
+            '{}:\n{}'.format(path, error) for path, error in sorted(failed.items())))
+    log.info("Variables read: %s", ', '.join(sorted(keys)))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--dags-folder', default=default_dags_folder())
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    try:
+        check(args.dags_folder)
+    except ValueError as e:
+        log.error("%s", e)
+        sys.exit(1)
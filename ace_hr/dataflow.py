@@ -0,0 +1,204 @@
+"""Dataflow template launches for the patched DataFlowHook.
+
+TemplateLauncher takes the discovery service as a constructor argument, so
+a fake service can stand in for the Dataflow API. It handles:
+
+* reattaching to a job a previous try left running (same run-scoped name),
+  and not relaunching one that already finished,
+* attaching the job's error messages when it fails,
+* failing over to the next configured zone on capacity errors, and
+  remembering the zone that worked for later launches in the same run,
+* holding each launch until an optional AdmissionController finds quota
+  headroom for it, and reserving that headroom until the job is running.
+"""
+import logging
+import re
+
+# States in which a previously launched job can still finish on its own
+ACTIVE_JOB_STATES = ['JOB_STATE_PENDING', 'JOB_STATE_QUEUED', 'JOB_STATE_RUNNING']
+# A previously launched job that got here has already loaded its output
+DONE_JOB_STATE = 'JOB_STATE_DONE'
+
+# Zone stockouts, as returned by the launch call or logged by a job whose
+# workers never started. Regional quota errors are not in this list because
+# another zone of the same region would hit the same quota.
+CAPACITY_ERROR_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'ZONE_RESOURCE_POOL_EXHAUSTED',
+    r'resource pool exhausted',
+    r'does not have enough resources available',
+    r'Startup of the worker pool in zone .* failed',
+]]
+
+log = logging.getLogger(__name__)
+
+
+def region_of(zone):
+    return zone.rsplit('-', 1)[0]
+
+
+def parse_zones(value):
+    return [zone.strip() for zone in value.split(',') if zone.strip()]
+
+
+def is_capacity_error(error):
+    text = str(error)
+    content = getattr(error, 'content', None)
+    if content:
+        text += content.decode('utf-8', 'replace') if isinstance(content, bytes) else str(content)
+    return any(pattern.search(text) for pattern in CAPACITY_ERROR_PATTERNS)
+
+
+def find_job(service, project, region, name, num_retries=0):
+    # Looks up the latest job of any state by its exact name, so a retried
+    # task can find the job its previous try launched. Jobs are listed
+    # newest first; a job failed or cancelled by an earlier try is only
+    # returned if no later one exists.
+    jobs = service.projects().locations().jobs()
+    request = jobs.list(projectId=project, location=region, filter='ALL')
+    while request is not None:
+        response = request.execute(num_retries=num_retries)
+        for job in response.get('jobs', []):
+            if job['name'] == name:
+                return job
+        request = jobs.list_next(previous_request=request, previous_response=response)
+    return None
+
+
+def job_errors(service, project, region, job_id, num_retries=0):
+    # Error messages of a failed job, so the raised exception carries the
+    # real cause (quota, SQL error...) instead of just "job has failed"
+    response = service.projects().locations().jobs().messages().list(
+        projectId=project,
+        location=region,
+        jobId=job_id,
+        minimumImportance='JOB_MESSAGE_ERROR'
+    ).execute(num_retries=num_retries)
+    return [message.get('messageText', '') for message in response.get('jobMessages', [])]
+
+
+class MemoryZoneStore(object):
+    def __init__(self):
+        self.zones = {}
+
+    def get(self, scope):
+        return self.zones.get(scope)
+
+    def set(self, scope, zone):
+        self.zones[scope] = zone
+
+
+class VariableZoneStore(object):
+    """Keeps the last zone that worked in an Airflow Variable.
+
+    Tasks run in separate worker processes, so the zone is shared through
+    the metadata database. Only the zone recorded for the current run
+    scope is used; a new run starts again from the configured order. The
+    DAGs share a schedule, so their runs have the same scope; each DAG
+    keeps its zone in a Variable of its own.
+    """
+
+    def __init__(self, dag_id=None, key='dataflow_last_good_zone'):
+        self.key = key + '.' + dag_id if dag_id else key
+
+    def get(self, scope):
+        from airflow import models
+        value = models.Variable.get(self.key, default_var=None, deserialize_json=True)
+        if value and value.get('scope') == scope:
+            return value.get('zone')
+        return None
+
+    def set(self, scope, zone):
+        from airflow import models
+        models.Variable.set(self.key, {'scope': scope, 'zone': zone}, serialize_json=True)
+
+
+class TemplateLauncher(object):
+
+    def __init__(self, service, project, region, zones, wait, zone_store=None,
+                 admission=None, num_retries=0):
+        self.service = service
+        self.project = project
+        self.region = region
+        self.zones = zones
+        self.wait = wait
+        self.zone_store = zone_store if zone_store is not None else MemoryZoneStore()
+        self.admission = admission
+        self.num_retries = num_retries
+
+    def ordered_zones(self, scope):
+        preferred = self.zone_store.get(scope)
+        if preferred in self.zones:
+            return [preferred] + [zone for zone in self.zones if zone != preferred]
+        return list(self.zones)
+
+    def regions(self):
+        regions = [self.region]
+        for zone in self.zones:
+            if region_of(zone) not in regions:
+                regions.append(region_of(zone))
+        return regions
+
+    def _environment(self, environment, zone):
+        environment = dict(environment)
+        if zone is not None:
+            environment['zone'] = zone
+            # Zones outside the default region need that region's subnetwork,
+            # which follows the same naming as the default one
+            if region_of(zone) != self.region and 'subnetwork' in environment:
+                environment['subnetwork'] = environment['subnetwork'].replace(
+                    self.region, region_of(zone))
+        return environment
+
+    def _run(self, job, region):
+        try:
+            self.wait(job['id'], region)
+        except Exception as e:
+            errors = job_errors(self.service, self.project, region, job['id'], self.num_retries)
+            raise Exception("\n".join([str(e)] + errors))
+
+    def launch(self, name, parameters, environment, template, scope=None):
+        # Reattach to a job left running by a previous try, and take a job
+        # a previous try saw finish as done; only failed or cancelled jobs
+        # cause a launch
+        for region in self.regions():
+            job = find_job(self.service, self.project, region, name, self.num_retries)
+            if job is None:
+                continue
+            if job.get('currentState') == DONE_JOB_STATE:
+                log.info("Dataflow job %s (%s) already finished, not relaunching", name, job['id'])
+                return {'job': job}
+            if job.get('currentState') in ACTIVE_JOB_STATES:
+                log.info("Reattaching to active Dataflow job %s (%s)", name, job['id'])
+                self._run(job, region)
+                return {'job': job}
+            log.info("Dataflow job %s (%s) ended %s, relaunching", name, job['id'], job.get('currentState'))
+            break
+
+        zones = self.ordered_zones(scope) or [None]
+        for i, zone in enumerate(zones):
+            region = region_of(zone) if zone is not None else self.region
+            body = {"jobName": name,
+                    "parameters": parameters,
+                    "environment": self._environment(environment, zone)}
+            if self.admission is not None:
+                self.admission.admit(region, self.admission.demand(body['environment']), name)
+            try:
+                response = self.service.projects().locations().templates().launch(
+                    projectId=self.project,
+                    location=region,
+                    gcsPath=template,
+                    body=body
+                ).execute(num_retries=self.num_retries)
+                self._run(response['job'], region)
+            except Exception as e:
+                if i + 1 < len(zones) and is_capacity_error(e):
+                    log.warning("No capacity in zone %s, failing over to %s: %s",
+                                zone, zones[i + 1], e)
+                    continue
+                raise
+            finally:
+                if self.admission is not None:
+                    self.admission.release(name)
+            if zone is not None:
+                self.zone_store.set(scope, zone)
+            return response
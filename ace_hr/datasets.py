@@ -0,0 +1,176 @@
+"""Cross-DAG dependencies keyed by the dataset a task produces.
+
+Each source load publishes the table it lands, or for a table with a
+declared key its quality check (ace_hr.quality), and each pay merge its
+target. Each procedure task publishes under the procedure's name, since
+the tables a procedure writes are defined in BigQuery, not here.
+DATASETS maps every dataset to its producing DAG and task. A DAG that
+reads a dataset from another DAG waits for it with wait_for(dag, dataset)
+rather than naming the other DAG's task. The wait is an
+ExternalTaskSensor in reschedule mode, so no worker slot is held between
+pokes, and a task starts as soon as the datasets it needs have landed.
+It fails as soon as the producing task has failed (failed_states), rather
+than poking until its timeout.
+
+All the ACE HR DAGs run on ace_hr.common.SCHEDULE, so the sensor finds
+the producing task under the same execution_date.
+"""
+import re
+
+from airflow.exceptions import AirflowException
+from airflow.models import TaskInstance
+from airflow.sensors.external_task_sensor import ExternalTaskSensor
+from airflow.utils.db import provide_session
+from airflow.utils.decorators import apply_defaults
+
+DATASETS = {
+    'Agency_SC.dbo_Agency': ('ACE_HR_sources_agency', 'agency_dbo_agency_etl'),
+    'Agency_SC.dbo_StandingType': ('ACE_HR_sources_agency', 'agency_dbo_standingtype_etl'),
+    'Agency_SC.dbo_Status': ('ACE_HR_sources_agency', 'agency_dbo_status_etl'),
+    'ETLConfigACE.LoadDimCertificate': ('ACE_HR_employee', 'loaddimcertificate'),
+    'ETLConfigACE.LoadDimCompensationRateType': ('ACE_HR_employee', 'loaddimcompensationratetype'),
+    'ETLConfigACE.LoadDimDateIncremental': ('ACE_HR_employee', 'loaddimdateincremental'),
+    'ETLConfigACE.LoadDimDepartment': ('ACE_HR_employee', 'loaddimdepartment'),
+    'ETLConfigACE.LoadDimEarningsType': ('ACE_HR_payroll', 'loaddimearningstype'),
+    'ETLConfigACE.LoadDimEmployee': ('ACE_HR_employee', 'loaddimemployee'),
+    'ETLConfigACE.LoadDimJobActionReason': ('ACE_HR_employee', 'loaddimjobactionreason'),
+    'ETLConfigACE.LoadDimJobCode': ('ACE_HR_employee', 'loaddimjobcode'),
+    'ETLConfigACE.LoadDimJobCodeHistoric': ('ACE_HR_employee', 'loaddimjobcodehistoric'),
+    'ETLConfigACE.LoadDimJobJunk': ('ACE_HR_employee', 'loaddimjobjunk'),
+    'ETLConfigACE.LoadDimLocation': ('ACE_HR_employee', 'loaddimlocation'),
+    'ETLConfigACE.LoadDimMonth': ('ACE_HR_employee', 'loaddimmonth'),
+    'ETLConfigACE.LoadDimPaycheck': ('ACE_HR_payroll', 'loaddimpaycheck'),
+    'ETLConfigACE.LoadEmployeeCompensation': ('ACE_HR_employee', 'loademployeecompensation'),
+    'ETLConfigACE.LoadFactCertificateExpiration': ('ACE_HR_employee', 'loadfactcertificateexpiration'),
+    'ETLConfigACE.LoadFactEmployeeCensusMonthly': ('ACE_HR_employee', 'loadfactemployeecensusmonthly'),
+    'ETLConfigACE.LoadFactEmployeeCompensation': ('ACE_HR_employee', 'loadfactemployeecompensation'),
+    'ETLConfigACE.LoadFactJobAction': ('ACE_HR_employee', 'loadfactjobaction'),
+    'ETLConfigACE.LoadFactJobFamily': ('ACE_HR_employee', 'loadfactjobfamily'),
+    'ETLConfigACE.LoadFactPaycheckDeduction': ('ACE_HR_payroll', 'loadfactpaycheckdeduction'),
+    'ETLConfigACE.LoadFactPaycheckEarnings': ('ACE_HR_payroll', 'loadfactpaycheckearnings'),
+    'ETLConfigACE.LoadFactPaycheckSummary': ('ACE_HR_payroll', 'loadfactpaychecksummary'),
+    'ETLConfigACE.LoadFactPaycheckTax': ('ACE_HR_payroll', 'loadfactpaychecktax'),
+    'ETLConfigACE.LoadFactTerminationType': ('ACE_HR_employee', 'loadfactterminationtype'),
+    'ETLConfigACE.LoadPaycheck': ('ACE_HR_payroll', 'loadpaycheck'),
+    'ETLConfigACE.LoadPaycheckEarnings': ('ACE_HR_payroll', 'loadpaycheckearnings'),
+    'ETLConfigACE.LoadPaycheckTax': ('ACE_HR_payroll', 'loadpaychecktax'),
+    'FSPRD_SC.dbo_PS_Z_AGNCY_INT_TBL': ('ACE_HR_sources_peoplesoftfs', 'peoplesoftfs_dbo_ps_z_agncy_int_tbl_etl'),
+    'FSPRD_SC.dbo_XLATTABLE_VW': ('ACE_HR_sources_peoplesoftfs', 'peoplesoftfs_dbo_xlattable_vw_etl'),
+    'HCHB_AMEDISYS_SC.dbo_AGENCIES': ('ACE_HR_sources_hchb', 'hchba_dbo_agencies_etl'),
+    'HCHB_AMEDISYS_SC.dbo_AGENCIES_SERVICELINES_BRANCHES': ('ACE_HR_sources_hchb', 'hchba_dbo_agencies_servicelines_branches_etl'),
+    'HCHB_AMEDISYS_SC.dbo_BRANCHES': ('ACE_HR_sources_hchb', 'hchba_dbo_branches_etl'),
+    'HCHB_AMEDISYS_SC.dbo_JOB_DESCRIPTIONS': ('ACE_HR_sources_hchb', 'hchba_dbo_job_descriptions_etl'),
+    'HCHB_AMEDISYS_SC.dbo_MARITAL_STATUSES': ('ACE_HR_sources_hchb', 'hchba_dbo_marital_statuses_etl'),
+    'HCHB_AMEDISYS_SC.dbo_RACES': ('ACE_HR_sources_hchb', 'hchba_dbo_races_etl'),
+    'HCHB_AMEDISYS_SC.dbo_WORKER_BASE': ('ACE_HR_sources_hchb', 'hchba_dbo_worker_base_etl'),
+    'HCHB_AMEDISYS_SC.dbo_WORKER_HOMEBRANCH': ('ACE_HR_sources_hchb', 'hchba_dbo_worker_homebranch_etl'),
+    'HCHB_AMEDISYS_SC.dbo_WORKER_STATUSES': ('ACE_HR_sources_hchb', 'hchba_dbo_worker_statuses_etl'),
+    'HCHB_AMEDISYS_SC.dbo_WORKER_TYPES': ('ACE_HR_sources_hchb', 'hchba_dbo_worker_types_etl'),
+    'HCHB_INFINITY_SC.dbo_BRANCHES': ('ACE_HR_sources_hchb', 'hchbi_dbo_branches_etl'),
+    'HRPRD_SC.dbo_PSXLATITEM': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_psxlatitem_quality'),
+    'HRPRD_SC.dbo_PS_ACCT_CD_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_acct_cd_tbl_etl'),
+    'HRPRD_SC.dbo_PS_ACTION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_action_tbl_etl'),
+    'HRPRD_SC.dbo_PS_ACTN_REASON_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_actn_reason_tbl_quality'),
+    'HRPRD_SC.dbo_PS_ADDRESSES': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_addresses_etl'),
+    'HRPRD_SC.dbo_PS_BENEF_PLAN_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_benef_plan_tbl_etl'),
+    'HRPRD_SC.dbo_PS_BUS_UNIT_TBL_FS': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_bus_unit_tbl_fs_etl'),
+    'HRPRD_SC.dbo_PS_COMPENSATION': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_compensation_etl'),
+    'HRPRD_SC.dbo_PS_COMP_RATECD_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_comp_ratecd_tbl_etl'),
+    'HRPRD_SC.dbo_PS_DEDUCTION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_deduction_tbl_etl'),
+    'HRPRD_SC.dbo_PS_DEPT_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_dept_tbl_quality'),
+    'HRPRD_SC.dbo_PS_DIVERS_ETHNIC': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_divers_ethnic_etl'),
+    'HRPRD_SC.dbo_PS_EARNINGS_SPCL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_earnings_spcl_etl'),
+    'HRPRD_SC.dbo_PS_EARNINGS_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_earnings_tbl_quality'),
+    'HRPRD_SC.dbo_PS_EMAIL_ADDRESSES': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_email_addresses_etl'),
+    'HRPRD_SC.dbo_PS_EMPLOYEES': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_employees_etl'),
+    'HRPRD_SC.dbo_PS_ETHNIC_GRP_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_ethnic_grp_tbl_etl'),
+    'HRPRD_SC.dbo_PS_JOB': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_job_quality'),
+    'HRPRD_SC.dbo_PS_JOBCD_COMP_RATE': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jobcd_comp_rate_etl'),
+    'HRPRD_SC.dbo_PS_JOBCODE_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jobcode_tbl_quality'),
+    'HRPRD_SC.dbo_PS_JOBFUNCTION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jobfunction_tbl_etl'),
+    'HRPRD_SC.dbo_PS_JOB_FAMILY_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_job_family_tbl_etl'),
+    'HRPRD_SC.dbo_PS_JPM_CAT_ITEMS': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jpm_cat_items_etl'),
+    'HRPRD_SC.dbo_PS_JPM_JP_ITEMS': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jpm_jp_items_etl'),
+    'HRPRD_SC.dbo_PS_JPM_PROFILE': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_jpm_profile_etl'),
+    'HRPRD_SC.dbo_PS_LEAVE_ACCRUAL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_leave_accrual_etl'),
+    'HRPRD_SC.dbo_PS_LOCAL_TAX_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_local_tax_tbl_etl'),
+    'HRPRD_SC.dbo_PS_LOCATION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_location_tbl_quality'),
+    'HRPRD_SC.dbo_PS_PAYGROUP_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_paygroup_tbl_etl'),
+    'HRPRD_SC.dbo_PS_PAY_CHECK': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pay_check_merge'),
+    'HRPRD_SC.dbo_PS_PAY_DEDUCTION': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pay_deduction_merge'),
+    'HRPRD_SC.dbo_PS_PAY_EARNINGS': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pay_earnings_merge'),
+    'HRPRD_SC.dbo_PS_PAY_OTH_EARNS': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pay_oth_earns_merge'),
+    'HRPRD_SC.dbo_PS_PAY_TAX': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pay_tax_merge'),
+    'HRPRD_SC.dbo_PS_PERSON': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_person_etl'),
+    'HRPRD_SC.dbo_PS_PERSON_NAME': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_person_name_etl'),
+    'HRPRD_SC.dbo_PS_PERSON_PHONE': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_person_phone_etl'),
+    'HRPRD_SC.dbo_PS_PERS_DATA_EFFDT': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pers_data_effdt_etl'),
+    'HRPRD_SC.dbo_PS_PERS_NID': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_pers_nid_etl'),
+    'HRPRD_SC.dbo_PS_PER_ORG_ASGN': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_per_org_asgn_etl'),
+    'HRPRD_SC.dbo_PS_STATE_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_state_tbl_etl'),
+    'HRPRD_SC.dbo_PS_Z_ACQ_CD_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_z_acq_cd_tbl_etl'),
+    'HRPRD_SC.dbo_PS_Z_LOCATION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_z_location_tbl_etl'),
+    'HRPRD_SC.dbo_PS_Z_POD_CD_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_z_pod_cd_tbl_etl'),
+    'HRPRD_SC.dbo_PS_Z_REGION_TBL': ('ACE_HR_sources_peoplesoft', 'peoplesoft_dbo_ps_z_region_tbl_etl'),
+}
+
+POKE_INTERVAL = 5 * 60
+TIMEOUT = 12 * 60 * 60
+FAILED_STATES = ['failed', 'upstream_failed']
+
+
+class DatasetSensor(ExternalTaskSensor):
+    """ExternalTaskSensor that fails once the external task is in one of failed_states.
+
+    The ExternalTaskSensor of Airflow 1.10 only knows allowed_states, so a
+    failed producer would leave the wait poking until its timeout.
+    """
+
+    @apply_defaults
+    def __init__(self, failed_states=None, *args, **kwargs):
+        super(DatasetSensor, self).__init__(*args, **kwargs)
+        self.failed_states = failed_states or []
+
+    @provide_session
+    def poke(self, context, session=None):
+        from sqlalchemy import func
+        if self.failed_states:
+            failed = session.query(func.count()).filter(
+                TaskInstance.dag_id == self.external_dag_id,
+                TaskInstance.task_id == self.external_task_id,
+                TaskInstance.state.in_(self.failed_states),
+                TaskInstance.execution_date == context['execution_date'],
+            ).scalar()
+            if failed:
+                raise AirflowException('{}.{} failed on {}'.format(
+                    self.external_dag_id, self.external_task_id, context['execution_date']))
+        return super(DatasetSensor, self).poke(context, session=session)
+
+
+def sensor_task_id(dataset):
+    return 'wait_' + re.sub(r'\W', '_', dataset.lower())
+
+
+def wait_for(dag, dataset):
+    """Sensor in dag for the task producing dataset, created once per DAG."""
+    task_id = sensor_task_id(dataset)
+    if task_id in dag.task_dict:
+        return dag.task_dict[task_id]
+    external_dag_id, external_task_id = DATASETS[dataset]
+    if external_dag_id == dag.dag_id:
+        raise ValueError("{} is produced in {} itself; depend on {} directly".format(
+            dataset, dag.dag_id, external_task_id))
+    sensor = DatasetSensor(
+        task_id=task_id,
+        external_dag_id=external_dag_id,
+        external_task_id=external_task_id,
+        failed_states=FAILED_STATES,
+        mode='reschedule',
+        poke_interval=POKE_INTERVAL,
+        timeout=TIMEOUT,
+        retries=0,
+        dag=dag
+    )
+    # Lets ace_hr.lineage treat the sensor as the dataset's producer
+    sensor.dataset = dataset
+    return sensor
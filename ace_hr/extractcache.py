@@ -0,0 +1,243 @@
+"""Registry of landed extracts, shared across DAGs.
+
+PROD09 tables such as dbo_PSXLATITEM, dbo_PS_JOB, dbo_PS_LOCATION_TBL and
+dbo_PS_DEPT_TBL are pulled by several DAGs each night. Every extract of a
+configured table is recorded in REGISTRY_TABLE once it lands. The key is
+the source system (the JDBC URL without credentials) and the query.
+
+Only whole-table extracts (SELECT * FROM <table>, no predicate) are
+cached. A chunked or windowed query lands part of a table, and the chunks
+of one task share their output table, so neither side of a copy would
+hold exactly the rows the other asked for.
+
+Before launching an extract, the patched DataFlowHook asks the cache. If
+another table landed the same extract within the freshness window and
+has not been modified since, it is copied into the output table with a
+BigQuery copy job, and no Dataflow job is launched.
+
+The settings come from the extract_cache Variable, all optional:
+
+    {"enabled": true, "tables": ["dbo_PS_JOB", ...], "freshness_hours": 6, "retention_days": 7}
+
+Registry rows expire with their day partition after retention_days. The
+registry table is created on first use, and only patched when its schema
+or partition expiration differs from the configured ones.
+
+ExtractCache takes the BigQuery discovery service as a constructor
+argument, like TemplateLauncher, so a fake service can stand in for it.
+"""
+import datetime
+import hashlib
+import logging
+import re
+import time
+
+CACHE_VARIABLE = 'extract_cache'
+
+REGISTRY_DATASET = 'ETLConfigACE'
+REGISTRY_TABLE = 'ExtractCache'
+
+REGISTRY_SCHEMA = [
+    {'name': 'cache_key', 'type': 'STRING'},
+    {'name': 'source', 'type': 'STRING'},
+    {'name': 'source_table', 'type': 'STRING'},
+    {'name': 'query', 'type': 'STRING'},
+    {'name': 'landed_table', 'type': 'STRING'},
+    {'name': 'landed_at', 'type': 'TIMESTAMP'},
+    {'name': 'job_name', 'type': 'STRING'},
+]
+
+# Source tables cached unless the Variable lists others
+SHARED_TABLES = ['dbo_PSXLATITEM', 'dbo_PS_JOB', 'dbo_PS_LOCATION_TBL', 'dbo_PS_DEPT_TBL']
+FRESHNESS_HOURS = 6
+RETENTION_DAYS = 7
+
+WHOLE_TABLE = re.compile(r'^SELECT\s+\*\s+FROM\s+([\w.]+)\s*;?$', re.IGNORECASE)
+CREDENTIALS = re.compile(r';\s*(?:user|password)[^;]*', re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+
+
+def source_system(connection_url):
+    return CREDENTIALS.sub('', connection_url)
+
+
+def cache_key(connection_url, query):
+    return hashlib.sha256('{}\n{}'.format(
+        source_system(connection_url), ' '.join(query.split())).encode('utf-8')).hexdigest()
+
+
+def table_reference(table, project):
+    """tables API reference of 'project:dataset.table', 'project.dataset.table' or 'dataset.table'."""
+    parts = table.replace(':', '.').split('.')
+    if len(parts) == 2:
+        parts = [project] + parts
+    return {'projectId': parts[0], 'datasetId': parts[1], 'tableId': parts[2]}
+
+
+def table_string(reference):
+    return '{projectId}:{datasetId}.{tableId}'.format(**reference)
+
+
+def copy_tables(service, project, source, destinations, poll_interval=5, num_retries=0):
+    """Copies source over each of destinations, all copy jobs running at once."""
+    jobs = {}
+    for destination in destinations:
+        job = service.jobs().insert(projectId=project, body={'configuration': {'copy': {
+            'sourceTable': table_reference(source, project),
+            'destinationTable': table_reference(destination, project),
+            'writeDisposition': 'WRITE_TRUNCATE',
+        }}}).execute(num_retries=num_retries)
+        jobs[destination] = job
+    errors = []
+    for destination, job in jobs.items():
+        reference = job['jobReference']
+        while job['status']['state'] != 'DONE':
+            time.sleep(poll_interval)
+            job = service.jobs().get(projectId=reference['projectId'], jobId=reference['jobId'],
+                                     location=reference.get('location')).execute(num_retries=num_retries)
+        if job['status'].get('errorResult'):
+            errors.append('{}: {}'.format(destination, job['status']['errorResult'].get('message')))
+    if errors:
+        raise Exception('Copy of {} failed for {}'.format(source, '; '.join(errors)))
+
+
+class ExtractCache(object):
+
+    def __init__(self, service, project, tables=SHARED_TABLES, freshness_hours=FRESHNESS_HOURS,
+                 retention_days=RETENTION_DAYS, poll_interval=5, num_retries=0):
+        self.service = service
+        self.project = project
+        self.tables = set(tables)
+        self.freshness_hours = freshness_hours
+        self.retention_days = retention_days
+        self.poll_interval = poll_interval
+        self.num_retries = num_retries
+        self._table_ready = False
+
+    @classmethod
+    def from_variable(cls, service, project, **kwargs):
+        """The cache as configured in the extract_cache Variable, or None when disabled."""
+        from airflow import models
+        config = models.Variable.get(CACHE_VARIABLE, default_var={}, deserialize_json=True)
+        if not config.get('enabled', True):
+            return None
+        return cls(service, project, tables=config.get('tables', SHARED_TABLES),
+                   freshness_hours=config.get('freshness_hours', FRESHNESS_HOURS),
+                   retention_days=config.get('retention_days', RETENTION_DAYS), **kwargs)
+
+    def cacheable(self, parameters):
+        match = WHOLE_TABLE.match(parameters.get('query', '').strip())
+        return bool(match and parameters.get('outputTable')
+                    and match.group(1).split('.')[-1] in self.tables)
+
+    def _ensure_registry(self):
+        from googleapiclient.errors import HttpError
+        if self._table_ready:
+            return
+        partitioning = {'type': 'DAY', 'field': 'landed_at',
+                        'expirationMs': str(self.retention_days * 24 * 3600 * 1000)}
+        try:
+            resource = self.service.tables().get(projectId=self.project, datasetId=REGISTRY_DATASET,
+                                                 tableId=REGISTRY_TABLE).execute(num_retries=self.num_retries)
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            resource = None
+        if resource is None:
+            try:
+                self.service.tables().insert(projectId=self.project, datasetId=REGISTRY_DATASET, body={
+                    'tableReference': {'projectId': self.project, 'datasetId': REGISTRY_DATASET,
+                                       'tableId': REGISTRY_TABLE},
+                    'schema': {'fields': REGISTRY_SCHEMA},
+                    'timePartitioning': partitioning,
+                }).execute(num_retries=self.num_retries)
+            except HttpError as e:
+                # Another task created it first
+                if e.resp.status != 409:
+                    raise
+        else:
+            changes = {}
+            fields = [(field['name'], field['type']) for field in resource.get('schema', {}).get('fields', [])]
+            if fields != [(field['name'], field['type']) for field in REGISTRY_SCHEMA]:
+                changes['schema'] = {'fields': REGISTRY_SCHEMA}
+            if resource.get('timePartitioning', {}).get('expirationMs') != partitioning['expirationMs']:
+                changes['timePartitioning'] = partitioning
+            if changes:
+                log.info("Updating %s of %s.%s", ' and '.join(sorted(changes)), REGISTRY_DATASET, REGISTRY_TABLE)
+                self.service.tables().patch(projectId=self.project, datasetId=REGISTRY_DATASET,
+                                            tableId=REGISTRY_TABLE, body=changes
+                                            ).execute(num_retries=self.num_retries)
+        self._table_ready = True
+
+    def _query(self, sql, parameters):
+        response = self.service.jobs().query(projectId=self.project, body={
+            'query': sql, 'useLegacySql': False, 'parameterMode': 'NAMED',
+            'queryParameters': [{'name': name, 'parameterType': {'type': kind},
+                                 'parameterValue': {'value': str(value)}}
+                                for name, kind, value in parameters],
+            'timeoutMs': 60000,
+        }).execute(num_retries=self.num_retries)
+        if not response.get('jobComplete', True):
+            log.warning("Extract cache lookup did not finish in time; extracting")
+            return []
+        return [[cell['v'] for cell in row['f']] for row in response.get('rows', [])]
+
+    def candidates(self, parameters):
+        """Tables that landed this extract within the freshness window, newest first, as (table, landed ms)."""
+        self._ensure_registry()
+        rows = self._query(
+            'SELECT landed_table, UNIX_MILLIS(landed_at) FROM `{}.{}.{}` '
+            'WHERE cache_key = @key AND landed_table != @output '
+            'AND landed_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @hours HOUR) '
+            'ORDER BY landed_at DESC'.format(self.project, REGISTRY_DATASET, REGISTRY_TABLE),
+            [('key', 'STRING', cache_key(parameters['connectionURL'], parameters['query'])),
+             ('output', 'STRING', table_string(table_reference(parameters['outputTable'], self.project))),
+             ('hours', 'INT64', self.freshness_hours)])
+        return [(table, int(landed_ms)) for table, landed_ms in rows]
+
+    def _unchanged_since(self, table, landed_ms):
+        from googleapiclient.errors import HttpError
+        try:
+            resource = self.service.tables().get(**table_reference(table, self.project)).execute(
+                num_retries=self.num_retries)
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        # A truncate or reload after the landing makes the snapshot unusable
+        return int(resource['lastModifiedTime']) <= landed_ms
+
+    def reuse(self, parameters, job_name):
+        """Copies a fresh landed snapshot into outputTable; returns the table copied, or None."""
+        if not self.cacheable(parameters):
+            return None
+        for table, landed_ms in self.candidates(parameters):
+            if not self._unchanged_since(table, landed_ms):
+                log.info("Cached extract in %s was modified after it landed; skipping it", table)
+                continue
+            log.info("Copying the extract landed in %s into %s instead of extracting", table,
+                     parameters['outputTable'])
+            copy_tables(self.service, self.project, table, [parameters['outputTable']],
+                        self.poll_interval, self.num_retries)
+            self.record(parameters, job_name)
+            return table
+        return None
+
+    def record(self, parameters, job_name):
+        """Registers outputTable as holding a fresh landing of the extract."""
+        if not self.cacheable(parameters):
+            return
+        self._ensure_registry()
+        row = {
+            'cache_key': cache_key(parameters['connectionURL'], parameters['query']),
+            'source': source_system(parameters['connectionURL']),
+            'source_table': WHOLE_TABLE.match(parameters['query'].strip()).group(1),
+            'query': parameters['query'],
+            'landed_table': table_string(table_reference(parameters['outputTable'], self.project)),
+            'landed_at': datetime.datetime.utcnow().isoformat(),
+            'job_name': job_name,
+        }
+        self.service.tabledata().insertAll(projectId=self.project, datasetId=REGISTRY_DATASET,
+                                           tableId=REGISTRY_TABLE, body={'rows': [{'json': row}]}
+                                           ).execute(num_retries=self.num_retries)
@@ -0,0 +1,68 @@
+"""Extract once, land in every configured BigQuery target.
+
+The extract output tables are fixed to amed-dev-analyticsplatform. Feeding
+another project or environment used to mean running every JDBC extract
+again. Now, once the patched DataFlowHook has landed an extract (or copied
+it from ace_hr.extractcache), the landed table is copied to each
+configured target. Table copies run in parallel and cost no source reads
+or Dataflow time, so adding an environment adds copy jobs only.
+
+The targets come from the extract_fanout Variable:
+
+    {"projects": ["amed-qa-analyticsplatform"],
+     "datasets": {"HRPRD_SC": "HRPRD_SC_QA"},
+     "tables": {"HRPRD_SC.dbo_PS_JOB": ["amed-sandbox:hr.dbo_PS_JOB"]}}
+
+* projects: every landed table is copied to the same dataset.table in
+  each project, with the dataset renamed by datasets if it is listed;
+* tables: extra targets for single tables.
+
+The nightly staging tables are copied as well, so another environment can
+run its own pay merges. The intraday and backfill staging tables
+(<table>_STAGING_<mode>, <table>_BACKFILL_<quarter>) are not: they only
+feed a merge in this project and are truncated or dropped right after.
+Target datasets must exist, in the same location.
+
+A chunked load lands all its chunks in one table, so it fans out once,
+after the last chunk, rather than per template launch.
+"""
+import logging
+import re
+
+from ace_hr.extractcache import copy_tables, table_reference, table_string
+
+FANOUT_VARIABLE = 'extract_fanout'
+
+TRANSIENT_TABLE = re.compile(r'_(?:STAGING|BACKFILL)_\w+$', re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+
+
+def fanout_targets(output_table, config, project):
+    """Targets of output_table under config, as 'project:dataset.table'; the table itself excluded."""
+    source = table_reference(output_table, project)
+    if TRANSIENT_TABLE.search(source['tableId']):
+        return []
+    dataset = config.get('datasets', {}).get(source['datasetId'], source['datasetId'])
+    targets = ['{}:{}.{}'.format(target_project, dataset, source['tableId'])
+               for target_project in config.get('projects', [])]
+    targets.extend(config.get('tables', {}).get('{datasetId}.{tableId}'.format(**source), []))
+    landed = table_string(source)
+    unique = []
+    for target in targets:
+        target = table_string(table_reference(target, project))
+        if target != landed and target not in unique:
+            unique.append(target)
+    return unique
+
+
+def fan_out(service, project, output_table, config=None, poll_interval=5, num_retries=0):
+    """Copies output_table to its configured targets; returns them."""
+    if config is None:
+        from airflow import models
+        config = models.Variable.get(FANOUT_VARIABLE, default_var={}, deserialize_json=True)
+    targets = fanout_targets(output_table, config, project)
+    if targets:
+        log.info("Copying %s to %s", output_table, ', '.join(targets))
+        copy_tables(service, project, output_table, targets, poll_interval, num_retries)
+    return targets
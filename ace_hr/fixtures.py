@@ -0,0 +1,222 @@
+"""Source fixtures and stand-in procedures for ace_hr.local.
+
+A local run needs a SQLite file per source schema and, for the CALLs,
+procedure SQL. build_fixtures() derives both from the DAGs themselves:
+
+* every table a DAG extracts gets a table in
+  <out>/<Database>.<Schema>.db with synthetic rows. Its columns are the
+  ones the DAG code relies on (the pay table keys, the columns the
+  extract queries filter on, the chunk column), plus a few generic ones.
+  The real tables have more, but the local run only needs these;
+* export_procedures() writes the routine definitions from BigQuery to
+  <sql_dir>/<Procedure>.sql, the layout ace_hr.lineage reads;
+* every procedure still without SQL there gets a stand-in. It reads each
+  table the procedure's task waits on or follows, and writes their row
+  counts to ETLConfigACE.<Procedure>_local. So the run checks that every
+  input had landed before the procedure ran.
+
+Rows come from a seeded random generator: the same seed and row count
+always give the same fixtures.
+
+Usage:
+    python -m ace_hr.fixtures --out DIR [--sql-dir DIR] [--rows 1000] [--seed 42]
+        [--from-bigquery] [--dag ACE_HR_employee ...]
+"""
+import argparse
+import datetime
+import io
+import logging
+import os
+import random
+import re
+import sqlite3
+
+from ace_hr.lineage import CALL_PATTERN
+from ace_hr.local import DAG_IDS, HASH_MERGE, SOURCE_TABLE, load_dags, output_table
+
+GENERIC_COLUMNS = [('EMPLID', 'TEXT'), ('EFFDT', 'TEXT'), ('DESCR', 'TEXT'), ('AMOUNT', 'REAL')]
+INTEGER_COLUMN = re.compile(r'(?:_NUM|_NBR|_RCD|EFFSEQ)$')
+FILTERED_COLUMN = re.compile(r'\b(\w+)\s*(?:>=|<=|<>|!=|=|<|>|\bIS\b|\bIN\b)', re.IGNORECASE)
+TEMPLATE = re.compile(r'\{\{.*?\}\}')
+PAY_TABLE = re.compile(r'^dbo_PS_PAY_(\w+)$', re.IGNORECASE)
+
+FIRST_DATE = datetime.date(2009, 1, 1)
+
+log = logging.getLogger(__name__)
+
+
+def source_tables(dags, pay_keys=None):
+    """(database, schema, table) -> columns, a list of (name, SQLite type), of every table the DAGs extract.
+
+    pay_keys maps each pay table to its keys, by default PAY_KEYS.
+    """
+    if pay_keys is None:
+        # Reads the Variables through ace_hr.common, so only once the DAGs are loaded
+        from ace_hr.payincrement import PAY_KEYS as pay_keys
+    tables = {}
+    for dag in dags:
+        for task in dag.tasks:
+            query = (getattr(task, 'parameters', None) or {}).get('query')
+            match = SOURCE_TABLE.search(query or '')
+            if not match:
+                continue
+            names = [name for name, _ in tables.get(match.groups(), GENERIC_COLUMNS)]
+            pay = PAY_TABLE.match(match.group(3))
+            names.extend(pay_keys.get(pay.group(1).lower(), []) if pay else [])
+            names.extend(FILTERED_COLUMN.findall(TEMPLATE.sub("''", query.split(' WHERE ', 1)[1]))
+                         if ' WHERE ' in query else [])
+            if getattr(task, 'chunk_column', None):
+                names.append(task.chunk_column)
+            columns = []
+            for name in names:
+                if name.upper() not in [c.upper() for c, _ in columns]:
+                    columns.append((name, column_type(name)))
+            tables[match.groups()] = columns
+    return tables
+
+
+def column_type(name):
+    if name == 'AMOUNT':
+        return 'REAL'
+    return 'INTEGER' if INTEGER_COLUMN.search(name.upper()) else 'TEXT'
+
+
+def column_value(name, column_type, i, rand, last_date):
+    name = name.upper()
+    if name == 'PAY_END_DT':
+        # Biweekly pay periods over the last two years
+        return (last_date - datetime.timedelta(days=14 * rand.randint(0, 52))).isoformat()
+    if name.endswith('DTTM'):
+        return datetime.datetime.combine(last_date, datetime.time()).replace(
+            hour=rand.randint(0, 23), minute=rand.randint(0, 59)).isoformat(' ')
+    if name.endswith('DT'):
+        return (FIRST_DATE + datetime.timedelta(days=rand.randint(0, (last_date - FIRST_DATE).days))).isoformat()
+    if name == 'PAGE_NUM':
+        # Unique, so the pay table keys are too
+        return i
+    if column_type == 'INTEGER':
+        return rand.randint(0, 9)
+    if column_type == 'REAL':
+        return round(rand.uniform(0, 5000), 2)
+    if name == 'EMPLID':
+        return '{:08d}'.format(rand.randint(1, max(1, i // 4 + 1)))
+    return '{}{:03d}'.format(name[:4], rand.randint(1, 50))
+
+
+def write_source_fixtures(tables, out, rows=1000, seed=42, last_date=None):
+    """Writes every table into <out>/<Database>.<Schema>.db; returns the files written."""
+    last_date = last_date or datetime.date.today() - datetime.timedelta(days=1)
+    if not os.path.isdir(out):
+        os.makedirs(out)
+    files = set()
+    for (database, schema, table), columns in sorted(tables.items()):
+        path = os.path.join(out, '{}.{}.db'.format(database, schema))
+        rand = random.Random('{}:{}'.format(seed, table))
+        connection = sqlite3.connect(path)
+        try:
+            connection.execute('DROP TABLE IF EXISTS ' + table)
+            connection.execute('CREATE TABLE {} ({})'.format(
+                table, ', '.join('"{}" {}'.format(name, kind) for name, kind in columns)))
+            connection.executemany('INSERT INTO {} VALUES ({})'.format(table, ', '.join('?' * len(columns))), (
+                [column_value(name, kind, i, rand, last_date) for name, kind in columns] for i in range(rows)))
+            connection.commit()
+        finally:
+            connection.close()
+        files.add(path)
+    return sorted(files)
+
+
+def procedure_inputs(dags):
+    """Procedure name -> the sorted tables its task waits on or follows."""
+    procedures = {}
+    for dag in dags:
+        for task in dag.tasks:
+            names = list(getattr(task, 'procedures', None) or [])
+            sql = getattr(task, 'sql', None)
+            if isinstance(sql, str):
+                names.extend(call.strip('`') for call in CALL_PATTERN.findall(sql))
+            if not names:
+                continue
+            inputs = set()
+            for upstream in task.upstream_list:
+                dataset = getattr(upstream, 'dataset', None)
+                parameters = getattr(upstream, 'parameters', None) or {}
+                merge = HASH_MERGE.search(upstream.sql) if isinstance(getattr(upstream, 'sql', None), str) else None
+                if dataset and not dataset.startswith('ETLConfigACE.'):
+                    inputs.add(dataset)
+                elif 'outputTable' in parameters:
+                    inputs.add(output_table(parameters))
+                elif merge:
+                    inputs.add(merge.group(3))
+            for name in names:
+                procedures.setdefault(name.split('.')[-1], set()).update(inputs)
+    return dict((name, sorted(inputs)) for name, inputs in procedures.items())
+
+
+def stand_in_sql(procedure, inputs):
+    counts = ["SELECT '{}' AS input_table, COUNT(*) AS input_rows FROM {}".format(table, table)
+              for table in inputs] or ["SELECT 'none' AS input_table, 0 AS input_rows"]
+    return ('-- Stand-in written by ace_hr.fixtures: {} reads what its task waits on.\n'
+            '-- Replace with the ported procedure to check its logic.\n'
+            'CREATE OR REPLACE TABLE ETLConfigACE.{}_local AS\n{};\n').format(
+                procedure, procedure, '\nUNION ALL\n'.join(counts))
+
+
+def export_procedures(routines, procedures, sql_dir):
+    """Writes the definition of each of procedures found in routines to sql_dir; returns those written."""
+    written = []
+    for procedure in procedures:
+        definition = routines.definition('ETLConfigACE.' + procedure)
+        if definition is None:
+            continue
+        with io.open(os.path.join(sql_dir, procedure + '.sql'), 'w', encoding='utf-8') as f:
+            f.write(definition)
+        written.append(procedure)
+    return written
+
+
+def write_stand_ins(procedures, sql_dir):
+    """Writes a stand-in for each procedure with no .sql in sql_dir; returns those written."""
+    if not os.path.isdir(sql_dir):
+        os.makedirs(sql_dir)
+    existing = set(os.path.splitext(name)[0].lower() for name in os.listdir(sql_dir))
+    written = []
+    for procedure, inputs in sorted(procedures.items()):
+        if procedure.lower() in existing:
+            continue
+        with io.open(os.path.join(sql_dir, procedure + '.sql'), 'w', encoding='utf-8') as f:
+            f.write(stand_in_sql(procedure, inputs))
+        written.append(procedure)
+    return written
+
+
+def build_fixtures(dags, out, sql_dir=None, rows=1000, seed=42, routines=None):
+    """Writes the source fixtures and the procedure SQL of dags; returns (files, exported, stand-ins)."""
+    files = write_source_fixtures(source_tables(dags), out, rows, seed)
+    procedures = procedure_inputs(dags)
+    sql_dir = sql_dir or os.path.join(out, 'sql')
+    if not os.path.isdir(sql_dir):
+        os.makedirs(sql_dir)
+    exported = export_procedures(routines, sorted(procedures), sql_dir) if routines else []
+    return files, exported, write_stand_ins(procedures, sql_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--out', required=True, help='directory for the <Database>.<Schema>.db fixtures')
+    parser.add_argument('--sql-dir', help='directory for the procedure SQL (default: <out>/sql)')
+    parser.add_argument('--rows', type=int, default=1000, help='rows per source table')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--from-bigquery', action='store_true',
+                        help='export the procedure definitions from BigQuery before writing stand-ins')
+    parser.add_argument('--dag', action='append', help='DAG to build for, repeatable (default: all nightly DAGs)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    routines = None
+    if args.from_bigquery:
+        from ace_hr.lineage import BigQueryRoutines
+        routines = BigQueryRoutines()
+    files, exported, stand_ins = build_fixtures(load_dags(args.dag or DAG_IDS), args.out, args.sql_dir,
+                                                args.rows, args.seed, routines)
+    log.info("Wrote %s source fixtures, exported %s procedures, wrote %s stand-ins",
+             len(files), len(exported), len(stand_ins))
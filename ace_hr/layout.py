@@ -0,0 +1,397 @@
+"""Partitioning and clustering of the incremental pay tables.
+
+Each night the pay tables reload every row from the last PAY_END_DT
+watermark onwards into a _STAGING table and merge it into the target. On
+an unpartitioned target every merge scans the whole payroll history.
+TABLE_LAYOUTS declares a partition column and clustering per target.
+apply_layouts() creates or migrates the targets to match, keeping their
+description, labels, column descriptions, policy tags and access policy.
+It also adds the ROW_HASH column that the merges in ace_hr.rowhash match
+on. Those merges only touch the partitions from the watermark onwards.
+
+The merges are to replace the ETLConfigACE.MergePay* procedures, one
+table at a time. The nightly chain keeps calling a table's procedure
+until the table is listed in the pay_row_hash_merges Variable. Before
+listing it, run from the command line:
+
+* check, which reads the procedures' bodies and fails if they do
+  anything the row-hash merge does not, such as another table, a
+  computed column or an UPDATE;
+* compare, after a night in which the procedure ran, which runs the
+  row-hash merge on a copy of the target as it was before the procedure
+  and counts the rows that differ from what the procedure left.
+
+Usage:
+    python -m ace_hr.layout check
+    python -m ace_hr.layout compare check --before "2026-10-18 22:00:00+00"
+"""
+import argparse
+import logging
+import re
+import sys
+
+from ace_hr.rowhash import ROW_HASH_COLUMN, add_hash_column_statement, hash_merge_sql
+
+TABLE_LAYOUTS = {
+    'HRPRD_SC.dbo_PS_PAY_CHECK': {
+        'partition': 'PAY_END_DT', 'granularity': 'MONTH', 'cluster': ['EMPLID']},
+    'HRPRD_SC.dbo_PS_PAY_EARNINGS': {
+        'partition': 'PAY_END_DT', 'granularity': 'MONTH', 'cluster': ['EMPLID']},
+    'HRPRD_SC.dbo_PS_PAY_TAX': {
+        'partition': 'PAY_END_DT', 'granularity': 'MONTH', 'cluster': ['COMPANY', 'PAYGROUP', 'PAGE_NUM']},
+    'HRPRD_SC.dbo_PS_PAY_OTH_EARNS': {
+        'partition': 'PAY_END_DT', 'granularity': 'MONTH', 'cluster': ['COMPANY', 'PAYGROUP', 'PAGE_NUM']},
+    'HRPRD_SC.dbo_PS_PAY_DEDUCTION': {
+        'partition': 'PAY_END_DT', 'granularity': 'MONTH', 'cluster': ['COMPANY', 'PAYGROUP', 'PAGE_NUM']},
+}
+
+# The procedures the row-hash merges replace, and the target each merged
+REPLACED_PROCEDURES = {
+    'ETLConfigACE.MergePayCheck': 'HRPRD_SC.dbo_PS_PAY_CHECK',
+    'ETLConfigACE.MergePayEarnings': 'HRPRD_SC.dbo_PS_PAY_EARNINGS',
+    'ETLConfigACE.MergePayTax': 'HRPRD_SC.dbo_PS_PAY_TAX',
+    'ETLConfigACE.MergePayOthEarns': 'HRPRD_SC.dbo_PS_PAY_OTH_EARNS',
+    'ETLConfigACE.MergePayDeduction': 'HRPRD_SC.dbo_PS_PAY_DEDUCTION',
+}
+
+# Label put on the row-hash merge jobs, used by the bytes report
+MERGE_LABEL = 'ace_merge'
+
+TRUNC_FUNCTIONS = {'DATE': 'DATE_TRUNC', 'DATETIME': 'DATETIME_TRUNC', 'TIMESTAMP': 'TIMESTAMP_TRUNC'}
+
+log = logging.getLogger(__name__)
+
+
+def partition_expression(column, column_type, granularity):
+    if column_type not in TRUNC_FUNCTIONS:
+        raise ValueError("Cannot partition on {} of type {}".format(column, column_type))
+    if column_type == 'DATE' and granularity == 'DAY':
+        return column
+    return '{}({}, {})'.format(TRUNC_FUNCTIONS[column_type], column, granularity)
+
+
+def layout_options(layout, schema):
+    """PARTITION BY / CLUSTER BY clause for a table with the given schema.
+
+    schema maps column names to BigQuery types. Cluster columns missing
+    from the table are left out, since not every pay table carries EMPLID.
+    """
+    clause = 'PARTITION BY ' + partition_expression(
+        layout['partition'], schema[layout['partition']], layout.get('granularity', 'DAY'))
+    cluster = [column for column in layout.get('cluster', []) if column in schema]
+    if cluster:
+        clause += ' CLUSTER BY ' + ', '.join(cluster)
+    return clause
+
+
+def migrate_statements(table, layout, schema, partitioning_matches=False):
+    """Rebuilds table with the declared layout.
+
+    With the partitioning unchanged, the table is replaced in one atomic
+    CREATE OR REPLACE. BigQuery rejects that when the partitioning
+    changes ("Cannot replace a table with a different partitioning
+    spec"), so then the data is copied into a new table which takes the
+    original name. The copy is only dropped by the rename: if that fails,
+    layout_statements() finishes the move on the next try.
+    """
+    options = layout_options(layout, schema)
+    if partitioning_matches:
+        return ['CREATE OR REPLACE TABLE {} {} AS SELECT * FROM {}'.format(table, options, table)]
+    rebuilt = rebuilt_table(table)
+    return [
+        'CREATE OR REPLACE TABLE {} {} AS SELECT * FROM {}'.format(rebuilt, options, table),
+        drop_statement(table),
+        rename_statement(table),
+    ]
+
+
+def drop_statement(table):
+    return 'DROP TABLE {}'.format(table)
+
+
+def rebuilt_table(table):
+    return table + '__layout'
+
+
+def rename_statement(table):
+    return 'ALTER TABLE {} RENAME TO {}'.format(rebuilt_table(table), table.split('.')[1])
+
+
+def create_statement(table, layout, schema):
+    # New targets take the staging table's columns
+    return 'CREATE TABLE IF NOT EXISTS {} {} AS SELECT * FROM {}_STAGING LIMIT 0'.format(
+        table, layout_options(layout, schema), table)
+
+
+def layout_statements(table, layout, resource, rebuilt, staging):
+    """Statements bringing table to layout.
+
+    resource, rebuilt and staging are the table resources of table, of its
+    __layout copy and of its staging table, None where missing. A copy
+    next to a missing target is what a migration leaves when it fails
+    between the DROP and the RENAME. The copy holds every row, so it is
+    renamed into place rather than replaced by an empty target. A copy
+    next to the target is from a migration that failed before the DROP,
+    and is rebuilt.
+    """
+    statements = [add_hash_column_statement(table + '_STAGING')]
+    if resource is None and rebuilt is not None:
+        statements.append(rename_statement(table))
+        resource = rebuilt
+    elif resource is None:
+        if staging is None:
+            raise ValueError("Cannot create {} with its layout: neither it nor {}_STAGING exists".format(
+                table, table))
+        statements.append(create_statement(table, layout, _schema(staging)))
+        return statements
+    statements.append(add_hash_column_statement(table))
+    if not layout_matches(resource, layout, _schema(resource)):
+        statements.extend(migrate_statements(table, layout, _schema(resource),
+                                             partitioning_matches(resource, layout)))
+    return statements
+
+
+def _split_statements(definition):
+    definition = re.sub(r'--[^\n]*|/\*.*?\*/', ' ', definition, flags=re.DOTALL)
+    # Project qualifiers and backticks do not change what a statement does
+    definition = re.sub(r'[\w-]+\.(\w+\.\w+)', r'\1', definition.replace('`', ''))
+    return [' '.join(statement.split()) for statement in definition.split(';') if statement.strip()]
+
+
+def uncovered_statements(definition, target):
+    """Statements of a replaced procedure's body the row-hash merge does not do.
+
+    The merge deletes the target's rows from the watermark on that are no
+    longer staged and inserts the staged rows as they are, and the chain
+    rebuilds _MAX and truncates staging. Statements doing only that are
+    covered. Anything else, such as another table, a column list, a
+    computed value or an UPDATE, is returned.
+    """
+    target, staging, watermark = [re.escape(name.upper()) for name in
+                                  [target, target + '_STAGING', target + '_MAX']]
+    covered = [re.compile(pattern) for pattern in [
+        r'^(BEGIN|END|DECLARE|SET|COMMIT|ROLLBACK)\b',
+        r'^DELETE (FROM )?{}( \w+)? WHERE '.format(target),
+        r'^INSERT (INTO )?{} SELECT \* FROM {}( \w+)?( WHERE .*)?$'.format(target, staging),
+        r'^TRUNCATE TABLE {}$'.format(staging),
+        r'^CREATE OR REPLACE TABLE {} AS SELECT .* FROM {}$'.format(watermark, target),
+        r'^MERGE (INTO )?{}( \w+)? USING {}( \w+)? ON ((?!UPDATE|INSERT \().)*$'.format(target, staging),
+    ]]
+    return [statement for statement in _split_statements(definition)
+            if not any(pattern.search(statement.upper()) for pattern in covered)]
+
+
+def check_replaced_procedures(cursor, procedures=None):
+    """Fails if a procedure the row-hash merges are to replace does more than they do."""
+    procedures = procedures or REPLACED_PROCEDURES
+    uncovered = {}
+    for dataset in sorted(set(procedure.split('.')[0] for procedure in procedures)):
+        cursor.execute("SELECT routine_name, routine_definition FROM {}.INFORMATION_SCHEMA.ROUTINES "
+                       "WHERE routine_type = 'PROCEDURE'".format(dataset))
+        for name, definition in cursor.fetchall():
+            procedure = dataset + '.' + name
+            if procedure in procedures:
+                statements = uncovered_statements(definition or '', procedures[procedure])
+                if statements:
+                    uncovered[procedure] = statements
+    if uncovered:
+        raise ValueError("The row-hash merges replace procedures that also do:\n" + "\n".join(
+            "{}: {}".format(procedure, statement)
+            for procedure, statements in sorted(uncovered.items()) for statement in statements)
+            + "\nPort this logic into the pay merge chain (ace_hr.payincrement) before listing the "
+              "table in pay_row_hash_merges.")
+
+
+def procedure_call_sql(target):
+    """CALL of the MergePay* procedure that merges target."""
+    procedure = dict((table, name) for name, table in REPLACED_PROCEDURES.items())[target]
+    return "CALL `amed-dev-analyticsplatform.{}`();".format(procedure)
+
+
+def compare_merge_sql(target, before):
+    """Script running the row-hash merge on target as of before, and counting the rows that differ.
+
+    Run after a night whose chain called the procedure, before the next
+    one truncates the staging table. before is a timestamp between that
+    night's staging and its procedure call, within the time travel window.
+    The copy is dropped at the end; ROW_HASH is left out of the comparison.
+    """
+    # The merge's DECLARE has to open the script
+    declare, merge = hash_merge_sql(compare_table(target), staging=target + '_STAGING',
+                                    watermark=target + '_MAX').split('\n', 1)
+    return """{declare}
+CREATE OR REPLACE TABLE {copy} AS SELECT * FROM {target} FOR SYSTEM_TIME AS OF TIMESTAMP '{before}';
+{merge}
+SELECT
+  (SELECT COUNT(*) FROM (SELECT * EXCEPT({hash}) FROM {target}
+                         EXCEPT DISTINCT SELECT * EXCEPT({hash}) FROM {copy})) AS only_after_procedure,
+  (SELECT COUNT(*) FROM (SELECT * EXCEPT({hash}) FROM {copy}
+                         EXCEPT DISTINCT SELECT * EXCEPT({hash}) FROM {target})) AS only_after_merge;""".format(
+        declare=declare, merge=merge, copy=compare_table(target), target=target, before=before,
+        hash=ROW_HASH_COLUMN)
+
+
+def compare_table(target):
+    return target + '__compare'
+
+
+def compare_merge(cursor, target, before):
+    """(rows only the procedure left, rows only the row-hash merge left) in target."""
+    try:
+        cursor.execute(compare_merge_sql(target, before))
+        return tuple(cursor.fetchall()[-1])
+    finally:
+        cursor.execute('DROP TABLE IF EXISTS ' + compare_table(target))
+
+
+def partitioning_matches(table_resource, layout):
+    partitioning = table_resource.get('timePartitioning', {})
+    return (partitioning.get('field') == layout['partition']
+            and partitioning.get('type', 'DAY') == layout.get('granularity', 'DAY'))
+
+
+def layout_matches(table_resource, layout, schema):
+    clustering = table_resource.get('clustering', {}).get('fields', [])
+    wanted_cluster = [column for column in layout.get('cluster', []) if column in schema]
+    return partitioning_matches(table_resource, layout) and clustering == wanted_cluster
+
+
+def _schema(table_resource):
+    if table_resource is None:
+        raise ValueError("Table not found")
+    return dict((field['name'], field['type'].replace('INTEGER', 'INT64'))
+                for field in table_resource['schema']['fields'])
+
+
+def table_metadata(table_resource):
+    """What a rebuild of the table drops: description, labels, column descriptions and policy tags."""
+    metadata = dict((key, table_resource[key]) for key in ['description', 'labels'] if key in table_resource)
+    fields = table_resource.get('schema', {}).get('fields', [])
+    if any('description' in field or 'policyTags' in field for field in fields):
+        metadata['schema'] = {'fields': fields}
+    return metadata
+
+
+def restore_metadata(service, project, table, metadata, policy):
+    """Puts the metadata and access policy of the table before its rebuild back on it."""
+    dataset, name = table.split('.')
+    if metadata:
+        if 'schema' in metadata:
+            # The rebuilt table may have columns the old one lacked, such as
+            # ROW_HASH, or of another type, so only the descriptions and
+            # policy tags are carried over
+            current = service.tables().get(projectId=project, datasetId=dataset, tableId=name).execute()
+            old = dict((field['name'], field) for field in metadata['schema']['fields'])
+            metadata = dict(metadata, schema={'fields': [
+                dict(field, **dict((key, value) for key, value in old.get(field['name'], {}).items()
+                                   if key in ('description', 'policyTags')))
+                for field in current['schema']['fields']]})
+        service.tables().patch(projectId=project, datasetId=dataset, tableId=name, body=metadata).execute()
+    if policy and policy.get('bindings'):
+        service.tables().setIamPolicy(resource=table_path(project, table),
+                                      body={'policy': {'bindings': policy['bindings']}}).execute()
+
+
+def table_path(project, table):
+    dataset, name = table.split('.')
+    return 'projects/{}/datasets/{}/tables/{}'.format(project, dataset, name)
+
+
+def _get_table(service, project, table):
+    from googleapiclient.errors import HttpError
+    dataset, name = table.split('.')
+    try:
+        return service.tables().get(projectId=project, datasetId=dataset, tableId=name).execute()
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None
+        raise
+
+
+def apply_layouts(project, layouts=None, bigquery_conn_id='bigquery_default', **kwargs):
+    """Creates missing targets and migrates those whose layout differs.
+
+    Staging and target both get the ROW_HASH column if they lack it. A
+    migrated table gets its metadata and access policy back.
+    """
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    service = hook.get_service()
+    cursor = hook.get_conn().cursor()
+    for table, layout in sorted((layouts or TABLE_LAYOUTS).items()):
+        resource = _get_table(service, project, table)
+        rebuilt = _get_table(service, project, rebuilt_table(table))
+        staging = None
+        if resource is None and rebuilt is None:
+            staging = _get_table(service, project, table + '_STAGING')
+        statements = layout_statements(table, layout, resource, rebuilt, staging)
+        migrating = resource is not None and not layout_matches(resource, layout, _schema(resource))
+        if migrating:
+            metadata = table_metadata(resource)
+            policy = service.tables().getIamPolicy(resource=table_path(project, table), body={}).execute()
+        for statement in statements:
+            if migrating and statement == drop_statement(table):
+                # The copy takes the metadata before the original goes, so
+                # a migration interrupted before the rename keeps it
+                restore_metadata(service, project, rebuilt_table(table), metadata, None)
+            log.info("Applying layout to %s: %s", table, statement)
+            cursor.run_query(sql=statement)
+        if migrating:
+            restore_metadata(service, project, table, metadata, policy)
+
+
+def merge_bytes_report_sql(region='us', days=14):
+    """Bytes processed per pay merge and day, old procedure calls vs row-hash merges."""
+    return """SELECT
+  DATE(creation_time) AS run_date,
+  COALESCE((SELECT value FROM UNNEST(labels) WHERE key = '{label}'),
+           REGEXP_EXTRACT(query, r'ETLConfigACE\\.(MergePay\\w+)')) AS merge,
+  IF(EXISTS(SELECT 1 FROM UNNEST(labels) WHERE key = '{label}'), 'row_hash_merge', 'procedure') AS method,
+  SUM(total_bytes_processed) AS bytes_processed,
+  SUM(total_slot_ms) AS slot_ms
+FROM `region-{region}`.INFORMATION_SCHEMA.JOBS_BY_PROJECT
+WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
+  AND state = 'DONE'
+  AND parent_job_id IS NULL
+  AND (EXISTS(SELECT 1 FROM UNNEST(labels) WHERE key = '{label}')
+       OR REGEXP_CONTAINS(query, r'CALL .*ETLConfigACE\\.MergePay'))
+GROUP BY run_date, merge, method
+ORDER BY merge, run_date""".format(label=MERGE_LABEL, region=region, days=days)
+
+
+def log_merge_bytes_report(bigquery_conn_id='bigquery_default', region='us', days=14, **kwargs):
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    cursor = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False).get_conn().cursor()
+    cursor.execute(merge_bytes_report_sql(region, days))
+    for row in cursor.fetchall():
+        log.info("%s %-28s %-16s %15s bytes %12s slot-ms", *row)
+
+
+if __name__ == '__main__':
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    from ace_hr.payincrement import PAY_TABLES, pay_tables
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('check', help='fail if a MergePay* procedure does more than the row-hash merge')
+    compare = commands.add_parser('compare', help="compare a night's procedure call with the row-hash merge")
+    compare.add_argument('name', choices=PAY_TABLES)
+    compare.add_argument('--before', required=True,
+                         help='timestamp after that night staged the table and before its procedure ran')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    cursor = BigQueryHook(use_legacy_sql=False).get_conn().cursor()
+    if args.command == 'check':
+        try:
+            check_replaced_procedures(cursor)
+        except ValueError as e:
+            log.error("%s", e)
+            sys.exit(1)
+        log.info("Every MergePay* procedure only does what the row-hash merge does")
+    elif args.command == 'compare':
+        target = pay_tables(args.name)[0]
+        only_procedure, only_merge = compare_merge(cursor, target, args.before)
+        log.info("%s: %s rows only after the procedure, %s only after the row-hash merge",
+                 target, only_procedure, only_merge)
+        sys.exit(1 if only_procedure or only_merge else 0)
+    else:
+        parser.print_help()
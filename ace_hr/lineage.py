@@ -0,0 +1,289 @@
+"""Task dependencies derived from the lineage of the procedure SQL.
+
+The edges into the procedure tasks at the bottom of the DAG files are
+maintained by hand. An edge that is not needed holds a procedure back for
+nothing, and a missing one lets it read a table that is still loading.
+
+This module parses the body of every procedure a task calls, either from
+local .sql files or from the routine definitions in BigQuery, into the
+tables it reads and writes. The other tasks' outputs are known from the
+DAG itself: outputTable for the Dataflow loads and the statement targets
+for BigQuery tasks. A wait_for sensor (ace_hr.datasets) stands for its
+dataset's producer: the table it names, or for a procedure dataset the
+tables that procedure writes. A procedure task then needs exactly the tasks that
+write one of its input tables, less the ones already implied through
+another dependency (transitive reduction).
+
+Usage:
+    python -m ace_hr.lineage ACE_HR_employee [--sql-dir DIR]
+
+prints the missing edges, the declared edges that can be dropped, and the
+minimal edge set for the procedure tasks.
+"""
+import argparse
+import io
+import logging
+import os
+import re
+
+_REF = r'(`[^`]+`|[A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*)+)'
+
+WRITE_PATTERNS = [
+    re.compile(r'\bINSERT\s+(?:INTO\s+)?' + _REF, re.IGNORECASE),
+    re.compile(r'\bMERGE\s+(?:INTO\s+)?' + _REF, re.IGNORECASE),
+    re.compile(r'\bUPDATE\s+' + _REF, re.IGNORECASE),
+    re.compile(r'\bDELETE\s+(?:FROM\s+)?' + _REF, re.IGNORECASE),
+    re.compile(r'\bTRUNCATE\s+TABLE\s+' + _REF, re.IGNORECASE),
+    re.compile(r'\bCREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?' + _REF, re.IGNORECASE),
+]
+READ_PATTERN = re.compile(r'\b(?:FROM|JOIN|USING)\s+' + _REF, re.IGNORECASE)
+CALL_PATTERN = re.compile(r'\bCALL\s+' + _REF + r'\s*\(', re.IGNORECASE)
+# FROM inside these is not a table reference
+NOT_A_TABLE = re.compile(r'\b(?:EXTRACT|TRIM|SUBSTRING)\s*\([^()]*?\bFROM\b', re.IGNORECASE)
+COMMENTS_AND_STRINGS = re.compile(r"--[^\n]*|#[^\n]*|/\*.*?\*/|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"",
+                                  re.DOTALL)
+
+log = logging.getLogger(__name__)
+
+
+def table_name(reference):
+    """dataset.table, lower case, for any of the ways a table is written.
+
+    "project:dataset.table", `project.dataset.table` and dataset.table all
+    name the same table.
+    """
+    parts = reference.strip('`').replace(':', '.').split('.')
+    return '.'.join(parts[-2:]).lower()
+
+
+def _blank(sql, match):
+    return sql[:match.start()] + ' ' * (match.end() - match.start()) + sql[match.end():]
+
+
+def statement_lineage(sql):
+    """(reads, writes, calls) of a SQL script, as sets of table or routine names."""
+    sql = COMMENTS_AND_STRINGS.sub(' ', sql)
+    for match in list(NOT_A_TABLE.finditer(sql)):
+        sql = _blank(sql, match)
+    writes, calls = set(), set()
+    for match in list(CALL_PATTERN.finditer(sql)):
+        calls.add(match.group(1).strip('`').replace(':', '.'))
+        sql = _blank(sql, match)
+    for pattern in WRITE_PATTERNS:
+        for match in list(pattern.finditer(sql)):
+            writes.add(table_name(match.group(1)))
+            sql = _blank(sql, match)
+    reads = set(table_name(match.group(1)) for match in READ_PATTERN.finditer(sql))
+    return reads, writes, calls
+
+
+class SqlDirectoryRoutines(object):
+    """Procedure bodies from <directory>/<ProcedureName>.sql."""
+
+    def __init__(self, directory):
+        self.files = dict((os.path.splitext(name)[0].lower(), os.path.join(directory, name))
+                          for name in os.listdir(directory) if name.lower().endswith('.sql'))
+
+    def definition(self, routine):
+        path = self.files.get(routine.split('.')[-1].lower())
+        if path is None:
+            return None
+        with io.open(path, encoding='utf-8') as f:
+            return f.read()
+
+
+class BigQueryRoutines(object):
+    """Procedure bodies from the routine definitions in BigQuery.
+
+    A routine named dataset.routine is looked up in the connection's project.
+    """
+
+    def __init__(self, bigquery_conn_id='bigquery_default'):
+        from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+        hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+        self.service = hook.get_service()
+        self.project = hook.project_id
+
+    def definition(self, routine):
+        from googleapiclient.errors import HttpError
+        if routine.count('.') == 1:
+            routine = self.project + '.' + routine
+        project, dataset, name = routine.split('.')
+        try:
+            return self.service.routines().get(
+                projectId=project, datasetId=dataset, routineId=name).execute().get('definitionBody')
+        except HttpError as e:
+            if e.resp.status == 404:
+                return None
+            raise
+
+
+def procedure_lineage(routines, routine, seen=None):
+    """(reads, writes) of a procedure, including the procedures it calls."""
+    seen = set() if seen is None else seen
+    if routine in seen:
+        return set(), set()
+    seen.add(routine)
+    body = routines.definition(routine)
+    if body is None:
+        raise ValueError('No definition found for routine ' + routine)
+    reads, writes, calls = statement_lineage(body)
+    for called in calls:
+        if called.count('.') == 1 and routine.count('.') == 2:
+            # Unqualified calls are in the calling routine's project
+            called = routine.split('.')[0] + '.' + called
+        called_reads, called_writes = procedure_lineage(routines, called, seen)
+        reads |= called_reads
+        writes |= called_writes
+    # A table the procedure builds itself is not an input
+    return reads - writes, writes
+
+
+def task_procedures(task):
+    if hasattr(task, 'procedures'):
+        return list(task.procedures)
+    sql = getattr(task, 'sql', None)
+    if isinstance(sql, str):
+        return [call.strip('`').replace(':', '.') for call in CALL_PATTERN.findall(sql)]
+    return []
+
+
+def dataset_outputs(routines, dataset):
+    """Tables written by the producer of an ace_hr.datasets dataset.
+
+    A procedure task publishes under the procedure's name, so a dataset
+    with a procedure definition stands for the tables that procedure
+    writes; any other dataset is the table itself.
+    """
+    if routines is not None and routines.definition(dataset) is not None:
+        return procedure_lineage(routines, dataset)[1]
+    return set([table_name(dataset)])
+
+
+def task_outputs(task, routines=None):
+    """Tables a non-procedure task writes; routines resolves the datasets of procedure sensors."""
+    outputs = set()
+    parameters = getattr(task, 'parameters', None) or {}
+    if parameters.get('outputTable'):
+        outputs.add(table_name(parameters['outputTable']))
+    if getattr(task, 'dataset', None):
+        # ace_hr.datasets sensors stand in for a producer in another DAG
+        outputs |= dataset_outputs(routines, task.dataset)
+    if getattr(task, 'destination_dataset_table', None):
+        outputs.add(table_name(task.destination_dataset_table))
+    sql = getattr(task, 'sql', None)
+    for statement in (sql if isinstance(sql, (list, tuple)) else [sql] if sql else []):
+        outputs |= statement_lineage(statement)[1]
+    return outputs
+
+
+def task_lineage(dag, routines):
+    """task_id -> (reads, writes); reads is None for tasks that call no procedure."""
+    lineage = {}
+    for task in dag.tasks:
+        procedures = task_procedures(task)
+        if procedures:
+            reads, writes = set(), set()
+            for procedure in procedures:
+                procedure_reads, procedure_writes = procedure_lineage(routines, procedure)
+                reads |= procedure_reads
+                writes |= procedure_writes
+            lineage[task.task_id] = (reads, writes)
+        else:
+            lineage[task.task_id] = (None, task_outputs(task, routines))
+    return lineage
+
+
+def _reachable(edges, start):
+    seen, stack = set(), list(edges.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(edges.get(node, ()))
+    return seen
+
+
+def transitive_reduction(edges):
+    """The edges of the DAG edges (node -> set of children) not implied by a longer path."""
+    reduced = {}
+    for node, children in edges.items():
+        implied = set()
+        for child in children:
+            implied |= _reachable(edges, child)
+        reduced[node] = set(children) - implied
+    return reduced
+
+
+def declared_edges(dag):
+    return dict((task.task_id, set(task.downstream_task_ids)) for task in dag.tasks)
+
+
+def derived_edges(dag, lineage):
+    """Declared edges into tasks without lineage, plus lineage edges into procedure tasks.
+
+    Edges into the loads, truncates and merges are kept as declared since
+    their order comes from what they write, not what they read.
+    """
+    producers = {}
+    for task_id, (reads, writes) in lineage.items():
+        for table in writes:
+            producers.setdefault(table, set()).add(task_id)
+    edges = dict((task_id, set()) for task_id in lineage)
+    for upstream, downstreams in declared_edges(dag).items():
+        edges[upstream] |= set(d for d in downstreams if lineage[d][0] is None)
+    for task_id, (reads, writes) in lineage.items():
+        for table in reads or ():
+            for producer in producers.get(table, ()):
+                if producer != task_id:
+                    edges[producer].add(task_id)
+    return transitive_reduction(edges)
+
+
+def compare(dag, lineage):
+    """(missing, droppable) edges into the procedure tasks, as sorted (upstream, downstream) pairs.
+
+    missing: the procedure reads a table from upstream, but no declared
+    path orders them. droppable: declared, but not in the minimal set.
+    """
+    declared = declared_edges(dag)
+    derived = derived_edges(dag, lineage)
+    procedure_tasks = set(task_id for task_id, (reads, _) in lineage.items() if reads is not None)
+    missing = sorted((u, v) for u, vs in derived.items() for v in vs
+                     if v in procedure_tasks and v not in _reachable(declared, u))
+    droppable = sorted((u, v) for u, vs in declared.items() for v in vs
+                       if v in procedure_tasks and v not in derived[u])
+    return missing, droppable
+
+
+def edge_lines(dag, lineage):
+    """The minimal edges into the procedure tasks, written as in the DAG file."""
+    derived = derived_edges(dag, lineage)
+    lines = []
+    for task_id in sorted(t for t, (reads, _) in lineage.items() if reads is not None):
+        upstreams = sorted(u for u, vs in derived.items() if task_id in vs)
+        if upstreams:
+            lines.append('# --------------------- {} -----------------------'.format(task_id))
+            lines.extend('{} >> {}'.format(upstream, task_id) for upstream in upstreams)
+            lines.append('')
+    return lines
+
+
+if __name__ == '__main__':
+    from ace_hr.dagfiles import file_dags
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('dag_id')
+    parser.add_argument('--sql-dir', help='directory of <Procedure>.sql files; BigQuery if omitted')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    dag = file_dags([args.dag_id])[0]
+    routines = SqlDirectoryRoutines(args.sql_dir) if args.sql_dir else BigQueryRoutines()
+    lineage = task_lineage(dag, routines)
+    missing, droppable = compare(dag, lineage)
+    log.info("Missing edges (%s):", len(missing))
+    for upstream, downstream in missing:
+        log.info("  %s >> %s", upstream, downstream)
+    log.info("Droppable edges (%s):", len(droppable))
+    for upstream, downstream in droppable:
+        log.info("  %s >> %s", upstream, downstream)
+    log.info("Minimal edges:\n%s", '\n'.join(edge_lines(dag, lineage)))
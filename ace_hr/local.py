@@ -0,0 +1,431 @@
+"""Runs the ACE HR DAGs end to end against local databases.
+
+Nothing here touches GCP, SQL Server or Dataflow:
+
+* each source schema (AceIntegrationPROD09_GCP.PeopleSoft...) is a SQLite
+  fixture, <fixtures>/<Database>.<Schema>.db, holding its tables under
+  their own names (dbo_PS_JOB...);
+* each BigQuery dataset (HRPRD_SC, HCHB_AMEDISYS_SC...) is a DuckDB
+  schema, or an attached SQLite database with engine='sqlite';
+* extracts run in-process: the source query is read from the fixture and
+  the rows inserted into the local target table, with ROW_HASH computed
+  in Python for the pay tables;
+* CALLs run the procedure's ported SQL from <sql-dir>/<Procedure>.sql
+  (as for ace_hr.lineage). A procedure with no ported SQL is stubbed;
+* pay merges run as portable_hash_merge_statements.
+
+Every operator type has an adapter in ADAPTERS. The tasks of all the
+loaded DAGs form one graph, and each wait_for sensor becomes an edge to
+the task it waits on. The graph runs in dependency order. A task whose
+upstream failed is not run. Local tables are created from the fixtures'
+columns before the run, so a fresh warehouse only needs the fixtures.
+
+The report lists every task with its status (success, stubbed, failed,
+upstream_failed), seconds and rows. That makes the run usable as a
+regression and benchmark bed.
+
+ace_hr.fixtures builds the fixtures and the procedure SQL from the DAGs.
+
+Usage:
+    python -m ace_hr.fixtures --out DIR [--rows 1000]
+    python -m ace_hr.local --fixtures DIR [--sql-dir DIR] [--engine duckdb|sqlite]
+        [--warehouse PATH] [--dag ACE_HR_employee ...]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from ace_hr.lineage import CALL_PATTERN, SqlDirectoryRoutines
+from ace_hr.rowhash import ROW_HASH_COLUMN, portable_hash_merge_statements
+
+# DAGs run by default; the intraday DAG repeats the pay chains
+DAG_IDS = ['ACE_HR_sources_agency', 'ACE_HR_sources_hchb', 'ACE_HR_sources_peoplesoft',
+           'ACE_HR_sources_peoplesoftfs', 'ACE_HR_employee', 'ACE_HR_payroll']
+
+DATASETS = ['Agency_SC', 'ETLConfigACE', 'FSPRD_SC', 'HCHB_AMEDISYS_SC', 'HCHB_INFINITY_SC', 'HRPRD_SC']
+
+# Python callables that need no GCP and run as they are; others are stubbed
+LOCAL_CALLABLES = frozenset(['watermark_value'])
+
+# Variables ace_hr.common reads at parse time, given placeholders when unset
+VARIABLES = ['bucket_path', 'project_id', 'gce_zone', 'gce_region', 'network', 'subnetwork',
+             'ipConfiguration', 'template', 'driverJars', 'driverClassName', 'connectionURL',
+             'connectionURL2', 'bigQueryLoadingTemporaryDirectory', 'username', 'password']
+
+SOURCE_TABLE = re.compile(r'\bFROM\s+(\w+)\.(\w+)\.(\w+)', re.IGNORECASE)
+PROJECT_TABLE = re.compile(r'`[\w-]+[.:](\w+)\.(\w+)`|\b[a-z][\w-]*-[\w-]+[.:](?=\w+\.\w+)')
+CREATE_LIKE = re.compile(r'CREATE TABLE IF NOT EXISTS (\S+) LIKE (\S+)', re.IGNORECASE)
+HASH_MERGE = re.compile(r'DECLARE watermark DEFAULT \(SELECT (\w+) FROM (\S+)\);\s*'
+                        r'MERGE (\S+) T\s+USING (\S+) S', re.IGNORECASE)
+STATEMENT_END = re.compile(r';(?=\s|$)')
+
+log = logging.getLogger(__name__)
+
+
+class LocalWarehouse(object):
+    """BigQuery datasets as DuckDB schemas, or as attached SQLite databases."""
+
+    def __init__(self, path, engine='duckdb', datasets=DATASETS):
+        self.engine = engine
+        if engine == 'duckdb':
+            import duckdb
+            self.connection = duckdb.connect(path)
+            for dataset in datasets:
+                self.connection.execute('CREATE SCHEMA IF NOT EXISTS ' + dataset)
+        else:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            self.connection = sqlite3.connect(os.path.join(path, 'main.db'), isolation_level=None)
+            for dataset in datasets:
+                self.connection.execute('ATTACH DATABASE ? AS ' + dataset,
+                                        (os.path.join(path, dataset + '.db'),))
+
+    def translate(self, sql):
+        """BigQuery statements of sql rewritten for the local engine."""
+        sql = PROJECT_TABLE.sub(lambda m: '{}.{}'.format(m.group(1), m.group(2)) if m.group(1) else '', sql)
+        sql = CREATE_LIKE.sub(r'CREATE TABLE IF NOT EXISTS \1 AS SELECT * FROM \2 WHERE 1 = 0', sql)
+        sql = sql.replace('`', '"')
+        if self.engine == 'sqlite':
+            sql = re.sub(r'\btruncate table\b', 'DELETE FROM', sql, flags=re.IGNORECASE)
+            sql = re.sub(r'CREATE OR REPLACE TABLE (\S+) AS', r'DROP TABLE IF EXISTS \1; CREATE TABLE \1 AS',
+                         sql, flags=re.IGNORECASE)
+            # SQLite would turn '2020-01-01' into 2020; ISO dates compare fine as text
+            sql = re.sub(r'\bAS DATE\)', 'AS TEXT)', sql, flags=re.IGNORECASE)
+        return [statement.strip() for statement in STATEMENT_END.split(sql) if statement.strip()]
+
+    def execute(self, statement, parameters=None):
+        # On the connection itself: a DuckDB cursor is a separate connection
+        if parameters:
+            return self.connection.execute(statement, parameters)
+        return self.connection.execute(statement)
+
+    def execute_many(self, statements):
+        self.execute('BEGIN')
+        try:
+            for statement in statements:
+                self.execute(statement)
+        except Exception:
+            self.execute('ROLLBACK')
+            raise
+        self.execute('COMMIT')
+
+    def table_exists(self, table):
+        try:
+            self.execute('SELECT * FROM {} WHERE 1 = 0'.format(table))
+            return True
+        except Exception:
+            return False
+
+    def create_table(self, table, columns):
+        """Creates table with columns, a list of (name, type), unless it exists."""
+        self.execute('CREATE TABLE IF NOT EXISTS {} ({})'.format(
+            table, ', '.join('"{}" {}'.format(name, column_type or 'VARCHAR') for name, column_type in columns)))
+
+    def insert_rows(self, table, columns, rows):
+        self.connection.executemany('INSERT INTO {} ({}) VALUES ({})'.format(
+            table, ', '.join('"{}"'.format(c) for c in columns), ', '.join('?' * len(columns))), rows)
+
+
+class SourceFixtures(object):
+    """Source schemas as SQLite files, <directory>/<Database>.<Schema>.db."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def connect(self, database, schema):
+        path = os.path.join(self.directory, '{}.{}.db'.format(database, schema))
+        if not os.path.exists(path):
+            raise IOError('No fixture {} for {}.{}'.format(path, database, schema))
+        return sqlite3.connect(path)
+
+    def columns(self, database, schema, table):
+        connection = self.connect(database, schema)
+        try:
+            columns = [(row[1], row[2]) for row in connection.execute('PRAGMA table_info({})'.format(table))]
+        finally:
+            connection.close()
+        if not columns:
+            raise IOError('No table {} in the {}.{} fixture'.format(table, database, schema))
+        return columns
+
+
+def row_hash(columns, row):
+    return hashlib.sha256(json.dumps(dict(zip(columns, row)), default=str,
+                                     sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def local_source_query(query):
+    """(database, schema, query against the fixture, whether to add ROW_HASH)."""
+    database, schema, table = SOURCE_TABLE.search(query).groups()
+    if ROW_HASH_COLUMN in query:
+        # hashed_source_query's HASHBYTES is SQL Server only; the hash is
+        # computed in Python instead
+        where = query.split(' WHERE ', 1)[1] if ' WHERE ' in query else None
+        query = 'SELECT s.* FROM {} s'.format(table) + (' WHERE ' + where if where else '')
+        return database, schema, query, True
+    return database, schema, query.replace('{}.{}.{}'.format(database, schema, table), table), False
+
+
+def output_table(parameters):
+    return parameters['outputTable'].split(':')[-1]
+
+
+class LocalTaskInstance(object):
+    """The ti of a local run; XComs live in the runner."""
+
+    def __init__(self, runner, task):
+        self.runner = runner
+        self.task = task
+        self.dag_id = task.dag.dag_id
+        self.task_id = task.task_id
+
+    def xcom_push(self, key, value):
+        self.runner.xcoms[(self.dag_id, self.task_id, key)] = value
+
+    def xcom_pull(self, task_ids, key='return_value', dag_id=None):
+        if isinstance(task_ids, (list, tuple)):
+            return [self.runner.xcoms.get((dag_id or self.dag_id, t, key)) for t in task_ids]
+        return self.runner.xcoms.get((dag_id or self.dag_id, task_ids, key))
+
+
+class LocalRun(object):
+    """One local run of dags for execution_date."""
+
+    def __init__(self, dags, warehouse, fixtures, routines=None, execution_date=None):
+        self.dags = dags
+        self.warehouse = warehouse
+        self.fixtures = fixtures
+        self.routines = routines
+        self.execution_date = execution_date or datetime.datetime.combine(
+            datetime.date.today() - datetime.timedelta(days=1), datetime.time())
+        self.xcoms = {}
+        self.results = {}
+
+    def tasks(self):
+        return dict(((dag.dag_id, task.task_id), task) for dag in self.dags for task in dag.tasks)
+
+    def upstream(self, tasks):
+        """(dag_id, task_id) -> the nodes it waits on, wait_for sensors included."""
+        upstream = {}
+        for (dag_id, task_id), task in tasks.items():
+            nodes = set((dag_id, upstream_id) for upstream_id in task.upstream_task_ids)
+            external = (getattr(task, 'external_dag_id', None), getattr(task, 'external_task_id', None))
+            if external in tasks:
+                nodes.add(external)
+            upstream[(dag_id, task_id)] = nodes
+        return upstream
+
+    def order(self, tasks):
+        upstream = self.upstream(tasks)
+        done, order = set(), []
+        while len(order) < len(tasks):
+            ready = sorted(node for node in tasks if node not in done and upstream[node] <= done)
+            if not ready:
+                raise ValueError('Cycle among ' + ', '.join(
+                    '.'.join(node) for node in sorted(set(tasks) - done)))
+            order.extend(ready)
+            done.update(ready)
+        return order, upstream
+
+    def context(self, task):
+        execution_date = self.execution_date
+        return {
+            'dag': task.dag, 'task': task, 'ti': LocalTaskInstance(self, task), 'params': task.params,
+            'execution_date': execution_date,
+            'next_execution_date': task.dag.following_schedule(execution_date),
+            'ds': execution_date.strftime('%Y-%m-%d'), 'ds_nodash': execution_date.strftime('%Y%m%d'),
+            'ts': execution_date.isoformat(), 'ts_nodash': execution_date.strftime('%Y%m%dT%H%M%S'),
+        }
+
+    def render(self, value, task, context):
+        if isinstance(value, str):
+            return task.dag.get_template_env().from_string(value).render(**context)
+        if isinstance(value, dict):
+            return dict((k, self.render(v, task, context)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [self.render(v, task, context) for v in value]
+        return value
+
+    def prepare(self, tasks):
+        """Creates the extract targets from the fixtures' columns, then the pay merge targets."""
+        merges = []
+        for task in tasks.values():
+            parameters = getattr(task, 'parameters', None) or {}
+            if 'query' in parameters and 'outputTable' in parameters:
+                database, schema, table = SOURCE_TABLE.search(parameters['query']).groups()
+                try:
+                    columns = self.fixtures.columns(database, schema, table)
+                except IOError as e:
+                    log.warning("%s", e)
+                    continue
+                if ROW_HASH_COLUMN in parameters['query']:
+                    columns.append((ROW_HASH_COLUMN, 'VARCHAR'))
+                self.warehouse.create_table(output_table(parameters), columns)
+            match = HASH_MERGE.search(getattr(task, 'sql', None) or '') if isinstance(
+                getattr(task, 'sql', None), str) else None
+            if match:
+                merges.append((match.group(3), match.group(4)))
+        for table, staging in merges:
+            if self.warehouse.table_exists(staging):
+                self.warehouse.execute('CREATE TABLE IF NOT EXISTS {} AS SELECT * FROM {} WHERE 1 = 0'.format(
+                    table, staging))
+
+    def run(self):
+        tasks = self.tasks()
+        self.prepare(tasks)
+        order, upstream = self.order(tasks)
+        started = time.time()
+        for node in order:
+            task = tasks[node]
+            if any(self.results[u]['status'] in ('failed', 'upstream_failed') for u in upstream[node]):
+                self.results[node] = {'status': 'upstream_failed', 'seconds': 0.0, 'rows': None}
+                continue
+            task_started = time.time()
+            try:
+                status, rows = self.run_task(task)
+            except Exception as e:
+                log.error("%s.%s failed: %s", node[0], node[1], e)
+                status, rows = 'failed', None
+                self.results[node] = {'error': str(e)}
+            self.results.setdefault(node, {}).update(
+                status=status, rows=rows, seconds=time.time() - task_started)
+            log.info("%-30s %-45s %-8s %7.2fs", node[0], node[1], status, self.results[node]['seconds'])
+        log.info("Ran %s tasks in %.1fs", len(order), time.time() - started)
+        return self.results
+
+    def run_task(self, task):
+        for cls in type(task).__mro__:
+            adapter = ADAPTERS.get(cls.__name__)
+            if adapter:
+                return adapter(self, task)
+        log.warning("No local adapter for %s; stubbed %s", type(task).__name__, task.task_id)
+        return 'stubbed', None
+
+    def run_sql(self, sql, stubbed=None):
+        """Runs BigQuery sql locally, CALLs included; returns 'stubbed' if a procedure was."""
+        status = 'success'
+        for statement in self.warehouse.translate(sql):
+            calls = CALL_PATTERN.findall(statement)
+            if not calls:
+                self.warehouse.execute(statement)
+                continue
+            for call in calls:
+                procedure = call.strip('`').replace(':', '.')
+                body = self.routines.definition(procedure) if self.routines else None
+                if body is None:
+                    log.info("No ported SQL for %s; stubbed", procedure)
+                    status = 'stubbed'
+                elif self.run_sql(body) == 'stubbed':
+                    status = 'stubbed'
+        return status
+
+    def bigquery(self, task):
+        sql = self.render(task.sql, task, self.context(task))
+        sql = sql if isinstance(sql, str) else ';\n'.join(sql)
+        match = HASH_MERGE.search(sql)
+        if match:
+            column, watermark, table, staging = match.groups()
+            self.warehouse.execute_many(portable_hash_merge_statements(
+                table, column, staging=staging, watermark=watermark))
+            return 'success', None
+        return self.run_sql(sql), None
+
+    def procedure_group(self, task):
+        status = 'success'
+        for procedure in task.procedures:
+            if self.run_sql('CALL `{}`();'.format(procedure)) == 'stubbed':
+                status = 'stubbed'
+        return status, None
+
+    def extract(self, task):
+        parameters = self.render(task.parameters, task, self.context(task))
+        database, schema, query, hashed = local_source_query(parameters['query'])
+        source = self.fixtures.connect(database, schema)
+        try:
+            cursor = source.execute(query)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        finally:
+            source.close()
+        if hashed:
+            rows = [tuple(row) + (row_hash(columns, row),) for row in rows]
+            columns = columns + [ROW_HASH_COLUMN]
+        self.warehouse.insert_rows(output_table(parameters), columns, rows)
+        return 'success', len(rows)
+
+    def get_data(self, task):
+        rows = self.warehouse.execute('SELECT {} FROM {}.{} LIMIT {}'.format(
+            task.selected_fields or '*', task.dataset_id, task.table_id, task.max_results)).fetchall()
+        # BigQuery returns every value as a string
+        result = [[None if value is None else str(value) for value in row] for row in rows]
+        LocalTaskInstance(self, task).xcom_push('return_value', result)
+        return 'success', len(rows)
+
+    def python(self, task):
+        if task.python_callable.__name__ not in LOCAL_CALLABLES:
+            return 'stubbed', None
+        context = self.context(task)
+        kwargs = dict(task.op_kwargs, **context) if task.provide_context else dict(task.op_kwargs)
+        result = task.python_callable(*task.op_args, **kwargs)
+        context['ti'].xcom_push('return_value', result)
+        return 'success', None
+
+    def sensor(self, task):
+        # Cross-DAG waits are edges of the local graph; sources are always ready
+        return 'success', None
+
+
+ADAPTERS = {
+    'BigQueryOperator': LocalRun.bigquery,
+    'BigQueryProcedureGroupOperator': LocalRun.procedure_group,
+    'DataflowTemplateOperator': LocalRun.extract,
+    'BigQueryGetDataOperator': LocalRun.get_data,
+    'PythonOperator': LocalRun.python,
+    'BaseSensorOperator': LocalRun.sensor,
+}
+
+
+def load_dags(dag_ids=DAG_IDS, dag_folder=None):
+    """The DAGs dag_ids parsed from dag_folder, with placeholder Variables."""
+    for name in VARIABLES:
+        os.environ.setdefault('AIRFLOW_VAR_' + name.upper(), 'local')
+    # From the DAG files themselves, rather than a scan of the whole folder
+    from ace_hr.dagfiles import file_dags
+    return file_dags(dag_ids, dag_folder)
+
+
+def report_lines(results, slowest=20):
+    counts = {}
+    for result in results.values():
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    lines = [', '.join('{} {}'.format(n, status) for status, n in sorted(counts.items()))]
+    for (dag_id, task_id), result in sorted(results.items(), key=lambda item: -item[1]['seconds'])[:slowest]:
+        lines.append('{:>8.2f}s {:<10} {:>9} {}.{}'.format(
+            result['seconds'], result['status'], '' if result['rows'] is None else result['rows'],
+            dag_id, task_id))
+    for (dag_id, task_id), result in sorted(results.items()):
+        if result.get('error'):
+            lines.append('failed {}.{}: {}'.format(dag_id, task_id, result['error']))
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--fixtures', required=True, help='directory of <Database>.<Schema>.db source fixtures')
+    parser.add_argument('--sql-dir', help='directory of ported <Procedure>.sql files')
+    parser.add_argument('--engine', choices=['duckdb', 'sqlite'], default='duckdb')
+    parser.add_argument('--warehouse', default='local_warehouse',
+                        help='DuckDB file, or directory of SQLite files with --engine sqlite')
+    parser.add_argument('--dag', action='append', help='DAG to run, repeatable (default: all nightly DAGs)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    run = LocalRun(load_dags(args.dag or DAG_IDS), LocalWarehouse(args.warehouse, args.engine),
+                   SourceFixtures(args.fixtures), SqlDirectoryRoutines(args.sql_dir) if args.sql_dir else None)
+    results = run.run()
+    print('\n'.join(report_lines(results)))
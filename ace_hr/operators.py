@@ -0,0 +1,158 @@
+"""Operators shared by the ACE HR DAGs."""
+import time
+
+from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+from airflow.contrib.hooks.gcp_dataflow_hook import DataFlowHook
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.exceptions import AirflowException
+from airflow.models import BaseOperator
+from airflow.utils.decorators import apply_defaults
+
+from ace_hr.checkpoint import CheckpointManifest, chunk_predicate, chunk_query, \
+    manifest_key, manifest_store, range_chunks, run_chunks
+from ace_hr.fanout import fan_out
+
+
+def bigquery_table(output_table):
+    # "project:dataset.table" as used by the JDBC template -> standard SQL name
+    return '`' + output_table.replace(':', '.') + '`'
+
+
+class ChunkedDataflowTemplateOperator(DataflowTemplateOperator):
+    """Runs the JDBC template once per chunk of the source query.
+
+    The query is split on chunk_column at chunk_bounds (see
+    ace_hr.checkpoint.range_chunks). Progress is kept in a manifest under
+    manifest_location, keyed by DAG, run and task, so a retry only reloads
+    the chunks that did not land. Rows of a chunk interrupted mid-load are
+    deleted from outputTable before that chunk is loaded again.
+
+    reset_by names the task that empties outputTable ahead of the load. Its
+    try number is part of the key. A cleared and rerun run truncates the
+    table again, so it starts a fresh manifest instead of skipping chunks
+    that are no longer there.
+
+    outputTable is fanned out (see ace_hr.fanout) once all chunks have
+    landed, not after each chunk.
+    """
+
+    @apply_defaults
+    def __init__(self, chunk_column, chunk_bounds, manifest_location,
+                 max_parallel_chunks=1, reset_by=None, bigquery_conn_id='bigquery_default',
+                 *args, **kwargs):
+        super(ChunkedDataflowTemplateOperator, self).__init__(*args, **kwargs)
+        self.chunk_column = chunk_column
+        self.chunk_bounds = chunk_bounds
+        self.manifest_location = manifest_location
+        self.max_parallel_chunks = max_parallel_chunks
+        self.reset_by = reset_by
+        self.bigquery_conn_id = bigquery_conn_id
+
+    def execute(self, context):
+        hook = DataFlowHook(gcp_conn_id=self.gcp_conn_id,
+                            delegate_to=self.delegate_to,
+                            poll_sleep=self.poll_sleep)
+        reset_try = None
+        if self.reset_by is not None:
+            reset_try = context['dag_run'].get_task_instance(self.reset_by).try_number
+        key = manifest_key(context['dag'].dag_id, context['ts_nodash'], self.task_id,
+                           self.reset_by, reset_try)
+        manifest = CheckpointManifest(manifest_store(self.manifest_location), key)
+
+        def load_chunk(chunk):
+            parameters = dict(self.parameters)
+            parameters['query'] = chunk_query(self.parameters['query'], chunk)
+            hook.start_template_dataflow(self.task_id + '_' + chunk.chunk_id,
+                                         dict(self.dataflow_default_options, fanOut=False),
+                                         parameters, self.template)
+
+        def clear_chunk(chunk):
+            self.log.info("Clearing partially loaded chunk %s", chunk.chunk_id)
+            cursor = BigQueryHook(bigquery_conn_id=self.bigquery_conn_id,
+                                  use_legacy_sql=False).get_conn().cursor()
+            cursor.run_query(sql='DELETE FROM {} WHERE {}'.format(
+                bigquery_table(self.parameters['outputTable']), chunk_predicate(chunk)))
+
+        loaded, skipped = run_chunks(range_chunks(self.chunk_column, self.chunk_bounds),
+                                     manifest, load_chunk, clear_chunk,
+                                     max_parallel=self.max_parallel_chunks)
+        self.log.info("Loaded chunks %s, skipped already landed chunks %s", loaded, skipped)
+        bigquery = BigQueryHook(bigquery_conn_id=self.bigquery_conn_id, use_legacy_sql=False)
+        fan_out(bigquery.get_service(), self.dataflow_default_options.get('project') or bigquery.project_id,
+                self.parameters['outputTable'], num_retries=hook.num_retries)
+
+
+class BigQueryProcedureGroupOperator(BaseOperator):
+    """Calls a group of independent stored procedures concurrently.
+
+    Every procedure is submitted as its own BigQuery job before any of
+    them is waited on. Procedures that take seconds then share one task,
+    which saves the scheduling and polling overhead of one task each. The
+    task fails once all jobs are done if any of them failed. The return
+    value (pushed to XCom) maps each procedure to its job id, state and
+    duration.
+
+    Procedures that succeeded are remembered on the operator, so a retry
+    of execute within the same try (see ace_hr.retry) only calls the
+    procedures that failed again.
+    """
+    template_fields = ('procedures',)
+    ui_color = '#e4f0e8'
+
+    @apply_defaults
+    def __init__(self, procedures, bigquery_conn_id='bigquery_default',
+                 poll_interval=5, num_retries=5, *args, **kwargs):
+        super(BigQueryProcedureGroupOperator, self).__init__(*args, **kwargs)
+        self.procedures = procedures
+        self.bigquery_conn_id = bigquery_conn_id
+        self.poll_interval = poll_interval
+        self.num_retries = num_retries
+        self.succeeded = {}
+
+    def execute(self, context):
+        hook = BigQueryHook(bigquery_conn_id=self.bigquery_conn_id, use_legacy_sql=False)
+        service = hook.get_service()
+        pending = {}
+        for procedure in self.procedures:
+            if procedure in self.succeeded:
+                self.log.info("Skipping %s, done as job %s", procedure, self.succeeded[procedure]['job_id'])
+                continue
+            job = service.jobs().insert(projectId=hook.project_id, body={
+                'configuration': {'query': {'query': 'CALL `{}`();'.format(procedure),
+                                            'useLegacySql': False}}
+            }).execute(num_retries=self.num_retries)
+            pending[procedure] = job['jobReference']
+            self.log.info("Submitted %s as job %s", procedure, job['jobReference']['jobId'])
+
+        results = dict(self.succeeded)
+        while pending:
+            time.sleep(self.poll_interval)
+            for procedure, reference in list(pending.items()):
+                job = service.jobs().get(projectId=reference['projectId'],
+                                         jobId=reference['jobId'],
+                                         location=reference.get('location')
+                                         ).execute(num_retries=self.num_retries)
+                if job['status']['state'] != 'DONE':
+                    continue
+                statistics = job['statistics']
+                error = job['status'].get('errorResult')
+                results[procedure] = {
+                    'job_id': reference['jobId'],
+                    'state': 'FAILED' if error else 'SUCCESS',
+                    'seconds': (int(statistics.get('endTime', 0))
+                                - int(statistics.get('startTime', statistics.get('endTime', 0)))) / 1000.0,
+                    'error': error.get('message') if error else None,
+                }
+                if not error:
+                    self.succeeded[procedure] = results[procedure]
+                del pending[procedure]
+
+        for procedure in self.procedures:
+            result = results[procedure]
+            self.log.info("%-60s %-8s %8.1fs %s", procedure, result['state'],
+                          result['seconds'], result['error'] or '')
+        failed = [p for p in self.procedures if results[p]['state'] == 'FAILED']
+        if failed:
+            raise AirflowException("Procedures failed: " + "; ".join(
+                '{}: {}'.format(p, results[p]['error']) for p in failed))
+        return results
@@ -0,0 +1,251 @@
+"""The watermark-driven stage and merge chain of the incremental pay tables.
+
+For each PS_PAY_<name> table the chain is:
+
+1. truncate the staging table;
+2. rebuild the _MAX table with the target's latest PAY_END_DT;
+3. read that watermark back;
+4. stage the source rows from the watermark on;
+5. merge them into the target on the row hash or, until the table is
+   listed in the pay_row_hash_merges Variable, call its MergePay*
+   procedure (see ace_hr.layout).
+
+pay_increment() builds this chain in the current DAG. The nightly
+PeopleSoft load and the intraday payroll DAG both use it. A mode gives
+the chain its own staging and _MAX tables, so a second schedule never
+truncates the tables the nightly run is using. Both modes merge into the
+same targets, which is safe because the row-hash merge is idempotent.
+
+The PAY_END_DT watermark re-extracts the whole current pay period, which
+is fine nightly but not every 30 minutes. Given a last-modified column,
+the chain instead stages the rows modified since the latest value of
+that column in the target, and merges them by key (PAY_KEYS). Rows
+deleted at the source are left to the nightly merge.
+
+record_pay_batch() logs one row per merge to BATCH_LOG_TABLE, so the
+intraday cadence can be tuned: rows staged, rows inserted and deleted,
+and the latency from the cycle's scheduled time. modified_tables() checks
+the pay_modified_columns Variable the intraday DAG is built from; with no
+table configured its cycles are skipped by no_modified_tables().
+"""
+import logging
+
+from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+from airflow.contrib.operators.bigquery_operator import BigQueryOperator
+from airflow.contrib.operators.dataflow_operator import DataflowTemplateOperator
+from airflow.exceptions import AirflowSkipException
+from airflow.operators.python_operator import PythonOperator
+from airflow.providers.google.cloud.operators.bigquery import BigQueryGetDataOperator
+from airflow.utils import timezone
+
+from ace_hr.common import template, driverJars, driverClassName, connectionURL, \
+    bigQueryLoadingTemporaryDirectory, username, password, pay_row_hash_merges
+from ace_hr.layout import MERGE_LABEL, procedure_call_sql
+from ace_hr.profiler import child_jobs
+from ace_hr.rowhash import changed_rows_merge_sql, hash_merge_sql, hashed_source_query, pay_tables, \
+    watermark_sql
+
+PAY_TABLES = ['check', 'tax', 'earnings', 'oth_earns', 'deduction']
+
+# PeopleSoft keys of the pay tables, matched by the changed-rows merge
+PAY_CHECK_KEYS = ['COMPANY', 'PAYGROUP', 'PAY_END_DT', 'OFF_CYCLE', 'PAGE_NUM', 'LINE_NUM', 'SEPCHK']
+PAY_KEYS = {
+    'check': PAY_CHECK_KEYS,
+    'tax': PAY_CHECK_KEYS + ['STATE', 'LOCALITY', 'TAX_CLASS'],
+    'earnings': ['COMPANY', 'PAYGROUP', 'PAY_END_DT', 'OFF_CYCLE', 'PAGE_NUM', 'LINE_NUM', 'ADDL_NBR'],
+    'oth_earns': ['COMPANY', 'PAYGROUP', 'PAY_END_DT', 'OFF_CYCLE', 'PAGE_NUM', 'LINE_NUM', 'ADDL_NBR', 'ERNCD'],
+    'deduction': PAY_CHECK_KEYS + ['BENEFIT_RCD_NBR', 'PLAN_TYPE', 'BENEFIT_PLAN', 'DEDCD', 'DED_CLASS',
+                                   'DED_SLSTX_CLASS'],
+}
+
+BATCH_LOG_DATASET = 'ETLConfigACE'
+BATCH_LOG_TABLE = 'PayBatchLog'
+
+BATCH_LOG_SCHEMA = [
+    {'name': 'dag_id', 'type': 'STRING'},
+    {'name': 'scheduled_time', 'type': 'TIMESTAMP'},
+    {'name': 'pay_table', 'type': 'STRING'},
+    {'name': 'staged_rows', 'type': 'INTEGER'},
+    {'name': 'inserted_rows', 'type': 'INTEGER'},
+    {'name': 'deleted_rows', 'type': 'INTEGER'},
+    {'name': 'latency_seconds', 'type': 'FLOAT'},
+    {'name': 'recorded_at', 'type': 'TIMESTAMP'},
+]
+
+log = logging.getLogger(__name__)
+
+
+def modified_watermark_sql(target, watermark, column):
+    # The column is a source DATETIME, landed as is; milliseconds are as
+    # precise as a SQL Server datetime literal takes
+    return ("CREATE OR REPLACE TABLE {} AS SELECT FORMAT_DATETIME('%Y-%m-%d %H:%M:%E3S', "
+            "COALESCE(MAX({}), DATETIME '1901-01-01')) `{}` FROM {};").format(watermark, column, column, target)
+
+
+def watermark_value(max_task_id, **kwargs):
+    ti = kwargs['ti']
+    bq_data = ti.xcom_pull(task_ids=max_task_id)
+    # bq_data has the return value in a Python list, so convert to a string and remove brackets
+    return(str(bq_data[0])[1:-1])
+
+
+def modified_tables(modified_columns):
+    """The pay tables with a last-modified column in modified_columns, in PAY_TABLES order.
+
+    Raises ValueError for a name that is not a pay table, so a typo in the
+    Variable breaks the DAG instead of silently leaving the table out.
+    """
+    unknown = sorted(set(modified_columns) - set(PAY_TABLES))
+    if unknown:
+        raise ValueError('pay_modified_columns names unknown pay tables {}; expected some of {}'.format(
+            unknown, PAY_TABLES))
+    return [name for name in PAY_TABLES if name in modified_columns]
+
+
+def no_modified_tables(**context):
+    raise AirflowSkipException('No pay table has a last-modified column in the pay_modified_columns Variable, '
+                               'so there is nothing to merge intraday')
+
+
+def pay_increment(name, mode='', modified_column=None):
+    """Builds the chain for PS_PAY_<name> in the current DAG.
+
+    With modified_column, only the rows modified since its latest value in
+    the target are staged and merged. Returns the first task and the
+    merge task.
+    """
+    target, staging, watermark = pay_tables(name, mode)
+    column = modified_column or 'PAY_END_DT'
+    if mode:
+        # The mode's staging table is created on first use, with the
+        # nightly staging table's columns
+        truncate_sql = "CREATE TABLE IF NOT EXISTS {} LIKE {}_STAGING; truncate table {}".format(
+            staging, target, staging)
+    else:
+        truncate_sql = "truncate table " + staging
+
+    truncate = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_pay_{}_truncate".format(name),
+        use_legacy_sql=False,
+        sql=truncate_sql
+    )
+
+    max_date = BigQueryOperator(
+        task_id="pay_{}_max_date".format(name),
+        use_legacy_sql=False,
+        sql=modified_watermark_sql(target, watermark, column) if modified_column else watermark_sql(target, watermark)
+    )
+
+    get_data = BigQueryGetDataOperator(
+        task_id="get_data_ps_pay_{}_max".format(name),
+        dataset_id=watermark.split('.')[0],
+        table_id=watermark.split('.')[1],
+        max_results=1,
+        selected_fields=column
+    )
+
+    process = PythonOperator(
+        task_id="process_ps_pay_{}_max".format(name),
+        python_callable=watermark_value,
+        op_kwargs={"max_task_id": get_data.task_id},
+        provide_context=True
+    )
+
+    stage = DataflowTemplateOperator(
+        task_id="peoplesoft_dbo_ps_pay_{}_stage".format(name),
+        template=template,
+        parameters={
+            "driverJars": driverJars,
+            "driverClassName": driverClassName,
+            "connectionURL": connectionURL,
+            "query": hashed_source_query(
+                "AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PAY_" + name.upper(),
+                "%s >= {{ ti.xcom_pull(task_ids='%s') }}" % (column, process.task_id)),
+            "outputTable": "amed-dev-analyticsplatform:" + staging,
+            "bigQueryLoadingTemporaryDirectory": bigQueryLoadingTemporaryDirectory,
+            "username": username,
+            "password": password
+        }
+    )
+
+    labels = {MERGE_LABEL: "dbo_ps_pay_" + name}
+    if modified_column:
+        merge_sql = changed_rows_merge_sql(target, PAY_KEYS[name], staging)
+    elif name in pay_row_hash_merges:
+        merge_sql = hash_merge_sql(target, staging=staging, watermark=watermark)
+    else:
+        # Not yet checked and compared with the row-hash merge
+        merge_sql, labels = procedure_call_sql(target), None
+
+    merge = BigQueryOperator(
+        task_id="peoplesoft_dbo_ps_pay_{}_merge".format(name),
+        use_legacy_sql=False,
+        sql=merge_sql,
+        labels=labels,
+        priority_weight=1000
+    )
+
+    truncate >> max_date >> get_data >> process >> stage >> merge
+    return truncate, merge
+
+
+def ensure_batch_log_table(service, project):
+    from googleapiclient.errors import HttpError
+    try:
+        service.tables().insert(projectId=project, datasetId=BATCH_LOG_DATASET, body={
+            'tableReference': {'projectId': project, 'datasetId': BATCH_LOG_DATASET,
+                               'tableId': BATCH_LOG_TABLE},
+            'schema': {'fields': BATCH_LOG_SCHEMA},
+            'timePartitioning': {'type': 'DAY', 'field': 'scheduled_time'},
+        }).execute()
+    except HttpError as e:
+        if e.resp.status != 409:
+            raise
+
+
+def dml_counts(service, project, job_id):
+    """(inserted, deleted) rows of a query job.
+
+    A script reports no dmlStats of its own, only its child jobs do.
+    """
+    inserted = deleted = 0
+    jobs = list(child_jobs(service, project, job_id))
+    if not jobs:
+        jobs = [service.jobs().get(projectId=project, jobId=job_id).execute()]
+    for job in jobs:
+        dml = job.get('statistics', {}).get('query', {}).get('dmlStats', {})
+        inserted += int(dml.get('insertedRowCount', 0))
+        deleted += int(dml.get('deletedRowCount', 0))
+    return inserted, deleted
+
+
+def record_pay_batch(name, mode='', bigquery_conn_id='bigquery_default', **context):
+    """Logs the size and latency of the merge of PS_PAY_<name> in this run."""
+    hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    service = hook.get_service()
+    project = hook.project_id
+    target, staging, _ = pay_tables(name, mode)
+    cursor = hook.get_conn().cursor()
+    cursor.execute('SELECT COUNT(*) FROM ' + staging)
+    staged_rows = cursor.fetchone()[0]
+    job_id = context['ti'].xcom_pull(task_ids='peoplesoft_dbo_ps_pay_{}_merge'.format(name), key='job_id')
+    inserted, deleted = dml_counts(service, project, job_id) if job_id else (0, 0)
+    # The run for execution_date is scheduled at the end of its interval
+    scheduled = context['next_execution_date']
+    now = timezone.utcnow()
+    row = {
+        'dag_id': context['dag'].dag_id,
+        'scheduled_time': scheduled.isoformat(),
+        'pay_table': target,
+        'staged_rows': staged_rows,
+        'inserted_rows': inserted,
+        'deleted_rows': deleted,
+        'latency_seconds': (now - scheduled).total_seconds(),
+        'recorded_at': now.isoformat(),
+    }
+    log.info("%s: staged %s rows, inserted %s, deleted %s, %.0f s after the scheduled time",
+             target, row['staged_rows'], row['inserted_rows'], row['deleted_rows'], row['latency_seconds'])
+    ensure_batch_log_table(service, project)
+    service.tabledata().insertAll(projectId=project, datasetId=BATCH_LOG_DATASET, tableId=BATCH_LOG_TABLE,
+                                  body={'rows': [{'json': row}]}).execute()
+    return row
@@ -0,0 +1,266 @@
+"""Streaming fetch, encode and upload stages joined by bounded queues.
+
+Done one after another, a large extract first holds the whole table in
+memory or on disk, then encodes it, then uploads it. Pipeline runs the
+steps as stages on their own threads. Each stage is joined to the next by
+a queue of at most queue_size items. When a stage falls behind, the
+stages before it block on the full queue, so memory stays flat however
+large the table is and the slowest stage sets the throughput. A stage can
+run on several workers, e.g. an uploader sending chunks in parallel.
+
+Every item carries its sequence number, so the outputs of the last stage
+come back in source order. Each stage records items, busy time and the
+depth of its input queue. metrics() returns them while the pipeline is
+running and after it has finished.
+
+extract_to_gcs() builds such a pipeline: cursor -> Parquet chunks ->
+parallel upload to GCS. Quality stats (ace_hr.quality) are collected
+from the batches as they are fetched.
+"""
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+_DONE = object()
+
+log = logging.getLogger(__name__)
+
+
+class StageMetrics(object):
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+
+    def sample_depth(self, depth):
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+
+    def snapshot(self, elapsed):
+        with self._lock:
+            return {
+                'stage': self.name,
+                'workers': self.workers,
+                'items': self.items,
+                'items_per_sec': self.items / elapsed if elapsed else 0.0,
+                'utilization': self.busy_seconds / (elapsed * self.workers) if elapsed else 0.0,
+                'max_queue_depth': self.max_depth,
+                'mean_queue_depth': self._depth_total / float(self._depth_samples) if self._depth_samples else 0.0,
+            }
+
+
+class Pipeline(object):
+    """A source iterable followed by stages, each a function of one item.
+
+        pipeline = Pipeline(queue_size=4)
+        pipeline.source('fetch', batches)
+        pipeline.stage('encode', encode)
+        pipeline.stage('upload', upload, workers=4)
+        outputs = pipeline.run()
+
+    The first error in any stage stops the pipeline and is raised by run().
+    """
+
+    def __init__(self, queue_size=4, poll_interval=0.1, report_interval=60):
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.report_interval = report_interval
+        self._source = None
+        self._stages = []
+        self._errors = []
+        self._failed = threading.Event()
+        self._started = None
+        self._finished = None
+
+    def source(self, name, iterable):
+        self._source = (name, iterable, StageMetrics(name, 1))
+        return self
+
+    def stage(self, name, function, workers=1):
+        self._stages.append((name, function, workers, StageMetrics(name, workers)))
+        return self
+
+    def metrics(self):
+        elapsed = ((self._finished or time.time()) - self._started) if self._started else 0.0
+        stages = [self._source[2]] + [stage[3] for stage in self._stages]
+        return [metrics.snapshot(elapsed) for metrics in stages]
+
+    def _put(self, q, item, metrics):
+        while not self._failed.is_set():
+            try:
+                q.put(item, timeout=self.poll_interval)
+                metrics.sample_depth(q.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._failed.is_set():
+            try:
+                return q.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, error):
+        self._errors.append(error)
+        self._failed.set()
+
+    def _run_source(self, iterable, metrics, out, consumers, next_metrics):
+        try:
+            iterator = iter(iterable)
+            sequence = 0
+            while not self._failed.is_set():
+                started = time.time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                metrics.record(time.time() - started)
+                if not self._put(out, (sequence, item), next_metrics):
+                    return
+                sequence += 1
+        except Exception as e:
+            self._fail(e)
+        finally:
+            for _ in range(consumers):
+                self._put(out, _DONE, next_metrics)
+
+    def _run_worker(self, function, metrics, inp, out, remaining, consumers, next_metrics):
+        try:
+            while True:
+                entry = self._get(inp)
+                if entry is _DONE:
+                    break
+                sequence, item = entry
+                started = time.time()
+                result = function(item)
+                metrics.record(time.time() - started)
+                if not self._put(out, (sequence, result), next_metrics):
+                    break
+        except Exception as e:
+            self._fail(e)
+        finally:
+            # The last worker of a stage to finish signals the next stage
+            with remaining['lock']:
+                remaining['workers'] -= 1
+                last = remaining['workers'] == 0
+            if last:
+                for _ in range(consumers):
+                    self._put(out, _DONE, next_metrics)
+
+    def _report(self):
+        while not self._stop_reporting.wait(self.report_interval):
+            log_metrics(self.metrics())
+
+    def run(self):
+        """Runs the pipeline to completion; returns the last stage's outputs in source order."""
+        name, iterable, source_metrics = self._source
+        queues = [queue.Queue(self.queue_size) for _ in self._stages] + [queue.Queue()]
+        collector = StageMetrics('output', 1)
+        threads = []
+        first_metrics = self._stages[0][3] if self._stages else collector
+        first_workers = self._stages[0][2] if self._stages else 1
+        threads.append(threading.Thread(target=self._run_source, name=name, args=(
+            iterable, source_metrics, queues[0], first_workers, first_metrics)))
+        for index, (stage_name, function, workers, metrics) in enumerate(self._stages):
+            last = index == len(self._stages) - 1
+            consumers = 1 if last else self._stages[index + 1][2]
+            next_metrics = collector if last else self._stages[index + 1][3]
+            remaining = {'workers': workers, 'lock': threading.Lock()}
+            for worker in range(workers):
+                threads.append(threading.Thread(
+                    target=self._run_worker, name='{}-{}'.format(stage_name, worker),
+                    args=(function, metrics, queues[index], queues[index + 1], remaining,
+                          consumers, next_metrics)))
+        self._started = time.time()
+        self._stop_reporting = threading.Event()
+        reporter = threading.Thread(target=self._report, name='pipeline-metrics')
+        reporter.daemon = True
+        reporter.start()
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._finished = time.time()
+        self._stop_reporting.set()
+        if self._errors:
+            raise self._errors[0]
+        outputs = []
+        while True:
+            entry = queues[-1].get_nowait()
+            if entry is _DONE:
+                break
+            outputs.append(entry)
+        return [item for sequence, item in sorted(outputs, key=lambda entry: entry[0])]
+
+
+def log_metrics(metrics):
+    for stage in metrics:
+        log.info("%-10s %2d workers %9d items %10.1f items/s %5.0f%% busy, queue depth max %d mean %.1f",
+                 stage['stage'], stage['workers'], stage['items'], stage['items_per_sec'],
+                 stage['utilization'] * 100, stage['max_queue_depth'], stage['mean_queue_depth'])
+
+
+def extract_to_gcs(connection, query, schema, bucket, prefix, batch_rows=65536,
+                   upload_workers=4, queue_size=4, gcp_conn_id='google_cloud_default', key=()):
+    """Extracts query to Parquet chunks under gs://bucket/prefix, overlapping all three steps.
+
+    At most about queue_size batches per stage are in memory at once.
+    Returns the uploaded object names, the stage metrics and the quality
+    stats. Raises DataQualityError if the rows do not match the source
+    count or a key repeats, before anything loads the chunks.
+    """
+    from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
+    from ace_hr.arrowbatch import fetch_record_batches, write_parquet
+    from ace_hr.quality import ExtractStats, counted_batches, source_count
+    hook = GoogleCloudStorageHook(google_cloud_storage_conn_id=gcp_conn_id)
+    counter = {'next': 0, 'lock': threading.Lock()}
+
+    def encode(batch):
+        with counter['lock']:
+            part = counter['next']
+            counter['next'] += 1
+        handle, path = tempfile.mkstemp(suffix='.parquet')
+        os.close(handle)
+        write_parquet([batch], path)
+        return part, path
+
+    def upload(encoded):
+        part, path = encoded
+        name = '{}/part-{:05d}.parquet'.format(prefix.strip('/'), part)
+        try:
+            hook.upload(bucket, name, path, mime_type='application/octet-stream')
+        finally:
+            os.remove(path)
+        return name
+
+    stats = ExtractStats(key)
+    expected = source_count(connection, query)
+    pipeline = Pipeline(queue_size=queue_size)
+    pipeline.source('fetch', counted_batches(fetch_record_batches(connection, query, schema, batch_rows), stats))
+    pipeline.stage('encode', encode)
+    pipeline.stage('upload', upload, workers=upload_workers)
+    names = pipeline.run()
+    metrics = pipeline.metrics()
+    log_metrics(metrics)
+    stats.check(expected)
+    return names, metrics, stats.result()
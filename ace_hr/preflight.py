@@ -0,0 +1,162 @@
+"""Pre-flight validation of every BigQuery statement a DAG will issue.
+
+Truncates, _MAX rebuilds, merges and procedure calls are normally only
+checked when they execute, sometimes hours into the run. run_preflight()
+dry-runs each of them up front. A missing table, routine or permission
+fails the pre-flight task before any load starts. It also logs the
+estimated bytes and on-demand cost per statement, plus the run's
+projected duration. That duration is the critical path through the DAG,
+using each task's average duration over recent successful runs.
+
+The BigQuery access goes through a small client object (dry_run and
+routine_exists), so a fake client can stand in for BigQuery.
+
+Usage outside Airflow's scheduler:
+    python -m ace_hr.preflight ACE_HR_payroll
+"""
+import logging
+import re
+import sys
+
+# On-demand analysis price in USD per TiB processed
+PRICE_PER_TIB = 6.25
+
+CALL_PATTERN = re.compile(r'^\s*CALL\s+`?([\w.-]+)`?\s*\(', re.IGNORECASE)
+
+# Tasks that create tables and columns the other statements reference (the
+# typed source targets, the pay targets and their ROW_HASH); the pre-flight
+# runs after them, or a first deploy could never pass it
+DDL_TASK_IDS = ('source_schemas', 'pay_table_layout')
+
+log = logging.getLogger(__name__)
+
+
+class BigQueryDryRunClient(object):
+
+    def __init__(self, bigquery_conn_id='bigquery_default'):
+        from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+        hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+        self.project = hook.project_id
+        self.service = hook.get_service()
+
+    def dry_run(self, sql):
+        job = self.service.jobs().insert(projectId=self.project, body={
+            'configuration': {'dryRun': True,
+                              'query': {'query': sql, 'useLegacySql': False}}
+        }).execute()
+        return int(job['statistics'].get('totalBytesProcessed', 0))
+
+    def routine_exists(self, routine):
+        from googleapiclient.errors import HttpError
+        project, dataset, name = routine.split('.')
+        try:
+            self.service.routines().get(projectId=project, datasetId=dataset, routineId=name).execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        return True
+
+
+def dag_statements(dag):
+    """(task_id, sql) for every BigQuery statement in the DAG.
+
+    Statements still containing Jinja are skipped; they can only be
+    checked once rendered.
+    """
+    statements = []
+    for task in sorted(dag.tasks, key=lambda t: t.task_id):
+        if hasattr(task, 'procedures'):
+            sqls = ['CALL `{}`();'.format(procedure) for procedure in task.procedures]
+        elif type(task).__name__ == 'BigQueryOperator':
+            sqls = task.sql if isinstance(task.sql, (list, tuple)) else [task.sql]
+        else:
+            continue
+        statements.extend((task.task_id, sql) for sql in sqls if '{{' not in sql)
+    return statements
+
+
+def check_statement(client, sql):
+    """Estimated bytes for sql, None when it can't be estimated.
+
+    Procedure calls are checked for the routine's existence only, since a
+    dry run cannot see inside the procedure body.
+    """
+    call = CALL_PATTERN.match(sql)
+    if call:
+        if not client.routine_exists(call.group(1)):
+            raise ValueError('Not found: Routine ' + call.group(1))
+        return None
+    return client.dry_run(sql)
+
+
+def projected_duration(dag, durations):
+    """Seconds along the critical path, using the known task durations."""
+    finish = {}
+    for task in dag.topological_sort():
+        start = max([finish[t] for t in task.upstream_task_ids if t in finish] or [0])
+        finish[task.task_id] = start + durations.get(task.task_id, 0)
+    return max(finish.values() or [0])
+
+
+def recent_durations(dag_id, days=14):
+    """Average duration in seconds of each task's successful runs in the last days."""
+    from airflow.models import TaskInstance
+    from airflow.settings import Session
+    from airflow.utils import timezone
+    from airflow.utils.state import State
+    from datetime import timedelta
+    session = Session()
+    try:
+        rows = session.query(TaskInstance.task_id, TaskInstance.duration).filter(
+            TaskInstance.dag_id == dag_id,
+            TaskInstance.state == State.SUCCESS,
+            TaskInstance.execution_date >= timezone.utcnow() - timedelta(days=days)).all()
+    finally:
+        session.close()
+    totals = {}
+    for task_id, duration in rows:
+        if duration is not None:
+            totals.setdefault(task_id, []).append(duration)
+    return dict((task_id, sum(values) / len(values)) for task_id, values in totals.items())
+
+
+def run_preflight(dag, client, durations=None, price_per_tib=PRICE_PER_TIB):
+    """Checks every statement, logs the report, and raises if any check failed."""
+    rows, errors = [], []
+    for task_id, sql in dag_statements(dag):
+        try:
+            estimate = check_statement(client, sql)
+        except Exception as e:
+            errors.append('{}: {}'.format(task_id, e))
+            continue
+        cost = estimate * price_per_tib / 2 ** 40 if estimate is not None else None
+        rows.append((task_id, estimate, cost, (durations or {}).get(task_id)))
+
+    log.info("%-45s %16s %10s %10s", 'task', 'est. bytes', 'est. USD', 'avg. secs')
+    for task_id, estimate, cost, seconds in rows:
+        log.info("%-45s %16s %10s %10s", task_id,
+                 '-' if estimate is None else estimate,
+                 '-' if cost is None else '%.4f' % cost,
+                 '-' if seconds is None else '%.0f' % seconds)
+    log.info("Total estimated bytes %s, cost $%.2f", sum(r[1] or 0 for r in rows),
+             sum(r[2] or 0 for r in rows))
+    if durations:
+        log.info("Projected run duration %.0f minutes", projected_duration(dag, durations) / 60)
+    if errors:
+        raise ValueError("Pre-flight failed for {} statement(s):\n{}".format(
+            len(errors), "\n".join(errors)))
+    return rows
+
+
+def preflight_callable(bigquery_conn_id='bigquery_default', **context):
+    # python_callable for the DAG's pre-flight task
+    dag = context['dag']
+    return run_preflight(dag, BigQueryDryRunClient(bigquery_conn_id), recent_durations(dag.dag_id))
+
+
+if __name__ == '__main__':
+    from ace_hr.dagfiles import file_dags
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    dag = file_dags([sys.argv[1]])[0]
+    run_preflight(dag, BigQueryDryRunClient(), recent_durations(dag.dag_id))
@@ -0,0 +1,177 @@
+"""Per-statement profiling of the ETLConfigACE stored procedures.
+
+A CALL shows up in Airflow as one opaque duration. BigQuery runs every
+statement of the procedure as a child job of the CALL's script job.
+profile_procedure_call is set as the on_success_callback of the
+procedure tasks. It reads those child jobs and stores one row per
+statement in PROFILE_TABLE, with procedure, line, statement type, bytes,
+slot-ms, shuffle bytes and elapsed time. hottest_statements_sql() then
+ranks statements across runs; run the module to print that ranking.
+
+Usage:
+    python -m ace_hr.profiler [--days 30] [--limit 25]
+"""
+import argparse
+import logging
+
+PROFILE_DATASET = 'ETLConfigACE'
+PROFILE_TABLE = 'ProcedureStatementProfile'
+
+PROFILE_SCHEMA = [
+    {'name': 'dag_id', 'type': 'STRING'},
+    {'name': 'task_id', 'type': 'STRING'},
+    {'name': 'execution_date', 'type': 'TIMESTAMP'},
+    {'name': 'parent_job_id', 'type': 'STRING'},
+    {'name': 'job_id', 'type': 'STRING'},
+    {'name': 'procedure_id', 'type': 'STRING'},
+    {'name': 'start_line', 'type': 'INTEGER'},
+    {'name': 'statement_type', 'type': 'STRING'},
+    {'name': 'statement_text', 'type': 'STRING'},
+    {'name': 'total_bytes_processed', 'type': 'INTEGER'},
+    {'name': 'total_slot_ms', 'type': 'INTEGER'},
+    {'name': 'shuffle_output_bytes', 'type': 'INTEGER'},
+    {'name': 'elapsed_ms', 'type': 'INTEGER'},
+]
+
+log = logging.getLogger(__name__)
+
+
+def statement_profile(job):
+    """Profile row fields of one child job of a script."""
+    statistics = job.get('statistics', {})
+    query = statistics.get('query', {})
+    frames = statistics.get('scriptStatistics', {}).get('stackFrames', [])
+    frame = frames[0] if frames else {}
+    return {
+        'job_id': job['jobReference']['jobId'],
+        'procedure_id': frame.get('procedureId'),
+        'start_line': int(frame['startLine']) if 'startLine' in frame else None,
+        'statement_type': query.get('statementType'),
+        'statement_text': (frame.get('text') or job.get('configuration', {})
+                           .get('query', {}).get('query', ''))[:2000],
+        'total_bytes_processed': int(query.get('totalBytesProcessed', 0)),
+        'total_slot_ms': int(query.get('totalSlotMs', 0)),
+        'shuffle_output_bytes': sum(int(stage.get('shuffleOutputBytes', 0))
+                                    for stage in query.get('queryPlan', [])),
+        'elapsed_ms': int(statistics.get('endTime', 0)) - int(statistics.get('startTime', 0)),
+    }
+
+
+def child_jobs(service, project, parent_job_id):
+    # The children of a job are listed by its id; they run as the same user
+    jobs = service.jobs()
+    request = jobs.list(projectId=project, parentJobId=parent_job_id, projection='full')
+    while request is not None:
+        response = request.execute()
+        for job in response.get('jobs', []):
+            yield job
+        request = jobs.list_next(previous_request=request, previous_response=response)
+
+
+def ensure_profile_table(service, project):
+    from googleapiclient.errors import HttpError
+    try:
+        service.tables().insert(projectId=project, datasetId=PROFILE_DATASET, body={
+            'tableReference': {'projectId': project, 'datasetId': PROFILE_DATASET,
+                               'tableId': PROFILE_TABLE},
+            'schema': {'fields': PROFILE_SCHEMA},
+            'timePartitioning': {'type': 'DAY', 'field': 'execution_date'},
+        }).execute()
+    except HttpError as e:
+        if e.resp.status != 409:
+            raise
+
+
+def _parent_job_ids(context):
+    ti = context['ti']
+    job_ids = ti.xcom_pull(task_ids=ti.task_id, key='job_id')
+    if job_ids is None:
+        # Procedure groups return their jobs instead of pushing job_id
+        results = ti.xcom_pull(task_ids=ti.task_id) or {}
+        job_ids = [result['job_id'] for result in results.values()] if isinstance(results, dict) else None
+    if job_ids is None:
+        cursor = getattr(context['task'], 'bq_cursor', None)
+        job_ids = getattr(cursor, 'running_job_id', None)
+    if isinstance(job_ids, str):
+        job_ids = [job_ids]
+    return job_ids or []
+
+
+def profile_procedure_call(context, bigquery_conn_id='bigquery_default', hook=None):
+    """on_success_callback storing the statement profile of the task's CALL jobs.
+
+    Profiling problems are logged and never fail the task.
+    """
+    try:
+        if hook is None:
+            from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+            hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+        service = hook.get_service()
+        project = hook.project_id
+        rows = []
+        for parent_job_id in _parent_job_ids(context):
+            for job in child_jobs(service, project, parent_job_id):
+                row = statement_profile(job)
+                row.update({'dag_id': context['dag'].dag_id,
+                            'task_id': context['ti'].task_id,
+                            'execution_date': context['execution_date'].isoformat(),
+                            'parent_job_id': parent_job_id})
+                rows.append({'insertId': row['job_id'], 'json': row})
+        if not rows:
+            return
+        ensure_profile_table(service, project)
+        service.tabledata().insertAll(projectId=project, datasetId=PROFILE_DATASET,
+                                      tableId=PROFILE_TABLE, body={'rows': rows}).execute()
+        hottest = max(rows, key=lambda r: r['json']['total_slot_ms'])['json']
+        log.info("Profiled %s statements; hottest %s line %s: %s slot-ms, %s bytes",
+                 len(rows), hottest['procedure_id'], hottest['start_line'],
+                 hottest['total_slot_ms'], hottest['total_bytes_processed'])
+    except Exception:
+        log.exception("Could not profile procedure call for %s", context['ti'].task_id)
+
+
+def hottest_statements_sql(project, days=30, limit=25):
+    """Statements ranked by total slot time over the last days."""
+    return """SELECT
+  procedure_id,
+  start_line,
+  ANY_VALUE(statement_type) AS statement_type,
+  ANY_VALUE(SUBSTR(statement_text, 1, 200)) AS statement,
+  COUNT(DISTINCT execution_date) AS runs,
+  SUM(total_slot_ms) AS total_slot_ms,
+  AVG(total_slot_ms) AS avg_slot_ms,
+  AVG(elapsed_ms) / 1000 AS avg_elapsed_s,
+  AVG(total_bytes_processed) AS avg_bytes,
+  AVG(shuffle_output_bytes) AS avg_shuffle_bytes
+FROM `{project}.{dataset}.{table}`
+WHERE execution_date >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
+GROUP BY procedure_id, start_line
+ORDER BY total_slot_ms DESC
+LIMIT {limit}""".format(project=project, dataset=PROFILE_DATASET, table=PROFILE_TABLE,
+                        days=days, limit=limit)
+
+
+def log_hottest_statements(days=30, limit=25, bigquery_conn_id='bigquery_default'):
+    """Logs the statements with the most slot time; returns their rows."""
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    cursor = hook.get_conn().cursor()
+    cursor.execute(hottest_statements_sql(hook.project_id, days, limit))
+    rows = cursor.fetchall()
+    log.info("%-45s %5s %-8s %4s %14s %12s %10s %16s", 'procedure', 'line', 'type', 'runs',
+             'total slot-ms', 'avg slot-ms', 'avg secs', 'avg bytes')
+    for procedure_id, start_line, statement_type, statement, runs, total_slot_ms, avg_slot_ms, \
+            avg_elapsed_s, avg_bytes, _ in rows:
+        log.info("%-45s %5s %-8s %4s %14s %12.0f %10.1f %16.0f", procedure_id, start_line, statement_type,
+                 runs, total_slot_ms, avg_slot_ms, avg_elapsed_s, avg_bytes)
+        log.info("    %s", ' '.join((statement or '').split()))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ranks the ETLConfigACE procedure statements by slot time.')
+    parser.add_argument('--days', type=int, default=30, help='profiled runs to include, in days back')
+    parser.add_argument('--limit', type=int, default=25, help='statements to show')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    log_hottest_statements(args.days, args.limit)
@@ -0,0 +1,207 @@
+"""Data-quality statistics computed while an extract streams through.
+
+Checking a load after the fact means another query over every target.
+ExtractStats is updated with each batch the extract writes anyway, and
+keeps:
+
+* the row count;
+* per column, the null count and the min and max;
+* for tables with a declared primary key (PRIMARY_KEYS), the number of
+  duplicate keys.
+
+Arrow record batches are summarized with pyarrow.compute, one call per
+column. Batches of row dicts (the Storage Write path) are summarized in
+Python.
+
+check() compares the row count with a COUNT(*) on the source
+(source_count()) and fails on a mismatch or on duplicate keys. The
+extract calls it before committing its load, so the Load* procedures never
+see the data. The stats are returned with the load result and go to
+XCom.
+
+The Dataflow loads of the DAGs do not stream through ExtractStats, so
+check_loads() adds a <table>_quality task after each load of a keyed
+table. It counts the rows and duplicate keys of the loaded table in
+BigQuery and fails on an empty table or a repeated key. DATASETS
+(ace_hr.datasets) names that task as the table's producer, so the
+procedures of the other DAGs only read a table once it has passed.
+"""
+import logging
+import re
+
+# Declared primary keys of PeopleSoft tables, by table name without schema
+PRIMARY_KEYS = {
+    'dbo_PS_JOB': ('EMPLID', 'EMPL_RCD', 'EFFDT', 'EFFSEQ'),
+    'dbo_PS_PERSONAL_DATA': ('EMPLID',),
+    'dbo_PS_EMPLOYMENT': ('EMPLID', 'EMPL_RCD'),
+    'dbo_PS_DEPT_TBL': ('SETID', 'DEPTID', 'EFFDT'),
+    'dbo_PS_LOCATION_TBL': ('SETID', 'LOCATION', 'EFFDT'),
+    'dbo_PS_JOBCODE_TBL': ('SETID', 'JOBCODE', 'EFFDT'),
+    'dbo_PSXLATITEM': ('FIELDNAME', 'FIELDVALUE', 'EFFDT'),
+    'dbo_PS_ACTN_REASON_TBL': ('ACTION', 'ACTION_REASON', 'EFFDT'),
+    'dbo_PS_EARNINGS_TBL': ('ERNCD', 'EFFDT'),
+    'dbo_PS_PAY_CHECK': ('COMPANY', 'PAYGROUP', 'PAY_END_DT', 'OFF_CYCLE', 'PAGE_NUM', 'LINE_NUM', 'SEPCHK'),
+}
+
+log = logging.getLogger(__name__)
+
+
+class DataQualityError(Exception):
+    """An extract's rows do not match its source or repeat a primary key."""
+
+
+def primary_key(table):
+    """Declared key columns of table (dataset.table or a source name), or ()."""
+    return PRIMARY_KEYS.get(table.split('.')[-1], ())
+
+
+class ExtractStats(object):
+    """Row count, nulls, min/max and duplicate keys over the batches of one extract."""
+
+    def __init__(self, key=()):
+        self.key = tuple(key)
+        self.rows = 0
+        self.nulls = {}
+        self.minimum = {}
+        self.maximum = {}
+        self.duplicate_keys = 0
+        self._keys = set()
+
+    def _observe(self, column, nulls, low, high):
+        self.nulls[column] = self.nulls.get(column, 0) + nulls
+        if low is not None and (column not in self.minimum or low < self.minimum[column]):
+            self.minimum[column] = low
+        if high is not None and (column not in self.maximum or high > self.maximum[column]):
+            self.maximum[column] = high
+
+    def _observe_keys(self, keys):
+        for key in keys:
+            # The key tuples themselves: distinct keys can share a hash()
+            if key in self._keys:
+                self.duplicate_keys += 1
+            else:
+                self._keys.add(key)
+
+    def update_batch(self, batch):
+        """Adds an Arrow RecordBatch."""
+        import pyarrow
+        import pyarrow.compute
+        self.rows += batch.num_rows
+        for field, column in zip(batch.schema, batch.columns):
+            if pyarrow.types.is_dictionary(field.type):
+                column = column.dictionary_decode()
+            low = high = None
+            if column.null_count < len(column) and not pyarrow.types.is_binary(column.type):
+                bounds = pyarrow.compute.min_max(column)
+                low, high = bounds['min'].as_py(), bounds['max'].as_py()
+            self._observe(field.name, column.null_count, low, high)
+        if self.key:
+            self._observe_keys(zip(*[batch.column(batch.schema.get_field_index(name)).to_pylist()
+                                     for name in self.key]))
+
+    def update_rows(self, rows):
+        """Adds a batch of rows as dicts."""
+        columns = {}
+        for row in rows:
+            for name, value in row.items():
+                columns.setdefault(name, []).append(value)
+        self.rows += len(rows)
+        for name, values in columns.items():
+            present = [value for value in values if value is not None]
+            self._observe(name, len(rows) - len(present),
+                          min(present) if present else None, max(present) if present else None)
+        if self.key:
+            self._observe_keys(tuple(row.get(name) for name in self.key) for row in rows)
+
+    def result(self):
+        """The stats as JSON-friendly values, for XCom."""
+        return {
+            'rows': self.rows,
+            'key': list(self.key),
+            'duplicate_keys': self.duplicate_keys,
+            'columns': dict((name, {
+                'nulls': self.nulls[name],
+                'min': None if self.minimum.get(name) is None else str(self.minimum[name]),
+                'max': None if self.maximum.get(name) is None else str(self.maximum[name]),
+            }) for name in sorted(self.nulls)),
+        }
+
+    def check(self, source_rows=None):
+        """Raises DataQualityError if the rows do not match source_rows or a key repeats."""
+        problems = []
+        if source_rows is not None and source_rows != self.rows:
+            problems.append('extracted {} rows but the source has {}'.format(self.rows, source_rows))
+        if self.duplicate_keys:
+            problems.append('{} duplicate keys on ({})'.format(self.duplicate_keys, ', '.join(self.key)))
+        if problems:
+            raise DataQualityError('; '.join(problems))
+        log.info("Quality checks passed: %s rows, nulls %s", self.rows,
+                 dict((name, n) for name, n in sorted(self.nulls.items()) if n))
+
+
+def source_count(connection, query):
+    """COUNT(*) of query on the source, run through a DB-API connection."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute('SELECT COUNT(*) FROM ({}) q'.format(query))
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def counted_batches(batches, stats, update='update_batch'):
+    """batches, passed through after updating stats with each one."""
+    for batch in batches:
+        getattr(stats, update)(batch)
+        yield batch
+
+
+def loaded_table_sql(table, key):
+    """Row count and duplicate-key count of a BigQuery table."""
+    return 'SELECT COUNT(*), COUNT(*) - COUNT(DISTINCT TO_JSON_STRING(STRUCT({}))) FROM `{}`'.format(
+        ', '.join(key), table.replace(':', '.'))
+
+
+def check_loaded_table(table, key, bigquery_conn_id='bigquery_default', hook=None, **context):
+    """Raises DataQualityError if table is empty or repeats key; returns its stats for XCom."""
+    if hook is None:
+        from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+        hook = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    cursor = hook.get_conn().cursor()
+    cursor.execute(loaded_table_sql(table, key))
+    stats = ExtractStats(key)
+    stats.rows, stats.duplicate_keys = cursor.fetchone()
+    if not stats.rows:
+        raise DataQualityError('{} is empty after its load'.format(table))
+    stats.check()
+    return {'table': table, 'rows': stats.rows, 'key': list(stats.key), 'duplicate_keys': stats.duplicate_keys}
+
+
+def quality_task_id(load_task_id):
+    return re.sub(r'_etl$', '', load_task_id) + '_quality'
+
+
+def check_loads(dag):
+    """Adds check_loaded_table after every load of a table in PRIMARY_KEYS; returns the checks.
+
+    The check also runs ahead of whatever followed the load in dag.
+    """
+    from airflow.operators.python_operator import PythonOperator
+    checks = []
+    for task in list(dag.tasks):
+        table = (getattr(task, 'parameters', None) or {}).get('outputTable')
+        key = primary_key(table) if table else ()
+        if not key:
+            continue
+        check = PythonOperator(
+            task_id=quality_task_id(task.task_id),
+            python_callable=check_loaded_table,
+            op_kwargs={'table': table, 'key': list(key)},
+            provide_context=True,
+            priority_weight=1000,
+            dag=dag
+        )
+        check >> list(task.downstream_list)
+        task >> check
+        checks.append(check)
+    return checks
@@ -0,0 +1,63 @@
+"""Source readiness gate for the source load DAGs.
+
+The loads used to start at the scheduled time whether or not the
+AceIntegration linked sources had finished their own refresh. Each source
+DAG now starts with a SourceReadySensor. It runs a readiness query
+against the source, such as a control table or last-modified marker, and
+the loads start once the query returns a truthy first cell. The DAGs are
+scheduled ahead of the refresh (ace_hr.common.SCHEDULE), so it is the
+sensor, not the schedule, that decides when each source's loads start.
+
+The queries are kept in the source_readiness Variable, keyed by source:
+
+    {"peoplesoft": {"conn_id": "ace_integration_prod09",
+                    "sql": "SELECT 1 FROM dbo.RefreshLog WHERE Source = 'PROD09'
+                            AND CAST(CompletedAt AS date) >= '{{ next_ds }}'"}}
+
+The sql is rendered with the task context. A run starts at the end of its
+schedule interval, so the refresh of the night it loads is the one
+completed on next_ds, not on execution_date. A source without an entry
+is treated as ready. The sensor runs in reschedule mode, so it holds no
+worker slot between pokes.
+"""
+from airflow.hooks.base_hook import BaseHook
+from airflow.models import Variable
+from airflow.sensors.base_sensor_operator import BaseSensorOperator
+from airflow.utils.decorators import apply_defaults
+
+READINESS_VARIABLE = 'source_readiness'
+
+
+class SourceReadySensor(BaseSensorOperator):
+    """Waits until the readiness query configured for source succeeds.
+
+    The configuration is read at run time, so it can change without
+    touching the DAG files.
+    """
+
+    @apply_defaults
+    def __init__(self, source, *args, **kwargs):
+        kwargs.setdefault('mode', 'reschedule')
+        kwargs.setdefault('poke_interval', 5 * 60)
+        kwargs.setdefault('timeout', 6 * 60 * 60)
+        kwargs.setdefault('retries', 0)
+        super(SourceReadySensor, self).__init__(*args, **kwargs)
+        self.source = source
+
+    def poke(self, context):
+        config = Variable.get(READINESS_VARIABLE, default_var={}, deserialize_json=True).get(self.source)
+        if not config:
+            self.log.info("No readiness check configured for %s", self.source)
+            return True
+        sql = self.dag.get_template_env().from_string(config['sql']).render(**context)
+        self.log.info("Checking %s readiness: %s", self.source, sql)
+        row = BaseHook.get_connection(config['conn_id']).get_hook().get_first(sql)
+        return bool(row and row[0])
+
+
+def hold_until_ready(dag, source):
+    """Puts a SourceReadySensor for source ahead of every root of dag."""
+    roots = dag.roots
+    sensor = SourceReadySensor(task_id='source_ready', source=source, dag=dag)
+    sensor >> roots
+    return sensor
@@ -0,0 +1,179 @@
+"""Failure classification and per-class retry policy for the ACE HR tasks.
+
+Airflow's own retries treat every failure the same way: a SQL syntax error
+in a source query gets five full Dataflow launches, and a quota error is
+retried after two minutes while the quota is still exhausted. The
+RetryController classifies each failure and then either retries in-task
+with a short per-class backoff, fails the task immediately, or leaves the
+failure to Airflow's regular retries.
+
+Only backoffs of a few minutes run in-task. Quota errors need tens of
+minutes to clear, and sleeping that long would hold a worker slot, so they
+go to Airflow's retries. default_args gives those an exponential backoff
+(retry_exponential_backoff, max_retry_delay).
+
+classify_error() accepts exceptions as well as recorded payloads (the JSON
+body of an HttpError, a Dataflow job message, a plain string), so the
+classification can be checked against errors captured from real runs.
+"""
+import collections
+import json
+import logging
+import random
+import re
+import time
+
+TRANSIENT = 'transient'
+QUOTA = 'quota'
+LOCK_TIMEOUT = 'lock_timeout'
+PERMANENT = 'permanent'
+UNKNOWN = 'unknown'
+
+# Checked in order, the first class with a matching pattern wins. Lock
+# errors come first: BigQuery reports a concurrent update as invalidQuery.
+# Permanent errors come next, so a missing table is never retried because
+# the same payload also carries a generic HTTP status.
+ERROR_PATTERNS = [
+    (LOCK_TIMEOUT, [
+        r'Lock request time out period exceeded',
+        r'was deadlocked on lock',
+        r'chosen as the deadlock victim',
+        r'Could not serialize access',
+    ]),
+    (PERMANENT, [
+        r'Incorrect syntax near',
+        r'Invalid (object|column) name',
+        r'Syntax error',
+        r'invalidQuery',
+        r'Not found: (Table|Dataset|Project|Routine|Procedure)',
+        r'"reason": "notFound"',
+        r'Access Denied',
+        r'accessDenied',
+        r"Permission '[\w.]+' denied",
+        r'Login failed for user',
+        r'Unrecognized name',
+        r'No matching signature',
+    ]),
+    (QUOTA, [
+        r'quotaExceeded',
+        r'rateLimitExceeded',
+        r'RESOURCE_EXHAUSTED',
+        r'RESOURCE_POOL_EXHAUSTED',
+        r'Quota .*exceeded',
+        r'Exceeded rate limits',
+        r'does not have enough resources available',
+        r'HttpError 429',
+    ]),
+    (TRANSIENT, [
+        r'backendError',
+        r'internalError',
+        r'HttpError 5\d\d',
+        r'Service ?Unavailable',
+        r'Connection (reset|refused|aborted)',
+        r'connection (was|has been) closed',
+        r'TCP/IP connection to the host',
+        r'Broken pipe',
+        r'timed out',
+        r'Temporary failure in name resolution',
+    ]),
+]
+
+_COMPILED_PATTERNS = [(error_class, [re.compile(p, re.IGNORECASE) for p in patterns])
+                      for error_class, patterns in ERROR_PATTERNS]
+
+# attempts is the number of in-task retries for the class; zero hands the
+# failure straight to Airflow. Delays are in seconds, and kept short: the
+# task holds its worker slot while it sleeps.
+RetryPolicy = collections.namedtuple('RetryPolicy', ['attempts', 'base_delay', 'max_delay'])
+
+DEFAULT_POLICIES = {
+    TRANSIENT: RetryPolicy(attempts=3, base_delay=30, max_delay=300),
+    QUOTA: RetryPolicy(attempts=0, base_delay=0, max_delay=0),
+    LOCK_TIMEOUT: RetryPolicy(attempts=3, base_delay=60, max_delay=240),
+    PERMANENT: RetryPolicy(attempts=0, base_delay=0, max_delay=0),
+    UNKNOWN: RetryPolicy(attempts=0, base_delay=0, max_delay=0),
+}
+
+log = logging.getLogger(__name__)
+
+
+def error_text(error):
+    """Flattens an exception or recorded payload into searchable text."""
+    if isinstance(error, BaseException):
+        parts = [type(error).__name__, str(error)]
+        content = getattr(error, 'content', None)
+        if content:
+            parts.append(error_text(content))
+        if error.__cause__ is not None:
+            parts.append(error_text(error.__cause__))
+        return '\n'.join(parts)
+    if isinstance(error, bytes):
+        return error.decode('utf-8', 'replace')
+    if isinstance(error, (dict, list)):
+        return json.dumps(error, sort_keys=True)
+    return str(error)
+
+
+def classify_error(error):
+    text = error_text(error)
+    for error_class, patterns in _COMPILED_PATTERNS:
+        if any(pattern.search(text) for pattern in patterns):
+            return error_class
+    return UNKNOWN
+
+
+class RetryController(object):
+    """Runs a callable and retries it according to the class of each failure.
+
+    Each class has its own attempt budget, and the backoff doubles per
+    attempt within the class, capped at max_delay. Half of every delay is
+    random jitter so tasks that failed together do not retry together.
+    """
+
+    def __init__(self, policies=None, sleep=time.sleep, rand=random.random):
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self._sleep = sleep
+        self._rand = rand
+
+    def delay(self, error_class, attempt):
+        policy = self.policies[error_class]
+        ceiling = min(policy.max_delay, policy.base_delay * (2 ** attempt))
+        return ceiling / 2.0 + self._rand() * ceiling / 2.0
+
+    def call(self, func, *args, **kwargs):
+        attempts = collections.Counter()
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error_class = classify_error(e)
+                attempt = attempts[error_class]
+                if attempt >= self.policies[error_class].attempts:
+                    raise
+                attempts[error_class] += 1
+                wait = self.delay(error_class, attempt)
+                log.warning("Retrying after %s error (attempt %s) in %.0fs: %s",
+                            error_class, attempt + 1, wait, e)
+                self._sleep(wait)
+
+    def wrap_execute(self, execute):
+        """Wraps an operator's execute so failures go through the controller.
+
+        Permanent failures zero the task's retries before re-raising, so
+        Airflow marks the task failed instead of up for retry.
+        """
+        if getattr(execute, '_retry_controller', None) is not None:
+            return execute
+
+        def _execute(operator, context):
+            try:
+                return self.call(execute, operator, context)
+            except Exception as e:
+                if classify_error(e) == PERMANENT:
+                    log.error("Permanent failure, not retrying %s", operator.task_id)
+                    operator.retries = 0
+                raise
+        _execute._retry_controller = self
+        _execute.__wrapped__ = execute
+        return _execute
@@ -0,0 +1,123 @@
+"""Row-hash change detection for the incremental pay tables.
+
+The staging window starts at the last PAY_END_DT watermark, so the whole
+last pay period is extracted and merged again every night even when
+nothing changed. The source query now adds a ROW_HASH column: a SHA-256
+of the row's JSON. The merge matches staging and target rows on that
+hash, so:
+
+* identical rows match and are left alone,
+* new rows and new versions of changed rows are inserted,
+* old versions of changed rows and rows gone from the source are deleted.
+
+Only rows that actually changed produce DML.
+
+pay_tables() and watermark_sql() name the staging and _MAX watermark
+tables of a pay table and rebuild its watermark, for the nightly chain
+(ace_hr.payincrement) and the backfill (ace_hr.backfill) alike.
+"""
+ROW_HASH_COLUMN = 'ROW_HASH'
+
+
+def hashed_source_query(source_table, where=None):
+    """SQL Server query returning every column of source_table plus ROW_HASH.
+
+    FOR JSON with INCLUDE_NULL_VALUES renders the whole row, NULLs
+    included, so any column change gives a different hash (SQL Server 2016+).
+    """
+    query = ("SELECT s.*, CONVERT(CHAR(64), HASHBYTES('SHA2_256', "
+             "(SELECT s.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES)), 2) AS {} "
+             "FROM {} s").format(ROW_HASH_COLUMN, source_table)
+    if where:
+        query += ' WHERE ' + where
+    return query
+
+
+def pay_tables(name, mode=''):
+    """(target, staging, watermark) table names of PS_PAY_<name> in mode."""
+    target = 'HRPRD_SC.dbo_PS_PAY_' + name.upper()
+    suffix = '_' + mode.upper() if mode else ''
+    return target, target + '_STAGING' + suffix, target + '_MAX' + suffix
+
+
+def watermark_sql(target, watermark):
+    return "CREATE OR REPLACE TABLE {} AS SELECT CAST(COALESCE(MAX(PAY_END_DT),'1901-01-01') AS DATE) `PAY_END_DT` FROM {};".format(watermark, target)
+
+
+def add_hash_column_statement(table):
+    return 'ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} STRING'.format(table, ROW_HASH_COLUMN)
+
+
+def hash_merge_sql(table, partition_column='PAY_END_DT', staging=None, watermark=None):
+    """BigQuery merge of staging (table_STAGING) into table on the row hash.
+
+    Target rows are only considered from the watermark in watermark
+    (table_MAX) on; the watermark is a script variable so BigQuery prunes
+    on it.
+    """
+    return """DECLARE watermark DEFAULT (SELECT {column} FROM {watermark});
+MERGE {table} T
+USING {staging} S
+ON T.{column} >= watermark AND T.{hash} = S.{hash}
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT ROW
+WHEN NOT MATCHED BY SOURCE AND T.{column} >= watermark THEN
+  DELETE;""".format(table=table, column=partition_column, hash=ROW_HASH_COLUMN,
+                    staging=staging or table + '_STAGING', watermark=watermark or table + '_MAX')
+
+
+def window_hash_merge_sql(table, staging, window):
+    """Merge of staging into the rows of table matching window.
+
+    window is a predicate on the target alias T. Rows outside it are never
+    touched, so merges of disjoint windows can run side by side and a
+    window can be merged again without changing the result.
+    """
+    return """MERGE {table} T
+USING {staging} S
+ON {window} AND T.{hash} = S.{hash}
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT ROW
+WHEN NOT MATCHED BY SOURCE AND {window} THEN
+  DELETE;""".format(table=table, staging=staging, window=window, hash=ROW_HASH_COLUMN)
+
+
+def changed_rows_merge_sql(table, keys, staging, partition_column='PAY_END_DT'):
+    """Merge of the staged rows that changed at the source into table, by key.
+
+    Unlike hash_merge_sql, staging holds only the rows modified since a
+    last-modified watermark, not a whole window, so target rows missing
+    from it are kept. A staged row replaces the target row with the same
+    keys and a different hash; rows whose hash is already there are
+    skipped. Deletes and inserts commit together.
+    """
+    return """DECLARE first_period DEFAULT (SELECT MIN({column}) FROM {staging});
+BEGIN TRANSACTION;
+DELETE FROM {table} T
+WHERE T.{column} >= first_period AND EXISTS (
+  SELECT 1 FROM {staging} S WHERE {keys} AND S.{hash} != T.{hash});
+INSERT INTO {table}
+SELECT * FROM {staging} S
+WHERE NOT EXISTS (
+  SELECT 1 FROM {table} T WHERE T.{column} >= first_period AND T.{hash} = S.{hash});
+COMMIT TRANSACTION;""".format(table=table, staging=staging, column=partition_column, hash=ROW_HASH_COLUMN,
+                              keys=' AND '.join('S.{0} = T.{0}'.format(key) for key in keys))
+
+
+def portable_hash_merge_statements(table, partition_column='PAY_END_DT', staging=None, watermark=None):
+    """The same merge as plain DELETE and INSERT, for engines without MERGE.
+
+    Run in order inside one transaction. Used to check the merge against a
+    local database, and by ace_hr.local to run it there.
+    """
+    staging = staging or table + '_STAGING'
+    window = '{column} >= (SELECT {column} FROM {watermark})'.format(
+        watermark=watermark or table + '_MAX', column=partition_column)
+    return [
+        'DELETE FROM {table} WHERE {window} AND NOT EXISTS '
+        '(SELECT 1 FROM {staging} S WHERE S.{hash} = {table}.{hash})'.format(
+            table=table, staging=staging, window=window, hash=ROW_HASH_COLUMN),
+        'INSERT INTO {table} SELECT * FROM {staging} S WHERE NOT EXISTS '
+        '(SELECT 1 FROM {table} T WHERE T.{window} AND T.{hash} = S.{hash})'.format(
+            table=table, staging=staging, window=window, hash=ROW_HASH_COLUMN),
+    ]
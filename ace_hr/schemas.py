@@ -0,0 +1,290 @@
+"""Typed BigQuery schemas for the source tables, kept in a registry.
+
+The JDBC template loads SELECT * results into whatever columns the target
+already has, so the SQL Server types never reach BigQuery. DECIMAL,
+DATETIME and NVARCHAR columns have ended up as STRING or FLOAT, and
+procedures CAST them back on every read. register_source_schemas() runs
+ahead of a source DAG's loads. For every table the DAG extracts it:
+
+1. reads the column types from the source's INFORMATION_SCHEMA;
+2. maps them to exact BigQuery types (SQL_SERVER_TYPES). DECIMAL keeps
+   its precision and scale, DATETIME stays DATETIME;
+3. compares them with the version registered on the previous run and
+   logs the drift (added, removed, retyped columns);
+4. creates a missing target with that schema and adds new columns to an
+   existing one;
+5. registers the new version.
+
+Columns whose target type differs from the source's are reported, with
+the ETLConfigACE procedures that read the table, and left as they are.
+The Load* procedures were written against the current types. A target
+listed in the schema_retype_targets Variable is rebuilt with the
+columns CAST to the source type, once those procedures are ready for
+it. A value that does not cast fails the rebuild and leaves the table
+unchanged; it is never turned into a NULL. The rebuild keeps the table's
+partitioning, clustering and partition options (table_options()), and
+its description, labels, column descriptions, policy tags and access
+policy are put back afterwards (ace_hr.layout.restore_metadata).
+
+The registry is a JSON document per source table under schema_location,
+kept with the same stores as the checkpoint manifests. The connection for each
+source is the conn_id of its entry in the source_readiness Variable
+(ace_hr.readiness). Sources without one are skipped.
+"""
+import datetime
+import logging
+import re
+
+from ace_hr.checkpoint import manifest_store
+from ace_hr.layout import _get_table, partition_expression, restore_metadata, table_metadata, table_path
+
+# JSON list of the targets whose columns may be retyped to the source types
+RETYPE_VARIABLE = 'schema_retype_targets'
+PROCEDURE_DATASET = 'ETLConfigACE'
+
+SQL_SERVER_TYPES = {
+    'bit': 'BOOL',
+    'tinyint': 'INT64', 'smallint': 'INT64', 'int': 'INT64', 'bigint': 'INT64',
+    'decimal': 'NUMERIC', 'numeric': 'NUMERIC', 'money': 'NUMERIC', 'smallmoney': 'NUMERIC',
+    'float': 'FLOAT64', 'real': 'FLOAT64',
+    'date': 'DATE', 'time': 'TIME',
+    'datetime': 'DATETIME', 'datetime2': 'DATETIME', 'smalldatetime': 'DATETIME',
+    'datetimeoffset': 'TIMESTAMP',
+    'char': 'STRING', 'varchar': 'STRING', 'text': 'STRING',
+    'nchar': 'STRING', 'nvarchar': 'STRING', 'ntext': 'STRING',
+    'uniqueidentifier': 'STRING', 'xml': 'STRING',
+    'binary': 'BYTES', 'varbinary': 'BYTES', 'image': 'BYTES', 'timestamp': 'BYTES',
+}
+
+# Legacy type names the tables API returns
+LEGACY_TYPES = {'INTEGER': 'INT64', 'FLOAT': 'FLOAT64', 'BOOLEAN': 'BOOL'}
+
+SOURCE_TABLE = re.compile(r'^SELECT \* FROM (\w+)\.(\w+)\.(\w+)$', re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+
+
+def bigquery_field(name, data_type, precision=None, scale=None, nullable='YES'):
+    """BigQuery schema field for a SQL Server column from INFORMATION_SCHEMA.COLUMNS."""
+    field = {'name': name, 'type': SQL_SERVER_TYPES.get(data_type.lower(), 'STRING'),
+             'mode': 'NULLABLE' if nullable == 'YES' else 'REQUIRED'}
+    if field['type'] == 'NUMERIC' and precision is not None:
+        precision, scale = int(precision), int(scale or 0)
+        # NUMERIC holds 29 integer and 9 fractional digits
+        if precision - scale > 29 or scale > 9:
+            field['type'] = 'BIGNUMERIC'
+        field['precision'], field['scale'] = str(precision), str(scale)
+    return field
+
+
+def base_type(field):
+    return LEGACY_TYPES.get(field['type'], field['type'])
+
+
+def field_type(field):
+    if 'precision' in field:
+        return '{}({}, {})'.format(base_type(field), field['precision'], field['scale'])
+    return base_type(field)
+
+
+def columns_sql(database, schema, table):
+    return ("SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_PRECISION, NUMERIC_SCALE, IS_NULLABLE "
+            "FROM {}.INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = '{}' AND TABLE_NAME = '{}' "
+            "ORDER BY ORDINAL_POSITION").format(database, schema, table)
+
+
+def source_schema(hook, database, schema, table):
+    """Typed BigQuery fields of database.schema.table, read through a DB-API hook."""
+    rows = hook.get_records(columns_sql(database, schema, table))
+    if not rows:
+        raise ValueError('No columns found for {}.{}.{}'.format(database, schema, table))
+    return [bigquery_field(*row) for row in rows]
+
+
+def schema_drift(old, new):
+    """Columns added, removed and retyped from the fields old to new."""
+    old_types = dict((field['name'], field_type(field)) for field in old)
+    new_types = dict((field['name'], field_type(field)) for field in new)
+    return {
+        'added': [name for name in new_types if name not in old_types],
+        'removed': [name for name in old_types if name not in new_types],
+        'changed': [[name, old_types[name], new_types[name]] for name in new_types
+                    if name in old_types and old_types[name] != new_types[name]],
+    }
+
+
+class SchemaRegistry(object):
+    """Registered schema of each source table, with the drift of every change."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _key(self, source_table):
+        return 'schemas/' + source_table
+
+    def fields(self, source_table):
+        return self.store.read(self._key(source_table)).get('fields')
+
+    def register(self, source_table, fields):
+        """Stores fields as the current version; returns the drift from the previous one, or None."""
+        entry = self.store.read(self._key(source_table))
+        previous = entry.get('fields')
+        drift = schema_drift(previous, fields) if previous is not None else None
+        if previous is None or any(drift.values()):
+            history = entry.get('history', [])
+            history.append({'registered': datetime.datetime.utcnow().isoformat(), 'drift': drift})
+            self.store.write(self._key(source_table), {'fields': fields, 'history': history})
+        return drift
+
+
+def type_mismatches(fields, target_fields):
+    """[column, target type, source type] of the columns whose base types differ.
+
+    A rebuilt table keeps only base types, so NUMERIC precision is
+    compared on the registry's versions, not here.
+    """
+    target_types = dict((field['name'], base_type(field)) for field in target_fields)
+    return [[field['name'], target_types[field['name']], base_type(field)] for field in fields
+            if field['name'] in target_types and target_types[field['name']] != base_type(field)]
+
+
+def table_options(resource, types):
+    """PARTITION BY, CLUSTER BY and OPTIONS clauses recreating the layout of a table resource.
+
+    types maps column names to the BigQuery types of the recreated table.
+    """
+    clauses = []
+    time_partitioning = resource.get('timePartitioning') or {}
+    range_partitioning = resource.get('rangePartitioning')
+    if time_partitioning.get('field'):
+        column = time_partitioning['field']
+        clauses.append('PARTITION BY ' + partition_expression(
+            column, types[column], time_partitioning.get('type', 'DAY')))
+    elif time_partitioning:
+        clauses.append('PARTITION BY _PARTITIONDATE')
+    elif range_partitioning:
+        bounds = range_partitioning['range']
+        clauses.append('PARTITION BY RANGE_BUCKET({}, GENERATE_ARRAY({}, {}, {}))'.format(
+            range_partitioning['field'], bounds['start'], bounds['end'], bounds['interval']))
+    clustering = resource.get('clustering', {}).get('fields')
+    if clustering:
+        clauses.append('CLUSTER BY ' + ', '.join(clustering))
+    options = []
+    if resource.get('requirePartitionFilter') or time_partitioning.get('requirePartitionFilter'):
+        options.append('require_partition_filter = TRUE')
+    if time_partitioning.get('expirationMs'):
+        options.append('partition_expiration_days = {:g}'.format(int(time_partitioning['expirationMs']) / 86400000.0))
+    if options:
+        clauses.append('OPTIONS ({})'.format(', '.join(options)))
+    return ' '.join(clauses)
+
+
+def target_statements(table, fields, resource, retype=False):
+    """Statements bringing the existing target table, of table resource resource, in line with fields.
+
+    Columns the target lacks are added. With retype, columns of another
+    base type are rebuilt with a CAST, which fails on a value that does
+    not convert, keeping the table's layout. Target-only columns such as
+    ROW_HASH are left alone.
+    """
+    target_fields = resource['schema']['fields']
+    target_names = set(field['name'] for field in target_fields)
+    statements = ['ALTER TABLE {} ADD COLUMN IF NOT EXISTS `{}` {}'.format(table, field['name'], field_type(field))
+                  for field in fields if field['name'] not in target_names]
+    mismatches = type_mismatches(fields, target_fields)
+    if retype and mismatches:
+        types = dict((field['name'], base_type(field)) for field in target_fields)
+        types.update((name, source_type) for name, _, source_type in mismatches)
+        statements.append(' '.join(part for part in [
+            'CREATE OR REPLACE TABLE', table, table_options(resource, types),
+            'AS SELECT * REPLACE ({}) FROM {}'.format(', '.join(
+                'CAST(`{0}` AS {1}) AS `{0}`'.format(name, source_type) for name, _, source_type in mismatches),
+                table)] if part))
+    return statements
+
+
+def reading_procedures(cursor, table, dataset=PROCEDURE_DATASET):
+    """Names of the procedures in dataset whose body mentions table."""
+    cursor.execute("SELECT routine_name FROM {}.INFORMATION_SCHEMA.ROUTINES "
+                   "WHERE REGEXP_CONTAINS(routine_definition, r'\\b{}\\b') ORDER BY routine_name".format(
+                       dataset, re.escape(table.split('.')[-1])))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def source_tables(dag):
+    """(source database, schema, table, target dataset.table) of every SELECT * extract in dag."""
+    tables = []
+    for task in dag.tasks:
+        parameters = getattr(task, 'parameters', None) or {}
+        match = SOURCE_TABLE.match(parameters.get('query', ''))
+        if match and parameters.get('outputTable'):
+            tables.append(match.groups() + (parameters['outputTable'].split(':')[-1],))
+    return sorted(tables)
+
+
+def register_source_schemas(source, project, location, bigquery_conn_id='bigquery_default', **context):
+    """python_callable typing the targets of one source DAG's extracts.
+
+    Returns the drift per table, with the type mismatches each target
+    still has under 'mismatched'.
+    """
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    from airflow.hooks.base_hook import BaseHook
+    from airflow.models import Variable
+    from ace_hr.readiness import READINESS_VARIABLE
+    config = Variable.get(READINESS_VARIABLE, default_var={}, deserialize_json=True).get(source)
+    if not config:
+        log.info("No connection configured for %s; schemas not checked", source)
+        return {}
+    source_hook = BaseHook.get_connection(config['conn_id']).get_hook()
+    bigquery = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    service = bigquery.get_service()
+    cursor = bigquery.get_conn().cursor()
+    registry = SchemaRegistry(manifest_store(location))
+    retype_targets = Variable.get(RETYPE_VARIABLE, default_var=[], deserialize_json=True)
+    drifts = {}
+    for database, schema, table, target in source_tables(context['dag']):
+        fields = source_schema(source_hook, database, schema, table)
+        drift = registry.register('.'.join([database, schema, table]), fields)
+        if drift and any(drift.values()):
+            log.warning("Schema drift in %s.%s.%s: %s", database, schema, table, drift)
+            drifts[target] = drift
+        resource = _get_table(service, project, target)
+        if resource is None:
+            dataset, name = target.split('.')
+            log.info("Creating %s with its source's schema", target)
+            service.tables().insert(projectId=project, datasetId=dataset, body={
+                'tableReference': {'projectId': project, 'datasetId': dataset, 'tableId': name},
+                'schema': {'fields': fields}}).execute()
+            continue
+        retype = target in retype_targets
+        mismatches = type_mismatches(fields, resource['schema']['fields'])
+        if mismatches:
+            log.warning("%s has columns typed unlike the source%s: %s; read by procedures %s",
+                        target, '' if retype else ' (not listed in {}, left as they are)'.format(RETYPE_VARIABLE),
+                        mismatches, reading_procedures(cursor, target))
+            drifts.setdefault(target, {})['mismatched'] = mismatches
+        rebuilt = retype and bool(mismatches)
+        if rebuilt:
+            policy = service.tables().getIamPolicy(resource=table_path(project, target), body={}).execute()
+        for statement in target_statements(target, fields, resource, retype):
+            log.info("Typing %s: %s", target, statement)
+            cursor.run_query(sql=statement)
+        if rebuilt:
+            restore_metadata(service, project, target, table_metadata(resource), policy)
+    return drifts
+
+
+def check_source_schemas(dag, source):
+    """Puts a source_schemas task ahead of every root of dag."""
+    from airflow.operators.python_operator import PythonOperator
+    from ace_hr.common import project_id, schema_location
+    roots = dag.roots
+    task = PythonOperator(
+        task_id='source_schemas',
+        python_callable=register_source_schemas,
+        op_kwargs={'source': source, 'project': project_id, 'location': schema_location},
+        provide_context=True,
+        dag=dag)
+    task >> roots
+    return task
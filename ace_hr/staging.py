@@ -0,0 +1,152 @@
+"""Lifecycle of the Dataflow staging areas.
+
+Every extract used to write its load files to the one shared
+bigQueryLoadingTemporaryDirectory, and its Dataflow temp files to the
+template's temp location. Leftovers from failed or retried jobs piled up
+there, slowed object listing and could collide between concurrent runs.
+
+The patched DataFlowHook now gives each job its own prefixes, under
+<location>/ace_staging/<run scope>/<job name>/, for both the load
+directory and the job's tempLocation. It deletes them once the job has
+succeeded. A failed job keeps its files for the retry and for debugging.
+Retries share the job name, so they reuse the same prefix.
+
+sweep() deletes job prefixes whose newest object is older than a maximum
+age. These are the ones abandoned by jobs that never succeeded.
+usage() reports objects and bytes per run scope, plus the total under
+each location, legacy files included. The ACE_HR_staging DAG runs both
+daily.
+
+Locations are gs://bucket/path or, for running locally, a directory
+(LocalStagingStore).
+"""
+import datetime
+import logging
+import os
+import shutil
+
+STAGING_DIR = 'ace_staging'
+
+log = logging.getLogger(__name__)
+
+
+def staging_prefix(location, scope, name):
+    return '/'.join([location.rstrip('/'), STAGING_DIR, scope or 'adhoc', name]) + '/'
+
+
+class LocalStagingStore(object):
+    """A directory standing in for a bucket."""
+
+    def list(self, prefix):
+        """(path, bytes, updated UTC datetime) of every file under prefix."""
+        root = prefix.rstrip('/')
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                yield (path.replace(os.sep, '/'), stat.st_size,
+                       datetime.datetime.utcfromtimestamp(stat.st_mtime))
+
+    def delete_prefix(self, prefix):
+        shutil.rmtree(prefix.rstrip('/'), ignore_errors=True)
+
+
+class GcsStagingStore(object):
+
+    def __init__(self, gcp_conn_id='google_cloud_default'):
+        from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
+        self.client = GoogleCloudStorageHook(google_cloud_storage_conn_id=gcp_conn_id).get_conn()
+
+    @staticmethod
+    def _split(prefix):
+        bucket, _, path = prefix[len('gs://'):].partition('/')
+        return bucket, path
+
+    def list(self, prefix):
+        bucket, path = self._split(prefix)
+        for blob in self.client.bucket(bucket).list_blobs(prefix=path):
+            yield 'gs://{}/{}'.format(bucket, blob.name), blob.size, blob.updated.replace(tzinfo=None)
+
+    def delete_prefix(self, prefix):
+        bucket, path = self._split(prefix)
+        blobs = list(self.client.bucket(bucket).list_blobs(prefix=path))
+        # delete_blobs takes at most 1000 blobs per batch
+        for i in range(0, len(blobs), 1000):
+            self.client.bucket(bucket).delete_blobs(blobs[i:i + 1000])
+
+
+def staging_store(location):
+    if location.startswith('gs://'):
+        return GcsStagingStore()
+    return LocalStagingStore()
+
+
+def cleanup(prefixes, store=None):
+    """Deletes the staging prefixes of a succeeded job; a failure is only logged."""
+    for prefix in prefixes:
+        try:
+            (store or staging_store(prefix)).delete_prefix(prefix)
+            log.info("Removed staging prefix %s", prefix)
+        except Exception as e:
+            log.warning("Could not remove staging prefix %s, leaving it to the sweeper: %s", prefix, e)
+
+
+def job_prefixes(location, store):
+    """Job prefix -> (objects, bytes, newest update) of every job staging area under location."""
+    root = location.rstrip('/') + '/' + STAGING_DIR + '/'
+    jobs = {}
+    for path, size, updated in store.list(root):
+        parts = path[len(root):].split('/')
+        if len(parts) < 3:
+            continue
+        prefix = root + parts[0] + '/' + parts[1] + '/'
+        objects, total, newest = jobs.get(prefix, (0, 0, updated))
+        jobs[prefix] = (objects + 1, total + size, max(newest, updated))
+    return jobs
+
+
+def sweep(location, max_age_hours, store=None, now=None):
+    """Deletes job prefixes under location with nothing newer than max_age_hours; returns them."""
+    store = store or staging_store(location)
+    cutoff = (now or datetime.datetime.utcnow()) - datetime.timedelta(hours=max_age_hours)
+    swept = []
+    for prefix, (objects, total, newest) in sorted(job_prefixes(location, store).items()):
+        if newest < cutoff:
+            log.info("Sweeping %s: %s objects, %s bytes, last written %s", prefix, objects, total, newest)
+            store.delete_prefix(prefix)
+            swept.append(prefix)
+    return swept
+
+
+def usage(location, store=None):
+    """Objects and bytes under location: in total and per run scope of the job staging areas."""
+    store = store or staging_store(location)
+    root = location.rstrip('/') + '/' + STAGING_DIR + '/'
+    report = {'location': location, 'objects': 0, 'bytes': 0, 'scopes': {}}
+    for path, size, updated in store.list(location.rstrip('/') + '/'):
+        report['objects'] += 1
+        report['bytes'] += size
+        if path.startswith(root):
+            scope = report['scopes'].setdefault(path[len(root):].split('/')[0], {'objects': 0, 'bytes': 0})
+            scope['objects'] += 1
+            scope['bytes'] += size
+    return report
+
+
+def sweep_staging(locations, max_age_hours=24, **kwargs):
+    """python_callable sweeping each of locations; returns the prefixes removed."""
+    swept = []
+    for location in locations:
+        swept.extend(sweep(location, float(max_age_hours)))
+    log.info("Swept %s abandoned staging prefixes", len(swept))
+    return swept
+
+
+def log_staging_usage(locations, **kwargs):
+    """python_callable logging the staging usage of each of locations."""
+    reports = [usage(location) for location in locations]
+    for report in reports:
+        log.info("%s: %s objects, %.1f MB", report['location'], report['objects'], report['bytes'] / 2.0 ** 20)
+        for scope, counts in sorted(report['scopes'].items()):
+            log.info("    %-30s %8s objects %10.1f MB", scope, counts['objects'], counts['bytes'] / 2.0 ** 20)
+    return reports
@@ -0,0 +1,315 @@
+"""Extract sink writing straight into BigQuery through the Storage Write API.
+
+A JDBC template load writes files under bigQueryLoadingTemporaryDirectory
+and then runs a load job, so every row is written twice and waits in the
+load job queue. StorageWriteSink instead appends batches to a PENDING
+write stream. When the extract is done it finalizes the stream and
+commits it, and all rows become visible in the table at once. If the
+extract fails the stream is never committed, so the table is unchanged.
+
+The sink talks to a small service interface:
+
+* create_stream(table) -> stream
+* append(stream, rows, offset)
+* finalize(stream) -> row count
+* commit(table, streams)
+
+BigQueryWriteService implements it with the Storage Write API.
+InMemoryWriteService is a local fake with the same offset and commit
+rules, for running extracts offline.
+
+python_extract() is a lightweight, non-Dataflow extractor. It reads a
+query through any DB-API connection and writes to a sink. Data-quality
+stats (ace_hr.quality) are collected on the way, and the stream is only
+committed if they pass.
+"""
+import datetime
+import decimal
+import itertools
+import logging
+
+from ace_hr.quality import ExtractStats, primary_key, source_count
+
+EPOCH_DATE = datetime.date(1970, 1, 1)
+EPOCH = datetime.datetime(1970, 1, 1)
+
+log = logging.getLogger(__name__)
+
+
+def _timestamp_micros(value):
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+# BigQuery type -> conversion of a Python value to what the write API
+# accepts for that type in a proto row
+CONVERTERS = {
+    'STRING': str,
+    'INT64': int,
+    'INTEGER': int,
+    'FLOAT64': float,
+    'FLOAT': float,
+    'BOOL': bool,
+    'BOOLEAN': bool,
+    'BYTES': bytes,
+    'NUMERIC': lambda v: str(decimal.Decimal(v)),
+    'BIGNUMERIC': lambda v: str(decimal.Decimal(v)),
+    'DATE': lambda v: ((v.date() if isinstance(v, datetime.datetime) else v) - EPOCH_DATE).days,
+    'DATETIME': lambda v: v.isoformat(' '),
+    'TIME': lambda v: v.isoformat(),
+    'TIMESTAMP': _timestamp_micros,
+}
+
+
+def convert_row(schema, row):
+    """row (a dict) with each value converted for its column type; NULLs are left out."""
+    return dict((name, CONVERTERS[column_type](row[name])) for name, column_type in schema
+                if row.get(name) is not None)
+
+
+class StreamOffsetError(Exception):
+    """An append did not start at the end of the stream."""
+
+
+class StorageWriteSink(object):
+    """Buffers rows and appends them to one pending stream of table.
+
+    table is 'projects/<p>/datasets/<d>/tables/<t>' and schema a list of
+    (column, BigQuery type). Appends carry their offset, so one that is
+    retried after an ambiguous failure cannot write its rows twice.
+    """
+
+    def __init__(self, service, table, schema, batch_rows=10000):
+        self.service = service
+        self.table = table
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.stream = None
+        self.offset = 0
+        self._buffer = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+            return
+        try:
+            self.abort()
+        except Exception:
+            # The failure that got us here is the one to report; returning
+            # re-raises it
+            log.exception("Could not abandon stream %s", self.stream)
+
+    def open(self):
+        self.stream = self.service.create_stream(self.table)
+        self.offset = 0
+
+    def write(self, rows):
+        for row in rows:
+            self._buffer.append(convert_row(self.schema, row))
+            if len(self._buffer) >= self.batch_rows:
+                self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.service.append(self.stream, self._buffer, self.offset)
+            self.offset += len(self._buffer)
+            self._buffer = []
+
+    def commit(self):
+        """Appends what is buffered and commits the stream; returns the rows written."""
+        self.flush()
+        rows = self.service.finalize(self.stream)
+        self.service.commit(self.table, [self.stream])
+        log.info("Committed %s rows to %s", rows, self.table)
+        return rows
+
+    def abort(self):
+        # An uncommitted pending stream is discarded by BigQuery
+        log.info("Abandoning stream %s after %s rows", self.stream, self.offset)
+        self._buffer = []
+        self.service.finalize(self.stream)
+
+
+class InMemoryWriteService(object):
+    """Local fake of the write API: pending streams, offsets, atomic commit."""
+
+    def __init__(self):
+        self.tables = {}
+        self.streams = {}
+
+    def create_stream(self, table):
+        name = '{}/streams/{}'.format(table, len(self.streams))
+        self.streams[name] = {'table': table, 'rows': [], 'finalized': False, 'committed': False}
+        return name
+
+    def append(self, stream, rows, offset):
+        state = self.streams[stream]
+        if state['finalized']:
+            raise StreamOffsetError('Stream {} is finalized'.format(stream))
+        if offset != len(state['rows']):
+            raise StreamOffsetError('Offset {} but stream {} holds {} rows'.format(
+                offset, stream, len(state['rows'])))
+        state['rows'].extend(rows)
+
+    def finalize(self, stream):
+        self.streams[stream]['finalized'] = True
+        return len(self.streams[stream]['rows'])
+
+    def commit(self, table, streams):
+        states = [self.streams[stream] for stream in streams]
+        if not all(state['finalized'] and state['table'] == table and not state['committed']
+                   for state in states):
+            raise ValueError('Streams must be finalized, uncommitted and belong to ' + table)
+        for state in states:
+            state['committed'] = True
+            self.tables.setdefault(table, []).extend(state['rows'])
+
+    def table_rows(self, table):
+        return list(self.tables.get(table, []))
+
+
+PROTO_TYPES = {
+    'STRING': 'TYPE_STRING', 'NUMERIC': 'TYPE_STRING', 'BIGNUMERIC': 'TYPE_STRING',
+    'DATETIME': 'TYPE_STRING', 'TIME': 'TYPE_STRING',
+    'INT64': 'TYPE_INT64', 'INTEGER': 'TYPE_INT64', 'TIMESTAMP': 'TYPE_INT64',
+    'FLOAT64': 'TYPE_DOUBLE', 'FLOAT': 'TYPE_DOUBLE',
+    'BOOL': 'TYPE_BOOL', 'BOOLEAN': 'TYPE_BOOL',
+    'BYTES': 'TYPE_BYTES', 'DATE': 'TYPE_INT32',
+}
+
+
+class ProtoRowEncoder(object):
+    """Serializes converted rows as proto messages built from the table schema."""
+
+    def __init__(self, schema):
+        from google.protobuf import descriptor_pb2, descriptor_pool
+        field = descriptor_pb2.FieldDescriptorProto
+        self.descriptor = descriptor_pb2.DescriptorProto(name='AceRow')
+        for number, (name, column_type) in enumerate(schema, 1):
+            self.descriptor.field.add(name=name, number=number, label=field.LABEL_OPTIONAL,
+                                      type=field.Type.Value(PROTO_TYPES[column_type]))
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(descriptor_pb2.FileDescriptorProto(name='ace_row.proto', message_type=[self.descriptor]))
+        message_descriptor = pool.FindMessageTypeByName('AceRow')
+        try:
+            from google.protobuf.message_factory import GetMessageClass
+            self.message_class = GetMessageClass(message_descriptor)
+        except ImportError:
+            from google.protobuf.message_factory import MessageFactory
+            self.message_class = MessageFactory(pool).GetPrototype(message_descriptor)
+
+    def encode(self, rows):
+        return [self.message_class(**row).SerializeToString() for row in rows]
+
+
+class BigQueryWriteService(object):
+    """The Storage Write API, with credentials from an Airflow GCP connection."""
+
+    # AppendRows requests are limited to 10 MB
+    MAX_REQUEST_BYTES = 9 * 1024 * 1024
+
+    def __init__(self, schema, gcp_conn_id='google_cloud_default'):
+        from airflow.contrib.hooks.gcp_api_base_hook import GoogleCloudBaseHook
+        from google.cloud import bigquery_storage_v1
+        self.client = bigquery_storage_v1.BigQueryWriteClient(
+            credentials=GoogleCloudBaseHook(gcp_conn_id=gcp_conn_id)._get_credentials())
+        self.encoder = ProtoRowEncoder(schema)
+        self._connections = {}
+
+    def create_stream(self, table):
+        from google.cloud.bigquery_storage_v1 import types
+        return self.client.create_write_stream(
+            parent=table, write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING)).name
+
+    def _connection(self, stream):
+        from google.cloud.bigquery_storage_v1 import types, writer
+        if stream not in self._connections:
+            template = types.AppendRowsRequest(write_stream=stream, proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=self.encoder.descriptor)))
+            self._connections[stream] = writer.AppendRowsStream(self.client, template)
+        return self._connections[stream]
+
+    def append(self, stream, rows, offset):
+        from google.cloud.bigquery_storage_v1 import types
+        pending, size = [], 0
+        for serialized in self.encoder.encode(rows) + [None]:
+            if (serialized is None and pending) or (
+                    pending and serialized is not None and size + len(serialized) > self.MAX_REQUEST_BYTES):
+                request = types.AppendRowsRequest(offset=offset, proto_rows=types.AppendRowsRequest.ProtoData(
+                    rows=types.ProtoRows(serialized_rows=pending)))
+                self._connection(stream).send(request).result()
+                offset += len(pending)
+                pending, size = [], 0
+            if serialized is not None:
+                pending.append(serialized)
+                size += len(serialized)
+
+    def finalize(self, stream):
+        if stream in self._connections:
+            self._connections.pop(stream).close()
+        return self.client.finalize_write_stream(name=stream).row_count
+
+    def commit(self, table, streams):
+        from google.cloud.bigquery_storage_v1 import types
+        response = self.client.batch_commit_write_streams(
+            types.BatchCommitWriteStreamsRequest(parent=table, write_streams=streams))
+        if response.stream_errors:
+            raise ValueError('Commit to {} failed: {}'.format(table, list(response.stream_errors)))
+
+
+def table_path(project, table):
+    dataset, name = table.split('.')
+    return 'projects/{}/datasets/{}/tables/{}'.format(project, dataset, name)
+
+
+def extract_rows(connection, query, fetch_size=10000):
+    """Rows of query as dicts, fetched fetch_size at a time from a DB-API connection."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        while True:
+            batch = cursor.fetchmany(fetch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def python_extract(source_conn_id, query, table, bigquery_conn_id='bigquery_default',
+                   gcp_conn_id='google_cloud_default', fetch_size=10000, **kwargs):
+    """python_callable loading query from an Airflow connection into dataset.table.
+
+    The target table must exist; its schema drives the row conversion.
+    Returns the rows written and their quality stats. If the row count
+    differs from the source's or a primary key repeats, nothing is committed.
+    """
+    from airflow.contrib.hooks.bigquery_hook import BigQueryHook
+    from airflow.hooks.base_hook import BaseHook
+    bigquery = BigQueryHook(bigquery_conn_id=bigquery_conn_id, use_legacy_sql=False)
+    dataset, name = table.split('.')
+    resource = bigquery.get_service().tables().get(
+        projectId=bigquery.project_id, datasetId=dataset, tableId=name).execute()
+    schema = [(field['name'], field['type']) for field in resource['schema']['fields']]
+    connection = BaseHook.get_connection(source_conn_id).get_hook().get_conn()
+    stats = ExtractStats(primary_key(table))
+    try:
+        expected = source_count(connection, query)
+        rows = extract_rows(connection, query, fetch_size)
+        with StorageWriteSink(BigQueryWriteService(schema, gcp_conn_id),
+                              table_path(bigquery.project_id, table), schema, fetch_size) as sink:
+            for batch in iter(lambda: list(itertools.islice(rows, fetch_size)), []):
+                stats.update_rows(batch)
+                sink.write(batch)
+            stats.check(expected)
+        return {'rows': sink.offset, 'quality': stats.result()}
+    finally:
+        connection.close()
@@ -0,0 +1,140 @@
+"""Tuple-at-a-time vs Arrow batching on a synthetic pay earnings extract.
+
+Builds a SQLite fixture shaped like dbo_PS_PAY_EARNINGS (10M rows by
+default), then extracts it twice, each mode in its own process so the
+peak RSS figures are separate:
+
+* tuples: fetchmany, convert every value in Python, write JSON lines
+* arrow: ace_hr.arrowbatch record batches written to Parquet
+
+and prints rows/sec and peak RSS for both.
+
+    python benchmarks/arrow_extract.py [--rows 10000000] [--db /tmp/pay_earnings.db]
+"""
+import argparse
+import datetime
+import decimal
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+SCHEMA = [
+    ('COMPANY', 'STRING'), ('PAYGROUP', 'STRING'), ('PAY_END_DT', 'DATE'), ('OFF_CYCLE', 'STRING'),
+    ('PAGE_NUM', 'INT64'), ('LINE_NUM', 'INT64'), ('EMPLID', 'STRING'), ('ERNCD', 'STRING'),
+    ('OTH_HRS', 'FLOAT64'), ('OTH_EARNS', 'NUMERIC'), ('DEPTID', 'STRING'), ('JOBCODE', 'STRING'),
+]
+QUERY = 'SELECT {} FROM PS_PAY_EARNINGS'.format(', '.join(name for name, _ in SCHEMA))
+
+
+def make_fixture(path, rows, seed=42):
+    if os.path.exists(path):
+        os.remove(path)
+    rand = random.Random(seed)
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE PS_PAY_EARNINGS (COMPANY TEXT, PAYGROUP TEXT, PAY_END_DT TEXT, '
+               'OFF_CYCLE TEXT, PAGE_NUM INTEGER, LINE_NUM INTEGER, EMPLID TEXT, ERNCD TEXT, '
+               'OTH_HRS REAL, OTH_EARNS TEXT, DEPTID TEXT, JOBCODE TEXT)')
+    companies = ['C{:02d}'.format(i) for i in range(20)]
+    paygroups = ['PG{:02d}'.format(i) for i in range(50)]
+    erncds = ['E{:02d}'.format(i) for i in range(30)]
+    start = datetime.date(2010, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append((
+            rand.choice(companies), rand.choice(paygroups),
+            (start + datetime.timedelta(days=14 * rand.randrange(400))).isoformat(),
+            rand.choice('NY'), rand.randrange(1, 5000), rand.randrange(1, 60),
+            '{:08d}'.format(rand.randrange(200000)), rand.choice(erncds),
+            round(rand.random() * 80, 2), '{:.2f}'.format(rand.random() * 5000),
+            'D{:04d}'.format(rand.randrange(900)), 'J{:05d}'.format(rand.randrange(3000))))
+        if len(batch) == 100000:
+            db.executemany('INSERT INTO PS_PAY_EARNINGS VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', batch)
+            batch = []
+    if batch:
+        db.executemany('INSERT INTO PS_PAY_EARNINGS VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', batch)
+    db.commit()
+    db.close()
+
+
+def _convert(column_type, value):
+    if value is None:
+        return None
+    if column_type == 'DATE':
+        return datetime.datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+    if column_type == 'NUMERIC':
+        return str(decimal.Decimal(value))
+    if column_type == 'INT64':
+        return int(value)
+    if column_type == 'FLOAT64':
+        return float(value)
+    return str(value)
+
+
+def run_tuples(db_path, out_path, batch_rows=65536):
+    db = sqlite3.connect(db_path)
+    cursor = db.cursor()
+    cursor.execute(QUERY)
+    rows = 0
+    with open(out_path, 'w') as out:
+        while True:
+            batch = cursor.fetchmany(batch_rows)
+            if not batch:
+                break
+            for row in batch:
+                out.write(json.dumps(dict((name, _convert(column_type, value))
+                                          for (name, column_type), value in zip(SCHEMA, row))))
+                out.write('\n')
+            rows += len(batch)
+    return rows
+
+
+def run_arrow(db_path, out_path, batch_rows=65536):
+    from ace_hr.arrowbatch import fetch_record_batches, write_parquet
+    return write_parquet(fetch_record_batches(sqlite3.connect(db_path), QUERY, SCHEMA, batch_rows), out_path)
+
+
+def measure(mode, db_path):
+    out_path = tempfile.mktemp(suffix='.' + mode)
+    started = time.time()
+    try:
+        rows = {'tuples': run_tuples, 'arrow': run_arrow}[mode](db_path, out_path)
+        seconds = time.time() - started
+        result = {'mode': mode, 'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds,
+                  'output_mb': os.path.getsize(out_path) / 2.0 ** 20}
+    except ImportError as e:
+        result = {'mode': mode, 'error': str(e)}
+    finally:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+    # ru_maxrss is in kilobytes on Linux
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=10000000)
+    parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'pay_earnings.db'))
+    parser.add_argument('--mode', choices=['tuples', 'arrow'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.db)))
+        sys.exit(0)
+    print('Building {:,} row fixture in {}'.format(args.rows, args.db))
+    make_fixture(args.db, args.rows)
+    for mode in ['tuples', 'arrow']:
+        result = json.loads(subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, '--db', args.db]))
+        if 'error' in result:
+            print('{:<7} skipped: {}'.format(mode, result['error']))
+        else:
+            print('{mode:<7} {rows:>11,} rows {seconds:8.1f}s {rows_per_sec:>12,.0f} rows/s '
+                  '{peak_rss_mb:8.1f} MB peak RSS {output_mb:8.1f} MB output'.format(**result))
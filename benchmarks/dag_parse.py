@@ -0,0 +1,77 @@
+"""DagBag parse time and memory of each ACE HR DAG file.
+
+Runs what a scheduler file processor does for each ACE_HR_*.py file, one
+process per file as the scheduler forks them: a DagBag of the file,
+importing ace_hr, applying the hook patch, reading the Variables and
+constructing every operator.
+
+Prints, per file and in total, the parse seconds (median of --repeat
+runs), the peak Python allocations of the parse and the peak RSS of the
+process.
+
+Needs an Airflow install. Variables unset in its metadata database get
+placeholders, as for ace_hr.local.
+
+    python benchmarks/dag_parse.py [--dags-folder DIR] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def measure(path):
+    """Parses path with a DagBag; its seconds, peak allocations and RSS."""
+    # Airflow itself is imported by every file processor before the parse
+    from airflow.models import DagBag
+    tracemalloc.start()
+    started = time.time()
+    dagbag = DagBag(dag_folder=path, include_examples=False)
+    seconds = time.time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ru_maxrss is in kilobytes on Linux
+    return {'path': os.path.basename(path), 'seconds': seconds, 'peak_alloc_mb': peak / 2.0 ** 20,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+            'dags': len(dagbag.dags), 'tasks': sum(len(dag.tasks) for dag in dagbag.dags.values()),
+            'import_errors': len(dagbag.import_errors)}
+
+
+def run_file(path, repeat, env):
+    runs = sorted((json.loads(subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--measure', path], env=env).decode('utf-8').splitlines()[-1])
+        for _ in range(repeat)), key=lambda result: result['seconds'])
+    return runs[len(runs) // 2]
+
+
+LINE = '{path:<32} {dags:>2} DAGs {tasks:>4} tasks {seconds:7.2f}s {peak_alloc_mb:7.1f} MB peak alloc ' \
+       '{peak_rss_mb:7.1f} MB peak RSS {import_errors} import errors'
+
+
+if __name__ == '__main__':
+    from ace_hr.dagfiles import dag_files, default_dags_folder
+    from ace_hr.local import VARIABLES
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--dags-folder', default=default_dags_folder())
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        sys.exit(0)
+    env = dict(os.environ, PYTHONPATH=args.dags_folder)
+    for name in VARIABLES:
+        env.setdefault('AIRFLOW_VAR_' + name.upper(), 'local')
+    results = [run_file(path, args.repeat, env) for path in dag_files(args.dags_folder)]
+    for result in results:
+        print(LINE.format(**result))
+    print(LINE.format(path='total', seconds=sum(r['seconds'] for r in results),
+                      peak_alloc_mb=max(r['peak_alloc_mb'] for r in results),
+                      peak_rss_mb=max(r['peak_rss_mb'] for r in results),
+                      **dict((key, sum(r[key] for r in results)) for key in ['dags', 'tasks', 'import_errors'])))
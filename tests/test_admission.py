@@ -0,0 +1,180 @@
+"""AdmissionController: quota validation, reservations of simultaneous launches, rescheduling."""
+import collections
+import contextlib
+import datetime
+import threading
+import time
+
+import pytest
+
+from ace_hr.admission import AdmissionController, AdmissionDeferred, AdmissionTimeout, MemoryReservationStore, \
+    Usage, reschedule_on_deferral
+from ace_hr.retry import QUOTA, classify_error
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, num_retries=0):
+        return self.result
+
+
+class FakeDataflow(object):
+    """jobs.list and jobs.get; active holds the jobs listed as ACTIVE."""
+
+    def __init__(self, active=(), list_delay=0):
+        self.active = list(active)
+        self.list_delay = list_delay
+        self.calls = []
+
+    def projects(self):
+        return self
+
+    def locations(self):
+        return self
+
+    def jobs(self):
+        return self
+
+    def list(self, projectId, location, filter=None):
+        # A slow list widens the window in which unreserved launches race
+        time.sleep(self.list_delay)
+        self.calls.append('list')
+        return Request({'jobs': list(self.active)})
+
+    def list_next(self, previous_request, previous_response):
+        return None
+
+    def get(self, projectId, location, jobId, view=None):
+        self.calls.append('get')
+        return Request({'environment': {'workerPools': [
+            {'autoscalingSettings': {'maxNumWorkers': 10}, 'machineType': 'n1-standard-4'}]}})
+
+
+def controller(service, quotas, store=None, clock=time.time):
+    return AdmissionController(service, 'amed-dev-analyticsplatform', quotas, store=store, clock=clock)
+
+
+def test_unknown_quota_key_is_rejected():
+    with pytest.raises(ValueError, match='vcpu'):
+        controller(FakeDataflow(), {'vcpu': 240})
+    with pytest.raises(ValueError, match='non-negative'):
+        controller(FakeDataflow(), {'jobs': '25'})
+
+
+def test_active_jobs_are_costed_from_their_worker_pool():
+    admission = controller(FakeDataflow(active=[{'id': 'a', 'name': 'load-a'}]), {'vcpus': 80})
+    assert admission.active_usage('us-central1') == Usage(vcpus=40, ips=10, jobs=1)
+    admission.admit('us-central1', Usage(vcpus=40, ips=10, jobs=1), 'load-b')
+    with pytest.raises(AdmissionDeferred) as deferred:
+        admission.admit('us-central1', Usage(vcpus=41, ips=10, jobs=1), 'load-c')
+    assert deferred.value.delay == admission.poll_interval
+    # Not mistaken for a quota error of the Dataflow API
+    assert classify_error(deferred.value) != QUOTA
+
+
+def test_demand_over_the_quotas_is_rejected():
+    with pytest.raises(ValueError, match='more than the quotas'):
+        controller(FakeDataflow(), {'vcpus': 24}).admit('us-central1', Usage(vcpus=40, ips=10, jobs=1), 'load-a')
+
+
+def test_no_lock_is_held_across_api_calls():
+    service = FakeDataflow(active=[{'id': 'a', 'name': 'load-a'}])
+
+    class CheckingStore(MemoryReservationStore):
+        @contextlib.contextmanager
+        def locked(self):
+            calls = len(service.calls)
+            with super(CheckingStore, self).locked() as reservations:
+                yield reservations
+            assert len(service.calls) == calls
+
+    admission = controller(service, {'jobs': 2}, store=CheckingStore())
+    admission.admit('us-central1', Usage(10, 10, 1), 'load-b')
+    admission.release('load-b')
+    assert service.calls == ['list', 'get']
+
+
+def test_simultaneous_launches_do_not_overcommit():
+    # Thirty tasks start at once against an empty region with room for five
+    service = FakeDataflow(list_delay=0.01)
+    store = MemoryReservationStore()
+    admitted, refused = [], []
+
+    def launch(i):
+        admission = controller(service, {'jobs': 5}, store=store)
+        try:
+            admission.admit('us-central1', Usage(vcpus=10, ips=10, jobs=1), 'load-{}'.format(i))
+            admitted.append(i)
+        except AdmissionDeferred:
+            refused.append(i)
+    threads = [threading.Thread(target=launch, args=(i,)) for i in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(admitted) == 5
+    assert len(refused) == 25
+    assert sorted(store.reservations) == sorted('load-{}'.format(i) for i in admitted)
+
+
+def test_reservation_is_counted_once_and_ends_when_released_or_expired():
+    now = [1000.0]
+    service = FakeDataflow()
+    store = MemoryReservationStore()
+    admission = controller(service, {'jobs': 1}, store=store, clock=lambda: now[0])
+    demand = Usage(vcpus=10, ips=10, jobs=1)
+
+    admission.admit('us-central1', demand, 'load-a')
+    with pytest.raises(AdmissionDeferred):
+        admission.admit('us-central1', demand, 'load-b')
+    # Once listed, the job is counted as active instead of reserved; the
+    # reservation stays for workers whose listing is older
+    service.active = [{'id': 'a', 'name': 'load-a'}]
+    with pytest.raises(AdmissionDeferred):
+        admission.admit('us-central1', demand, 'load-b')
+    assert 'load-a' in store.reservations
+    service.active = []
+    admission.release('load-a')
+    admission.admit('us-central1', demand, 'load-b')
+    admission.release('load-b')
+    admission.admit('us-central1', demand, 'load-c')
+    # A worker that died without releasing holds the headroom until the ttl
+    now[0] += admission.reservation_ttl
+    admission.admit('us-central1', demand, 'load-d')
+
+
+def test_reservations_are_per_region():
+    store = MemoryReservationStore()
+    admission = controller(FakeDataflow(), {'jobs': 1}, store=store)
+    admission.admit('us-central1', Usage(10, 10, 1), 'load-a')
+    admission.admit('us-east1', Usage(10, 10, 1), 'load-b')
+
+
+def test_no_quotas_admits_without_reserving():
+    store = MemoryReservationStore()
+    admission = controller(FakeDataflow(), {}, store=store)
+    for i in range(3):
+        admission.admit('us-central1', Usage(10, 10, 1), 'load-{}'.format(i))
+    assert store.reservations == {}
+
+
+def test_deferred_launch_reschedules_the_task_until_the_timeout(monkeypatch):
+    pytest.importorskip('airflow')
+    from airflow.exceptions import AirflowRescheduleException
+    from airflow.models import TaskReschedule
+    from airflow.utils import timezone
+
+    def execute(operator, context):
+        raise AdmissionDeferred('No Dataflow headroom in us-central1', 60)
+    first = []
+    monkeypatch.setattr(TaskReschedule, 'find_for_task_instance', staticmethod(lambda ti: first))
+    wrapped = reschedule_on_deferral(execute, timeout=3600)
+    with pytest.raises(AirflowRescheduleException) as raised:
+        wrapped(None, {'ti': None})
+    assert 50 < (raised.value.reschedule_date - timezone.utcnow()).total_seconds() <= 60
+    # The try's first run started two hours ago
+    first.append(collections.namedtuple('Reschedule', 'start_date')(timezone.utcnow() - datetime.timedelta(hours=2)))
+    with pytest.raises(AdmissionTimeout, match='Gave up after waiting 120 minutes'):
+        wrapped(None, {'ti': None})
@@ -0,0 +1,98 @@
+"""Arrow batching: type fallbacks, dictionary encoding, native driver batches, Parquet."""
+import datetime
+import decimal
+import sqlite3
+
+import pytest
+
+pyarrow = pytest.importorskip('pyarrow')
+
+from ace_hr.arrowbatch import column_array, fetch_record_batches, write_parquet  # noqa: E402
+
+SCHEMA = [('COMPANY', 'STRING'), ('PAY_END_DT', 'DATE'), ('PAGE_NUM', 'INT64'),
+          ('OTH_EARNS', 'NUMERIC'), ('EMPLID', 'STRING')]
+
+
+def test_strings_from_the_driver_are_cast_to_decimal_and_date():
+    assert column_array(['1234.56', None, '7'], pyarrow.decimal128(38, 9)).to_pylist() == [
+        decimal.Decimal('1234.560000000'), None, decimal.Decimal('7.000000000')]
+    assert column_array(['2020-01-17', None], pyarrow.date32()).to_pylist() == [datetime.date(2020, 1, 17), None]
+    assert column_array([1.5, 2], pyarrow.decimal128(38, 9)).to_pylist() == [
+        decimal.Decimal('1.500000000'), decimal.Decimal('2.000000000')]
+
+
+def test_unconvertible_values_still_fail():
+    with pytest.raises((pyarrow.ArrowInvalid, pyarrow.ArrowTypeError)):
+        column_array(['not a date'], pyarrow.date32())
+
+
+def source(rows):
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE earnings (COMPANY TEXT, PAY_END_DT TEXT, PAGE_NUM INTEGER, '
+                       'OTH_EARNS TEXT, EMPLID TEXT)')
+    connection.executemany('INSERT INTO earnings VALUES (?, ?, ?, ?, ?)', rows)
+    return connection
+
+
+def test_fetchmany_batches_keep_one_schema():
+    rows = [('C{}'.format(i % 2), '2020-01-17', i, '{}.25'.format(i), '{:08d}'.format(i)) for i in range(10)]
+    batches = list(fetch_record_batches(source(rows), 'SELECT * FROM earnings', SCHEMA, batch_rows=4))
+    assert [batch.num_rows for batch in batches] == [4, 4, 2]
+    assert len(set(batch.schema for batch in batches)) == 1
+    assert pyarrow.types.is_dictionary(batches[0].schema.field('COMPANY').type)
+    assert not pyarrow.types.is_dictionary(batches[0].schema.field('EMPLID').type)
+    table = pyarrow.Table.from_batches(batches)
+    assert table.column('OTH_EARNS').to_pylist()[3] == decimal.Decimal('3.25')
+    assert table.column('PAY_END_DT').to_pylist()[0] == datetime.date(2020, 1, 17)
+
+
+def test_empty_result_gives_no_batches():
+    assert list(fetch_record_batches(source([]), 'SELECT * FROM earnings', SCHEMA)) == []
+
+
+class ArrowCursor(object):
+    """A cursor with turbodbc's fetcharrowbatches, returning the given batches."""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def execute(self, query):
+        pass
+
+    def fetcharrowbatches(self):
+        return iter(self.batches)
+
+    def close(self):
+        pass
+
+
+class ArrowConnection(object):
+    def __init__(self, batches):
+        self.batches = batches
+
+    def cursor(self):
+        return ArrowCursor(self.batches)
+
+
+def test_native_batches_are_cast_and_empty_ones_skipped():
+    native = pyarrow.schema([('COMPANY', pyarrow.string()), ('PAY_END_DT', pyarrow.string()),
+                             ('PAGE_NUM', pyarrow.int32()), ('OTH_EARNS', pyarrow.string()),
+                             ('EMPLID', pyarrow.string())])
+    empty = pyarrow.RecordBatch.from_pylist([], schema=native)
+    full = pyarrow.RecordBatch.from_pylist(
+        [{'COMPANY': 'C01', 'PAY_END_DT': '2020-01-17', 'PAGE_NUM': 1, 'OTH_EARNS': '10.5', 'EMPLID': 'E1'}],
+        schema=native)
+    batches = list(fetch_record_batches(ArrowConnection([empty, full, empty]), 'SELECT 1', SCHEMA))
+    assert [batch.num_rows for batch in batches] == [1]
+    assert batches[0].schema.field('PAGE_NUM').type == pyarrow.int64()
+    assert batches[0].column(3).to_pylist() == [decimal.Decimal('10.500000000')]
+    assert list(fetch_record_batches(ArrowConnection([empty]), 'SELECT 1', SCHEMA)) == []
+
+
+def test_parquet_holds_every_row(tmp_path):
+    import pyarrow.parquet
+    rows = [('C01', '2020-01-17', i, '1.00', str(i)) for i in range(7)]
+    path = str(tmp_path / 'earnings.parquet')
+    assert write_parquet(fetch_record_batches(source(rows), 'SELECT * FROM earnings', SCHEMA, batch_rows=3),
+                         path) == 7
+    assert pyarrow.parquet.read_table(path).num_rows == 7
@@ -0,0 +1,74 @@
+"""Quarter chunks of a pay backfill, its resume from the manifest and the SQL per quarter."""
+import datetime
+
+import pytest
+
+from ace_hr.backfill import PayBackfill, quarter_chunks
+
+JDBC_PARAMETERS = {'driverClassName': 'com.microsoft.sqlserver.jdbc.SQLServerDriver'}
+
+
+class RecordingBackfill(PayBackfill):
+    """Records the BigQuery statements and Dataflow launches; failing quarters raise on launch."""
+
+    def __init__(self, name, failing=()):
+        super(RecordingBackfill, self).__init__(name, {'project': 'amed-dev-analyticsplatform'},
+                                                'gs://templates/jdbc-to-bigquery', JDBC_PARAMETERS)
+        self.failing = set(failing)
+        self.statements = []
+        self.launches = []
+
+    def _run(self, sql):
+        self.statements.append(sql)
+
+    def _launch(self, job_name, parameters):
+        if job_name.rsplit('_', 1)[1] in self.failing:
+            raise RuntimeError('Dataflow job {} failed'.format(job_name))
+        self.launches.append((job_name, parameters))
+
+
+def test_quarter_chunks_cut_the_range_at_calendar_quarters():
+    chunks = quarter_chunks('2019-11-15', datetime.date(2020, 5, 1))
+    assert [(c.chunk_id, c.lower, c.upper) for c in chunks] == [
+        ('2019q4', '2019-11-15', '2020-01-01'),
+        ('2020q1', '2020-01-01', '2020-04-01'),
+        ('2020q2', '2020-04-01', '2020-05-01'),
+    ]
+    assert all(c.column == 'PAY_END_DT' and not c.is_null for c in chunks)
+    assert quarter_chunks('2020-01-01', '2020-01-01') == []
+
+
+def test_each_quarter_is_staged_and_merged_within_its_window():
+    backfill = RecordingBackfill('earnings')
+    [chunk] = quarter_chunks('2019-10-01', '2020-01-01')
+    backfill.load_chunk(chunk)
+    staging = 'HRPRD_SC.dbo_PS_PAY_EARNINGS_BACKFILL_2019Q4'
+    create, merge, drop = backfill.statements
+    assert create == 'CREATE OR REPLACE TABLE {} LIKE HRPRD_SC.dbo_PS_PAY_EARNINGS_STAGING'.format(staging)
+    assert merge.startswith('MERGE HRPRD_SC.dbo_PS_PAY_EARNINGS T\nUSING ' + staging)
+    window = "T.PAY_END_DT >= '2019-10-01' AND T.PAY_END_DT < '2020-01-01'"
+    assert 'ON {} AND T.ROW_HASH = S.ROW_HASH'.format(window) in merge
+    assert 'WHEN NOT MATCHED BY SOURCE AND {} THEN'.format(window) in merge
+    assert drop == 'DROP TABLE IF EXISTS ' + staging
+    [(job_name, parameters)] = backfill.launches
+    assert job_name == 'backfill_pay_earnings_2019q4'
+    assert parameters['outputTable'] == 'amed-dev-analyticsplatform:' + staging
+    assert parameters['query'].endswith("WHERE PAY_END_DT >= '2019-10-01' AND PAY_END_DT < '2020-01-01'")
+    assert parameters['driverClassName'] == JDBC_PARAMETERS['driverClassName']
+
+
+def test_a_second_run_resumes_with_the_quarters_that_did_not_land(tmp_path):
+    location = str(tmp_path / 'checkpoints')
+    first = RecordingBackfill('check', failing=['2019q3'])
+    with pytest.raises(RuntimeError, match='2019q3'):
+        first.run('2019-01-01', '2020-01-01', location, max_parallel=2)
+    # The watermark is only rebuilt once every quarter has landed
+    assert not any(sql.startswith('CREATE OR REPLACE TABLE HRPRD_SC.dbo_PS_PAY_CHECK_MAX')
+                   for sql in first.statements)
+    second = RecordingBackfill('check')
+    loaded, skipped = second.run('2019-01-01', '2020-01-01', location, max_parallel=2)
+    assert (loaded, sorted(skipped)) == (['2019q3'], ['2019q1', '2019q2', '2019q4'])
+    assert [job_name for job_name, _ in second.launches] == ['backfill_pay_check_2019q3']
+    assert second.statements[-1] == (
+        "CREATE OR REPLACE TABLE HRPRD_SC.dbo_PS_PAY_CHECK_MAX AS SELECT CAST(COALESCE(MAX(PAY_END_DT),"
+        "'1901-01-01') AS DATE) `PAY_END_DT` FROM HRPRD_SC.dbo_PS_PAY_CHECK;")
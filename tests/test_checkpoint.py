@@ -0,0 +1,125 @@
+"""Chunked loads against SQLite, with failures injected mid-run."""
+import sqlite3
+
+import pytest
+
+from ace_hr.checkpoint import LANDED, STARTED, CheckpointManifest, LocalManifestStore, chunk_predicate, \
+    chunk_query, manifest_key, range_chunks, run_chunks
+
+BOUNDS = ['2015-01-01', '2020-01-01']
+QUERY = 'SELECT EMPLID, EFFDT FROM PS_JOB'
+
+
+class ChunkLoader(object):
+    """Copies chunks of PS_JOB into JOB_TARGET row by row, failing where told to."""
+
+    def __init__(self, db, fail_after=None):
+        self.db = db
+        # chunk_id -> rows to insert before raising
+        self.fail_after = dict(fail_after or {})
+        self.loaded = []
+
+    def load(self, chunk):
+        rows = self.db.execute(chunk_query(QUERY, chunk)).fetchall()
+        for i, row in enumerate(rows):
+            if self.fail_after.get(chunk.chunk_id) == i:
+                del self.fail_after[chunk.chunk_id]
+                self.db.commit()
+                raise IOError('Connection reset while loading ' + chunk.chunk_id)
+            self.db.execute('INSERT INTO JOB_TARGET VALUES (?, ?)', row)
+        self.db.commit()
+        self.loaded.append(chunk.chunk_id)
+
+    def clear(self, chunk):
+        self.db.execute('DELETE FROM JOB_TARGET WHERE ' + chunk_predicate(chunk))
+        self.db.commit()
+
+
+@pytest.fixture
+def db():
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE PS_JOB (EMPLID TEXT, EFFDT TEXT)')
+    db.execute('CREATE TABLE JOB_TARGET (EMPLID TEXT, EFFDT TEXT)')
+    rows = [('E{:04d}'.format(i), '{}-06-01'.format(2008 + i % 16)) for i in range(200)]
+    rows += [('N{:04d}'.format(i), None) for i in range(5)]
+    db.executemany('INSERT INTO PS_JOB VALUES (?, ?)', rows)
+    return db
+
+
+def target(db):
+    return sorted(db.execute('SELECT EMPLID, EFFDT FROM JOB_TARGET').fetchall(), key=repr)
+
+
+def source(db):
+    return sorted(db.execute('SELECT EMPLID, EFFDT FROM PS_JOB').fetchall(), key=repr)
+
+
+def test_chunks_cover_every_row_once(db):
+    chunks = range_chunks('EFFDT', BOUNDS)
+    counts = [db.execute('SELECT COUNT(*) FROM PS_JOB WHERE ' + chunk_predicate(c)).fetchone()[0]
+              for c in chunks]
+    assert sum(counts) == 205 and all(counts)
+
+
+def test_chunk_query_keeps_the_whole_where_clause(db):
+    query = ("SELECT EMPLID, EFFDT FROM PS_JOB WHERE EMPLID LIKE 'E%' OR EFFDT IS NULL "
+             "ORDER BY EMPLID;")
+    chunk = range_chunks('EFFDT', BOUNDS)[0]
+    expected = db.execute("SELECT EMPLID, EFFDT FROM PS_JOB WHERE EMPLID LIKE 'E%' AND EFFDT < '2015-01-01'")
+    assert sorted(db.execute(chunk_query(query, chunk)).fetchall()) == sorted(expected.fetchall())
+    subquery = ('SELECT EMPLID, EFFDT FROM PS_JOB j WHERE EFFDT = '
+                '(SELECT MAX(EFFDT) FROM PS_JOB m WHERE m.EMPLID = j.EMPLID)')
+    assert len(db.execute(chunk_query(subquery, chunk)).fetchall()) == 91
+
+
+def test_retry_after_mid_chunk_failures_resumes_without_duplicates(db, tmp_path):
+    store = LocalManifestStore(str(tmp_path))
+    key = manifest_key('ACE_HR_sources_peoplesoft', '20261018T220600', 'peoplesoft_dbo_ps_job_etl')
+    chunks = range_chunks('EFFDT', BOUNDS)
+    loader = ChunkLoader(db, fail_after={'c01': 20, 'null': 2})
+    with pytest.raises(IOError):
+        run_chunks(chunks, CheckpointManifest(store, key), loader.load, loader.clear)
+    manifest = CheckpointManifest(store, key)
+    assert [manifest.state(c.chunk_id) for c in chunks] == [LANDED, STARTED, LANDED, STARTED]
+    # The partial rows of the failed chunks are in the target
+    assert len(target(db)) > len(loader.loaded) and len(target(db)) < 205
+
+    retry = ChunkLoader(db)
+    loaded, skipped = run_chunks(chunks, manifest, retry.load, retry.clear)
+    assert loaded == ['c01', 'null'] and skipped == ['c00', 'c02']
+    assert target(db) == source(db)
+
+
+def test_parallel_failures_do_not_lose_other_chunks(tmp_path):
+    store = LocalManifestStore(str(tmp_path))
+    chunks = range_chunks('EFFDT', BOUNDS)
+
+    def load(chunk):
+        if chunk.chunk_id == 'c02':
+            raise IOError('Connection reset while loading c02')
+    with pytest.raises(IOError):
+        run_chunks(chunks, CheckpointManifest(store, 'k'), load, max_parallel=4)
+    manifest = CheckpointManifest(store, 'k')
+    assert [c.chunk_id for c in chunks if manifest.state(c.chunk_id) == LANDED] == ['c00', 'c01', 'null']
+
+
+def test_rerun_after_truncate_starts_a_fresh_manifest(db, tmp_path):
+    store = LocalManifestStore(str(tmp_path))
+    chunks = range_chunks('EFFDT', BOUNDS)
+    first = manifest_key('ACE_HR_sources_peoplesoft', '20261018T220600', 'peoplesoft_dbo_ps_job_etl',
+                         'peoplesoft_dbo_ps_job_truncate', 1)
+    run_chunks(chunks, CheckpointManifest(store, first), ChunkLoader(db).load)
+    assert target(db) == source(db)
+
+    # The run is cleared: the truncate runs again, on its next try
+    db.execute('DELETE FROM JOB_TARGET')
+    rerun = manifest_key('ACE_HR_sources_peoplesoft', '20261018T220600', 'peoplesoft_dbo_ps_job_etl',
+                         'peoplesoft_dbo_ps_job_truncate', 2)
+    assert rerun != first
+    loaded, skipped = run_chunks(chunks, CheckpointManifest(store, rerun), ChunkLoader(db).load)
+    assert skipped == [] and len(loaded) == len(chunks)
+    assert target(db) == source(db)
+
+    # A retry of the load alone keeps the key, and skips what landed
+    loaded, skipped = run_chunks(chunks, CheckpointManifest(store, rerun), ChunkLoader(db).load)
+    assert loaded == [] and len(skipped) == len(chunks)
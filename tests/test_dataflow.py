@@ -0,0 +1,168 @@
+"""TemplateLauncher against a fake Dataflow API: reattach, zone failover, error messages."""
+import pytest
+
+from ace_hr.dataflow import MemoryZoneStore, TemplateLauncher, VariableZoneStore, is_capacity_error
+
+STOCKOUT = ('<HttpError 429 when requesting .../templates:launch returned "The zone '
+            'us-central1-a does not have enough resources available to fulfill the request. '
+            'ZONE_RESOURCE_POOL_EXHAUSTED">')
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, num_retries=0):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeDataflow(object):
+    """The projects.locations.{jobs,templates} calls the launcher makes.
+
+    outcomes maps a zone to the error its launch raises; active holds
+    (region, job) pairs reported by jobs.list, newest first, in any state.
+    """
+
+    def __init__(self, outcomes=None, active=(), messages=()):
+        self.outcomes = dict(outcomes or {})
+        self.active = list(active)
+        self.job_messages = list(messages)
+        self.launches = []
+
+    def projects(self):
+        return self
+
+    def locations(self):
+        return self
+
+    def jobs(self):
+        return self
+
+    def templates(self):
+        return self
+
+    def list(self, projectId, location, filter=None, **kwargs):
+        assert filter == 'ALL'
+        return Request({'jobs': [job for region, job in self.active if region == location]})
+
+    def list_next(self, previous_request, previous_response):
+        return None
+
+    def messages(self):
+        return Messages(self.job_messages)
+
+    def launch(self, projectId, location, gcsPath, body):
+        zone = body['environment'].get('zone')
+        self.launches.append((location, zone, body))
+        if zone in self.outcomes:
+            return Request(self.outcomes[zone])
+        return Request({'job': {'id': 'job-{}'.format(len(self.launches)), 'name': body['jobName']}})
+
+
+class Messages(object):
+    def __init__(self, messages):
+        self.messages = messages
+
+    def list(self, **kwargs):
+        return Request({'jobMessages': [{'messageText': text} for text in self.messages]})
+
+
+def launcher(service, zones, wait=None, store=None):
+    waited = []
+
+    def _wait(job_id, region):
+        waited.append((job_id, region))
+        if wait is not None:
+            wait(job_id, region)
+    result = TemplateLauncher(service, 'amed-dev-analyticsplatform', 'us-central1', zones, _wait,
+                              zone_store=store or MemoryZoneStore())
+    return result, waited
+
+
+ZONES = ['us-central1-a', 'us-central1-b', 'us-east1-b']
+ENVIRONMENT = {'subnetwork': 'regions/us-central1/subnetworks/amed-us-central1', 'maxWorkers': 10}
+
+
+def test_fails_over_on_stockout_and_remembers_the_zone():
+    service = FakeDataflow(outcomes={'us-central1-a': Exception(STOCKOUT)})
+    store = MemoryZoneStore()
+    dataflow, waited = launcher(service, ZONES, store=store)
+    response = dataflow.launch('load-20261018t220600', {}, ENVIRONMENT, 'gs://t', scope='20261018t220600')
+    assert [zone for _, zone, _ in service.launches] == ['us-central1-a', 'us-central1-b']
+    assert waited == [(response['job']['id'], 'us-central1')]
+    assert store.get('20261018t220600') == 'us-central1-b'
+
+    # The next launch of the run starts in the zone that worked
+    dataflow.launch('other-20261018t220600', {}, ENVIRONMENT, 'gs://t', scope='20261018t220600')
+    assert service.launches[-1][1] == 'us-central1-b'
+    # A new run starts again from the configured order
+    service.outcomes.clear()
+    dataflow.launch('load-20261019t220600', {}, ENVIRONMENT, 'gs://t', scope='20261019t220600')
+    assert service.launches[-1][1] == 'us-central1-a'
+
+
+def test_fails_over_to_another_region_with_its_subnetwork():
+    service = FakeDataflow(outcomes={'us-central1-a': Exception(STOCKOUT), 'us-central1-b': Exception(STOCKOUT)})
+    dataflow, _ = launcher(service, ZONES)
+    dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x')
+    region, zone, body = service.launches[-1]
+    assert (region, zone) == ('us-east1', 'us-east1-b')
+    assert body['environment']['subnetwork'] == 'regions/us-east1/subnetworks/amed-us-east1'
+
+
+def test_non_capacity_errors_do_not_fail_over():
+    service = FakeDataflow(outcomes={'us-central1-a': Exception('Invalid column name EFFDT')})
+    dataflow, _ = launcher(service, ZONES)
+    with pytest.raises(Exception, match='Invalid column name'):
+        dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x')
+    assert len(service.launches) == 1
+
+
+def test_last_zone_stockout_raises():
+    service = FakeDataflow(outcomes=dict((zone, Exception(STOCKOUT)) for zone in ZONES))
+    dataflow, _ = launcher(service, ZONES)
+    with pytest.raises(Exception) as raised:
+        dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x')
+    assert is_capacity_error(raised.value) and len(service.launches) == 3
+
+
+def test_reattaches_to_an_active_job_instead_of_launching():
+    job = {'id': 'job-running', 'name': 'load-x', 'currentState': 'JOB_STATE_RUNNING'}
+    service = FakeDataflow(active=[('us-east1', job)])
+    dataflow, waited = launcher(service, ZONES)
+    assert dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x') == {'job': job}
+    assert service.launches == [] and waited == [('job-running', 'us-east1')]
+
+
+def test_a_finished_job_is_not_relaunched():
+    job = {'id': 'job-done', 'name': 'load-x', 'currentState': 'JOB_STATE_DONE'}
+    service = FakeDataflow(active=[('us-central1', job)])
+    dataflow, waited = launcher(service, ZONES)
+    assert dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x') == {'job': job}
+    assert service.launches == [] and waited == []
+
+
+@pytest.mark.parametrize('state', ['JOB_STATE_FAILED', 'JOB_STATE_CANCELLED'])
+def test_a_failed_or_cancelled_job_is_relaunched(state):
+    job = {'id': 'job-old', 'name': 'load-x', 'currentState': state}
+    other = {'id': 'job-other', 'name': 'load-y', 'currentState': 'JOB_STATE_DONE'}
+    service = FakeDataflow(active=[('us-central1', other), ('us-central1', job)])
+    dataflow, waited = launcher(service, ZONES)
+    response = dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x')
+    assert len(service.launches) == 1 and waited == [(response['job']['id'], 'us-central1')]
+
+
+def test_failed_job_raises_with_its_error_messages():
+    def wait(job_id, region):
+        raise Exception('DataFlow job load-x failed')
+    service = FakeDataflow(messages=['Login failed for user svc_gcp_etl'])
+    dataflow, _ = launcher(service, ZONES, wait=wait)
+    with pytest.raises(Exception, match='Login failed for user'):
+        dataflow.launch('load-x', {}, ENVIRONMENT, 'gs://t', scope='x')
+
+
+def test_zone_variables_are_kept_per_dag():
+    assert VariableZoneStore('ACE_HR_sources_hchb').key != VariableZoneStore('ACE_HR_sources_agency').key
+    assert VariableZoneStore().key == 'dataflow_last_good_zone'
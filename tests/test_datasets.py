@@ -0,0 +1,84 @@
+"""The cross-DAG wait_for sensors and the DATASETS map of their producers."""
+import datetime
+import os
+
+import pytest
+
+pytest.importorskip('airflow')
+
+from airflow.exceptions import AirflowException  # noqa: E402
+from airflow.models import DAG  # noqa: E402
+
+from ace_hr.datasets import DATASETS, FAILED_STATES, wait_for  # noqa: E402
+from ace_hr.quality import primary_key, quality_task_id  # noqa: E402
+
+DAGS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+EXECUTION_DATE = datetime.datetime(2020, 1, 16, 22, 6)
+
+
+class FakeQuery(object):
+    def __init__(self, count):
+        self.n = count
+
+    def filter(self, *criteria):
+        return self
+
+    def scalar(self):
+        return self.n
+
+
+class FakeSession(object):
+    """Answers the failed-states count, then the allowed-states count."""
+
+    def __init__(self, *counts):
+        self.counts = list(counts)
+
+    def query(self, *entities):
+        return FakeQuery(self.counts.pop(0))
+
+    def commit(self):
+        pass
+
+
+def dag():
+    return DAG('ACE_HR_employee', start_date=datetime.datetime(2020, 1, 1), schedule_interval=None)
+
+
+def test_wait_for_creates_one_sensor_per_dataset():
+    employee = dag()
+    sensor = wait_for(employee, 'HRPRD_SC.dbo_PS_JOB')
+    assert wait_for(employee, 'HRPRD_SC.dbo_PS_JOB') is sensor
+    assert (sensor.external_dag_id, sensor.external_task_id) == DATASETS['HRPRD_SC.dbo_PS_JOB']
+    assert sensor.mode == 'reschedule' and sensor.failed_states == FAILED_STATES
+    assert sensor.dataset == 'HRPRD_SC.dbo_PS_JOB'
+    with pytest.raises(ValueError):
+        wait_for(employee, 'ETLConfigACE.LoadDimEmployee')
+
+
+def test_the_sensor_fails_once_the_producer_has_failed():
+    sensor = wait_for(dag(), 'HRPRD_SC.dbo_PS_JOB')
+    context = {'execution_date': EXECUTION_DATE}
+    assert sensor.poke(context, session=FakeSession(0, 0)) is False
+    assert sensor.poke(context, session=FakeSession(0, 1)) is True
+    with pytest.raises(AirflowException, match='peoplesoft_dbo_ps_job_quality failed'):
+        sensor.poke(context, session=FakeSession(1))
+
+
+def test_every_dataset_is_produced_in_its_dag_file():
+    for dataset, (dag_id, task_id) in DATASETS.items():
+        with open(os.path.join(DAGS_FOLDER, dag_id + '.py')) as f:
+            source = f.read()
+        schema, name = dataset.split('.')
+        if schema == 'ETLConfigACE':
+            assert task_id == name.lower()
+        elif '_PAY_' in name:
+            # The pay merges are built by ace_hr.payincrement.pay_increment
+            assert task_id.endswith(name.lower() + '_merge')
+            continue
+        else:
+            load_task_id = task_id.replace('_quality', '_etl')
+            assert load_task_id.endswith(name.lower() + '_etl')
+            # The quality checks are added after their load by finish_dag
+            assert task_id == (quality_task_id(load_task_id) if primary_key(dataset) else load_task_id)
+            task_id = load_task_id
+        assert '"{}"'.format(task_id) in source, dataset
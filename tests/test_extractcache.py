@@ -0,0 +1,107 @@
+"""Only whole-table extracts are cached; chunk queries always extract. The registry is created once."""
+import pytest
+
+from ace_hr.checkpoint import chunk_query, range_chunks
+from ace_hr.extractcache import REGISTRY_SCHEMA, ExtractCache
+
+JOB = 'SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB'
+URL = 'jdbc:sqlserver://prod09:1433;databaseName=AceIntegrationPROD09_GCP;user=etl;password=secret'
+
+
+class UnusedService(object):
+    """A BigQuery service any call to which fails the test."""
+
+    def __getattr__(self, name):
+        raise AssertionError('BigQuery was called: ' + name)
+
+
+def parameters(query):
+    return {'query': query, 'connectionURL': URL,
+            'outputTable': 'amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOB'}
+
+
+def test_whole_table_extracts_of_shared_tables_are_cacheable():
+    cache = ExtractCache(UnusedService(), 'amed-dev-analyticsplatform')
+    assert cache.cacheable(parameters(JOB))
+    assert cache.cacheable(parameters('  select *  from AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB; '))
+    assert not cache.cacheable(parameters(JOB.replace('dbo_PS_JOB', 'dbo_PS_JOBCODE_TBL')))
+    assert not cache.cacheable(dict(parameters(JOB), outputTable=''))
+
+
+def test_predicated_and_chunk_queries_are_never_cached():
+    cache = ExtractCache(UnusedService(), 'amed-dev-analyticsplatform')
+    assert not cache.cacheable(parameters(JOB + " WHERE EFFDT >= '2020-01-01'"))
+    assert not cache.cacheable(parameters('SELECT EMPLID FROM AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB'))
+    for chunk in range_chunks('EFFDT', ['2015-01-01', '2020-01-01']):
+        chunk_parameters = parameters(chunk_query(JOB, chunk))
+        assert not cache.cacheable(chunk_parameters)
+        # Neither looked up nor registered, so BigQuery is never called
+        assert cache.reuse(chunk_parameters, 'peoplesoft-dbo-ps-job-' + chunk.chunk_id) is None
+        cache.record(chunk_parameters, 'peoplesoft-dbo-ps-job-' + chunk.chunk_id)
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, num_retries=0):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeTables(object):
+    """tables() of a project holding at most the registry table, recording each call."""
+
+    def __init__(self, resource=None):
+        self.resource = resource
+        self.calls = []
+
+    def tables(self):
+        return self
+
+    def get(self, **reference):
+        from googleapiclient.errors import HttpError
+        import httplib2
+        self.calls.append('get')
+        return Request(self.resource or HttpError(httplib2.Response({'status': 404}), b'Not found'))
+
+    def insert(self, projectId, datasetId, body):
+        self.calls.append('insert')
+        self.resource = dict(body)
+        return Request(body)
+
+    def patch(self, projectId, datasetId, tableId, body):
+        self.calls.append(('patch', sorted(body)))
+        self.resource = dict(self.resource, **body)
+        return Request(self.resource)
+
+
+def registry(retention_days=7):
+    return {'schema': {'fields': list(REGISTRY_SCHEMA)},
+            'timePartitioning': {'type': 'DAY', 'field': 'landed_at',
+                                 'expirationMs': str(retention_days * 24 * 3600 * 1000)}}
+
+
+def test_a_missing_registry_is_created_once():
+    pytest.importorskip('googleapiclient')
+    service = FakeTables()
+    cache = ExtractCache(service, 'amed-dev-analyticsplatform')
+    cache._ensure_registry()
+    cache._ensure_registry()
+    assert service.calls == ['get', 'insert']
+    assert service.resource['timePartitioning']['expirationMs'] == str(7 * 24 * 3600 * 1000)
+    # Later tasks find it as configured and leave it alone
+    ExtractCache(service, 'amed-dev-analyticsplatform')._ensure_registry()
+    assert service.calls == ['get', 'insert', 'get']
+
+
+def test_the_registry_is_patched_only_where_it_differs():
+    pytest.importorskip('googleapiclient')
+    service = FakeTables(registry(retention_days=7))
+    ExtractCache(service, 'amed-dev-analyticsplatform', retention_days=14)._ensure_registry()
+    assert service.calls == ['get', ('patch', ['timePartitioning'])]
+    service = FakeTables(dict(registry(), schema={'fields': REGISTRY_SCHEMA[:-1]}))
+    ExtractCache(service, 'amed-dev-analyticsplatform')._ensure_registry()
+    assert service.calls == ['get', ('patch', ['schema'])]
+    assert service.resource['schema']['fields'] == REGISTRY_SCHEMA
@@ -0,0 +1,21 @@
+"""Fan-out targets: renamed datasets, extra tables, and transient staging tables left out."""
+from ace_hr.fanout import fan_out, fanout_targets
+
+PROJECT = 'amed-dev-analyticsplatform'
+CONFIG = {'projects': ['amed-qa-analyticsplatform'],
+          'datasets': {'HRPRD_SC': 'HRPRD_SC_QA'},
+          'tables': {'HRPRD_SC.dbo_PS_JOB': ['amed-sandbox:hr.dbo_PS_JOB', PROJECT + ':HRPRD_SC.dbo_PS_JOB']}}
+
+
+def test_targets_follow_the_configuration():
+    assert fanout_targets(PROJECT + ':HRPRD_SC.dbo_PS_JOB', CONFIG, PROJECT) == [
+        'amed-qa-analyticsplatform:HRPRD_SC_QA.dbo_PS_JOB', 'amed-sandbox:hr.dbo_PS_JOB']
+    assert fanout_targets('HRPRD_SC.dbo_PS_PAY_CHECK_STAGING', CONFIG, PROJECT) == [
+        'amed-qa-analyticsplatform:HRPRD_SC_QA.dbo_PS_PAY_CHECK_STAGING']
+
+
+def test_intraday_and_backfill_staging_tables_are_not_copied():
+    assert fanout_targets(PROJECT + ':HRPRD_SC.dbo_PS_PAY_CHECK_STAGING_INTRADAY', CONFIG, PROJECT) == []
+    assert fanout_targets(PROJECT + ':HRPRD_SC.dbo_PS_PAY_CHECK_BACKFILL_2019Q3', CONFIG, PROJECT) == []
+    # Nothing to copy, so the service is never used
+    assert fan_out(None, PROJECT, PROJECT + ':HRPRD_SC.dbo_PS_PAY_TAX_STAGING_INTRADAY', config=CONFIG) == []
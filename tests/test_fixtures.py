@@ -0,0 +1,71 @@
+"""Fixture generation for the local run: source tables, seeded rows, stand-in procedures."""
+import collections
+import sqlite3
+
+from ace_hr.fixtures import procedure_inputs, source_tables, stand_in_sql, write_source_fixtures, \
+    write_stand_ins
+from ace_hr.local import LocalWarehouse
+
+Dag = collections.namedtuple('Dag', 'dag_id tasks')
+PAY_KEYS = {'check': ['COMPANY', 'PAYGROUP', 'PAY_END_DT', 'OFF_CYCLE', 'PAGE_NUM', 'LINE_NUM', 'SEPCHK']}
+
+
+class Task(object):
+    def __init__(self, task_id, upstream=(), **attributes):
+        self.task_id = task_id
+        self.upstream_list = list(upstream)
+        self.__dict__.update(attributes)
+
+
+def extract(table, where=None, **attributes):
+    query = 'SELECT * FROM AceIntegrationPROD09_GCP.PeopleSoft.' + table + (' WHERE ' + where if where else '')
+    return Task(table.lower() + '_etl', parameters={
+        'query': query, 'outputTable': 'amed-dev-analyticsplatform:HRPRD_SC.' + table}, **attributes)
+
+
+def dags():
+    job = extract('dbo_PS_JOB', chunk_column='EFFDT')
+    pay = extract('dbo_PS_PAY_CHECK', "PAY_END_DT >= {{ ti.xcom_pull(task_ids='process_ps_pay_check_max') }}")
+    sensor = Task('wait_for_hrprd_sc_dbo_ps_dept_tbl', dataset='HRPRD_SC.dbo_PS_DEPT_TBL')
+    procedure = Task('loaddimemployee', [job, sensor, Task('wait_for_x', dataset='ETLConfigACE.LoadDimMonth')],
+                     sql='CALL `amed-dev-analyticsplatform.ETLConfigACE.LoadDimEmployee`();')
+    group = Task('tax_dimensions', [pay], procedures=['ETLConfigACE.LoadDimTaxClass'])
+    return [Dag('ACE_HR_test', [job, pay, sensor, procedure, group])]
+
+
+def test_tables_get_the_columns_the_dags_rely_on():
+    tables = source_tables(dags(), PAY_KEYS)
+    pay = dict(tables[('AceIntegrationPROD09_GCP', 'PeopleSoft', 'dbo_PS_PAY_CHECK')])
+    assert pay['PAY_END_DT'] == 'TEXT' and pay['PAGE_NUM'] == 'INTEGER' and 'SEPCHK' in pay
+    assert 'task_ids' not in pay
+    assert 'EFFDT' in dict(tables[('AceIntegrationPROD09_GCP', 'PeopleSoft', 'dbo_PS_JOB')])
+
+
+def test_the_same_seed_writes_the_same_rows(tmp_path):
+    tables = source_tables(dags(), PAY_KEYS)
+    contents = []
+    for out in [tmp_path / 'a', tmp_path / 'b']:
+        [path] = write_source_fixtures(tables, str(out), rows=50, seed=7)
+        connection = sqlite3.connect(path)
+        contents.append(connection.execute('SELECT * FROM dbo_PS_PAY_CHECK ORDER BY PAGE_NUM').fetchall())
+        connection.close()
+    assert len(contents[0]) == 50 and contents[0] == contents[1]
+    # PAGE_NUM keeps the pay check keys unique
+    assert len(set(row[:11] for row in contents[0])) == 50
+
+
+def test_stand_ins_read_every_input_and_keep_ported_sql(tmp_path):
+    procedures = procedure_inputs(dags())
+    assert procedures == {'LoadDimEmployee': ['HRPRD_SC.dbo_PS_DEPT_TBL', 'HRPRD_SC.dbo_PS_JOB'],
+                          'LoadDimTaxClass': ['HRPRD_SC.dbo_PS_PAY_CHECK']}
+    (tmp_path / 'loaddimtaxclass.sql').write_text(u'SELECT 1;')
+    assert write_stand_ins(procedures, str(tmp_path)) == ['LoadDimEmployee']
+    warehouse = LocalWarehouse(str(tmp_path / 'warehouse'), engine='sqlite',
+                               datasets=['ETLConfigACE', 'HRPRD_SC'])
+    for table in ['dbo_PS_DEPT_TBL', 'dbo_PS_JOB']:
+        warehouse.create_table('HRPRD_SC.' + table, [('EMPLID', 'TEXT')])
+    warehouse.insert_rows('HRPRD_SC.dbo_PS_JOB', ['EMPLID'], [('1',), ('2',)])
+    for statement in warehouse.translate(stand_in_sql('LoadDimEmployee', procedures['LoadDimEmployee'])):
+        warehouse.execute(statement)
+    assert sorted(warehouse.execute('SELECT * FROM ETLConfigACE.LoadDimEmployee_local').fetchall()) == [
+        ('HRPRD_SC.dbo_PS_DEPT_TBL', 0), ('HRPRD_SC.dbo_PS_JOB', 2)]
@@ -0,0 +1,205 @@
+"""Layout migration of the pay targets, and the check of the procedures the merges replaced."""
+import re
+
+import pytest
+
+from ace_hr.layout import TABLE_LAYOUTS, check_replaced_procedures, compare_merge_sql, layout_statements, \
+    restore_metadata, table_metadata, uncovered_statements
+from ace_hr.rowhash import hash_merge_sql
+
+TABLE = 'HRPRD_SC.dbo_PS_PAY_CHECK'
+LAYOUT = TABLE_LAYOUTS[TABLE]
+FIELDS = [{'name': 'EMPLID', 'type': 'STRING'}, {'name': 'PAY_END_DT', 'type': 'DATE'},
+          {'name': 'ROW_HASH', 'type': 'STRING'}]
+
+
+class FakeBigQuery(object):
+    """Tables as name -> (resource, rows); runs the DDL the layout statements use.
+
+    fail_once holds statement prefixes that raise the first time they run.
+    """
+
+    def __init__(self, fail_once=()):
+        self.tables = {}
+        self.fail_once = list(fail_once)
+
+    def resource(self, table):
+        return self.tables[table][0] if table in self.tables else None
+
+    def run(self, statement):
+        for prefix in self.fail_once:
+            if statement.startswith(prefix):
+                self.fail_once.remove(prefix)
+                raise Exception('backendError: ' + statement)
+        match = re.match(r'CREATE (OR REPLACE TABLE|TABLE IF NOT EXISTS) (\S+) PARTITION BY \w+\((\w+), (\w+)\)'
+                         r'(?: CLUSTER BY ([\w, ]+))? AS SELECT \* FROM (\S+)( LIMIT 0)?$', statement)
+        if match:
+            kind, table, column, granularity, cluster, source, empty = match.groups()
+            if kind.startswith('TABLE IF') and table in self.tables:
+                return
+            if table in self.tables and self.tables[table][0].get('timePartitioning') != {
+                    'field': column, 'type': granularity}:
+                raise Exception('Cannot replace a table with a different partitioning spec')
+            resource = {'schema': self.tables[source][0]['schema'],
+                        'timePartitioning': {'field': column, 'type': granularity},
+                        'clustering': {'fields': cluster.split(', ')} if cluster else {}}
+            self.tables[table] = (resource, [] if empty else list(self.tables[source][1]))
+            return
+        match = re.match(r'DROP TABLE (\S+)$', statement)
+        if match:
+            del self.tables[match.group(1)]
+            return
+        match = re.match(r'ALTER TABLE (\S+) RENAME TO (\w+)$', statement)
+        if match:
+            self.tables[match.group(1).split('.')[0] + '.' + match.group(2)] = self.tables.pop(match.group(1))
+            return
+        assert statement.startswith('ALTER TABLE') and 'ADD COLUMN IF NOT EXISTS' in statement, statement
+
+    def apply(self, table=TABLE, layout=LAYOUT):
+        staging = self.resource(table + '_STAGING')
+        for statement in layout_statements(table, layout, self.resource(table),
+                                           self.resource(table + '__layout'), staging):
+            self.run(statement)
+
+
+def unpartitioned(rows):
+    return ({'schema': {'fields': FIELDS}}, rows)
+
+
+def test_new_target_is_created_from_staging():
+    bigquery = FakeBigQuery()
+    bigquery.tables[TABLE + '_STAGING'] = unpartitioned([('1', '2020-01-03', 'a')])
+    bigquery.apply()
+    resource, rows = bigquery.tables[TABLE]
+    assert resource['timePartitioning'] == {'field': 'PAY_END_DT', 'type': 'MONTH'}
+    assert rows == []
+
+
+@pytest.mark.parametrize('failing', ['CREATE OR REPLACE TABLE', 'DROP TABLE', 'ALTER TABLE ' + TABLE + '__layout'])
+def test_failed_migration_recovers_every_row_on_retry(failing):
+    rows = [('1', '2020-01-03', 'a'), ('2', '2020-02-07', 'b')]
+    bigquery = FakeBigQuery(fail_once=[failing])
+    bigquery.tables[TABLE] = unpartitioned(rows)
+    bigquery.tables[TABLE + '_STAGING'] = unpartitioned([])
+    with pytest.raises(Exception, match='backendError'):
+        bigquery.apply()
+    bigquery.apply()
+    resource, migrated = bigquery.tables[TABLE]
+    assert migrated == rows
+    assert resource['clustering'] == {'fields': ['EMPLID']}
+    assert TABLE + '__layout' not in bigquery.tables
+    # Nothing left to do on the next night
+    assert layout_statements(TABLE, LAYOUT, resource, None, None)[2:] == []
+
+
+def test_clustering_change_replaces_the_table_in_one_statement():
+    rows = [('1', '2020-01-03', 'a')]
+    bigquery = FakeBigQuery()
+    bigquery.tables[TABLE] = ({'schema': {'fields': FIELDS},
+                               'timePartitioning': {'field': 'PAY_END_DT', 'type': 'MONTH'}}, rows)
+    bigquery.tables[TABLE + '_STAGING'] = unpartitioned([])
+    statements = layout_statements(TABLE, LAYOUT, bigquery.resource(TABLE), None, None)[2:]
+    assert statements == ['CREATE OR REPLACE TABLE {0} PARTITION BY DATE_TRUNC(PAY_END_DT, MONTH) '
+                          'CLUSTER BY EMPLID AS SELECT * FROM {0}'.format(TABLE)]
+    bigquery.apply()
+    assert bigquery.tables[TABLE] == ({'schema': {'fields': FIELDS}, 'clustering': {'fields': ['EMPLID']},
+                                       'timePartitioning': {'field': 'PAY_END_DT', 'type': 'MONTH'}}, rows)
+
+
+def test_missing_target_and_staging_is_reported():
+    with pytest.raises(ValueError, match='neither it nor'):
+        layout_statements(TABLE, LAYOUT, None, None, None)
+
+
+class FakeTables(object):
+    def __init__(self, fields):
+        self.fields = fields
+        self.calls = []
+
+    def tables(self):
+        return self
+
+    def get(self, **kwargs):
+        return Request({'schema': {'fields': self.fields}})
+
+    def patch(self, **kwargs):
+        self.calls.append(('patch', kwargs['body']))
+        return Request({})
+
+    def setIamPolicy(self, resource, body):
+        self.calls.append(('setIamPolicy', resource, body))
+        return Request({})
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+def test_metadata_and_access_policy_are_put_back():
+    described = [{'name': 'EMPLID', 'type': 'STRING', 'description': 'Employee',
+                  'policyTags': {'names': ['projects/p/locations/us/taxonomies/1/policyTags/2']}},
+                 {'name': 'PAY_END_DT', 'type': 'DATE'}]
+    resource = {'schema': {'fields': described}, 'description': 'Pay checks', 'labels': {'owner': 'hr'}}
+    service = FakeTables([{'name': 'EMPLID', 'type': 'STRING'}, {'name': 'PAY_END_DT', 'type': 'DATE'},
+                          {'name': 'ROW_HASH', 'type': 'STRING'}])
+    policy = {'bindings': [{'role': 'roles/bigquery.dataViewer', 'members': ['group:hr@amedisys.com']}]}
+    restore_metadata(service, 'amed-dev-analyticsplatform', TABLE, table_metadata(resource), policy)
+    (_, patched), (_, path, body) = service.calls
+    assert patched['description'] == 'Pay checks' and patched['labels'] == {'owner': 'hr'}
+    assert [field['name'] for field in patched['schema']['fields']] == ['EMPLID', 'PAY_END_DT', 'ROW_HASH']
+    assert patched['schema']['fields'][0]['policyTags'] == described[0]['policyTags']
+    assert path == 'projects/amed-dev-analyticsplatform/datasets/HRPRD_SC/tables/dbo_PS_PAY_CHECK'
+    assert body == {'policy': policy}
+
+
+def test_comparison_runs_the_merge_on_a_copy_from_before_the_procedure():
+    sql = compare_merge_sql(TABLE, '2026-10-18 22:00:00+00')
+    assert sql.startswith('DECLARE watermark DEFAULT (SELECT PAY_END_DT FROM {}_MAX);'.format(TABLE))
+    assert "FROM {} FOR SYSTEM_TIME AS OF TIMESTAMP '2026-10-18 22:00:00+00'".format(TABLE) in sql
+    assert 'MERGE {}__compare T\nUSING {}_STAGING S'.format(TABLE, TABLE) in sql
+    assert sql.count('DECLARE') == 1
+
+
+def test_merge_only_procedure_is_covered():
+    definition = """BEGIN
+  -- Reload from the watermark
+  DECLARE watermark DATE DEFAULT (SELECT PAY_END_DT FROM `amed-dev-analyticsplatform.HRPRD_SC.dbo_PS_PAY_CHECK_MAX`);
+  DELETE FROM `amed-dev-analyticsplatform.HRPRD_SC.dbo_PS_PAY_CHECK` WHERE PAY_END_DT >= watermark;
+  INSERT INTO `amed-dev-analyticsplatform.HRPRD_SC.dbo_PS_PAY_CHECK`
+  SELECT * FROM `amed-dev-analyticsplatform.HRPRD_SC.dbo_PS_PAY_CHECK_STAGING`;
+END"""
+    assert uncovered_statements(definition, TABLE) == []
+    assert uncovered_statements(hash_merge_sql(TABLE), TABLE) == []
+
+
+def test_procedure_logic_beyond_the_merge_is_reported():
+    definition = """BEGIN
+  DELETE FROM HRPRD_SC.dbo_PS_PAY_CHECK WHERE PAY_END_DT >= '2020-01-01';
+  INSERT INTO HRPRD_SC.dbo_PS_PAY_CHECK (EMPLID, PAY_END_DT) SELECT TRIM(EMPLID), PAY_END_DT FROM HRPRD_SC.dbo_PS_PAY_CHECK_STAGING;
+  UPDATE HRPRD_SC.dbo_PS_PAY_CHECK SET EMPLID = TRIM(EMPLID) WHERE TRUE;
+  MERGE HRPRD_SC.dbo_PS_PAY_CHECK T USING HRPRD_SC.dbo_PS_PAY_CHECK_STAGING S ON T.EMPLID = S.EMPLID WHEN MATCHED THEN UPDATE SET PAY_END_DT = S.PAY_END_DT;
+  INSERT INTO ETLConfigACE.PayAudit SELECT CURRENT_TIMESTAMP();
+END"""
+    uncovered = uncovered_statements(definition, TABLE)
+    assert [statement.split()[0] for statement in uncovered] == ['INSERT', 'UPDATE', 'MERGE', 'INSERT']
+
+
+class Cursor(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql):
+        assert 'ETLConfigACE.INFORMATION_SCHEMA.ROUTINES' in sql
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_check_fails_before_dropping_logic():
+    check_replaced_procedures(Cursor([('MergePayCheck', hash_merge_sql(TABLE)), ('LoadOther', 'UPDATE x SET y = 1')]))
+    with pytest.raises(ValueError, match='MergePayTax: UPDATE'):
+        check_replaced_procedures(Cursor([('MergePayTax', 'UPDATE HRPRD_SC.dbo_PS_PAY_TAX SET X = 1 WHERE TRUE')]))
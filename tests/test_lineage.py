@@ -0,0 +1,80 @@
+"""Procedure lineage from a directory of .sql files, and the edges it derives."""
+from ace_hr.lineage import SqlDirectoryRoutines, compare, statement_lineage, task_lineage, \
+    transitive_reduction
+
+PROJECT = 'amed-dev-analyticsplatform'
+
+
+class Task(object):
+    def __init__(self, task_id, downstream=(), **attributes):
+        self.task_id = task_id
+        self.downstream_task_ids = set(downstream)
+        self.__dict__.update(attributes)
+
+
+class Dag(object):
+    def __init__(self, *tasks):
+        self.tasks = list(tasks)
+
+
+def routines(tmp_path, **bodies):
+    for name, body in bodies.items():
+        (tmp_path / (name + '.sql')).write_text(body)
+    return SqlDirectoryRoutines(str(tmp_path))
+
+
+def call(procedure):
+    return 'CALL `{}.ETLConfigACE.{}`();'.format(PROJECT, procedure)
+
+
+def test_statement_lineage_reads_writes_and_calls():
+    reads, writes, calls = statement_lineage("""
+        -- FROM HRPRD_SC.commented_out
+        DELETE FROM ACE_HR.DimEmployee WHERE Source = 'FROM HRPRD_SC.quoted';
+        INSERT INTO `amed-dev-analyticsplatform.ACE_HR.DimEmployee`
+        SELECT j.EMPLID, EXTRACT(YEAR FROM j.EFFDT) FROM HRPRD_SC.dbo_PS_JOB j
+        JOIN HRPRD_SC.dbo_PS_DEPT_TBL d USING (DEPTID);
+        CALL ETLConfigACE.LogRun('LoadDimEmployee');
+    """)
+    assert reads == {'hrprd_sc.dbo_ps_job', 'hrprd_sc.dbo_ps_dept_tbl'}
+    assert writes == {'ace_hr.dimemployee'}
+    assert calls == {'ETLConfigACE.LogRun'}
+
+
+def test_transitive_reduction_drops_implied_edges():
+    edges = {'a': {'b', 'c'}, 'b': {'c'}, 'c': set()}
+    assert transitive_reduction(edges) == {'a': {'b'}, 'b': {'c'}, 'c': set()}
+
+
+def test_compare_finds_missing_and_droppable_edges(tmp_path):
+    sql = routines(tmp_path,
+                   LoadDimEmployee='INSERT INTO ACE_HR.DimEmployee SELECT * FROM HRPRD_SC.dbo_PS_JOB '
+                                   'JOIN HRPRD_SC.dbo_PS_DEPT_TBL USING (DEPTID);',
+                   LoadFactPay='INSERT INTO ACE_HR.FactPay SELECT * FROM HRPRD_SC.dbo_PS_PAY_CHECK;')
+    dag = Dag(Task('dbo_ps_job_etl', ['loaddimemployee'], parameters={
+                  'outputTable': PROJECT + ':HRPRD_SC.dbo_PS_JOB'}),
+              Task('dbo_ps_dept_tbl_etl', parameters={'outputTable': PROJECT + ':HRPRD_SC.dbo_PS_DEPT_TBL'}),
+              Task('dbo_ps_pay_check_etl', ['loaddimemployee'], parameters={
+                  'outputTable': PROJECT + ':HRPRD_SC.dbo_PS_PAY_CHECK'}),
+              Task('loaddimemployee', sql=call('LoadDimEmployee')))
+    missing, droppable = compare(dag, task_lineage(dag, sql))
+    assert missing == [('dbo_ps_dept_tbl_etl', 'loaddimemployee')]
+    assert droppable == [('dbo_ps_pay_check_etl', 'loaddimemployee')]
+
+
+def test_a_procedure_dataset_wait_stands_for_the_tables_the_procedure_writes(tmp_path):
+    sql = routines(tmp_path,
+                   LoadDimEmployee='CALL ETLConfigACE.LoadDimEmployeeStage(); '
+                                   'INSERT INTO ACE_HR.DimEmployee SELECT * FROM ACE_HR.DimEmployeeStage;',
+                   LoadDimEmployeeStage='CREATE OR REPLACE TABLE ACE_HR.DimEmployeeStage AS '
+                                        'SELECT * FROM HRPRD_SC.dbo_PS_JOB;',
+                   LoadFactPay='INSERT INTO ACE_HR.FactPay SELECT * FROM ACE_HR.DimEmployee '
+                               'JOIN HRPRD_SC.dbo_PS_PAY_CHECK USING (EMPLID);')
+    dag = Dag(Task('wait_for_etlconfigace_loaddimemployee', ['loadfactpay'], dataset='ETLConfigACE.LoadDimEmployee'),
+              Task('wait_for_hrprd_sc_dbo_ps_pay_check', ['loadfactpay'], dataset='HRPRD_SC.dbo_PS_PAY_CHECK'),
+              Task('loadfactpay', procedures=[PROJECT + '.ETLConfigACE.LoadFactPay']))
+    lineage = task_lineage(dag, sql)
+    assert lineage['wait_for_etlconfigace_loaddimemployee'] == (
+        None, {'ace_hr.dimemployee', 'ace_hr.dimemployeestage'})
+    assert lineage['wait_for_hrprd_sc_dbo_ps_pay_check'] == (None, {'hrprd_sc.dbo_ps_pay_check'})
+    assert compare(dag, lineage) == ([], [])
@@ -0,0 +1,107 @@
+"""BigQueryProcedureGroupOperator against a fake BigQuery jobs API: submission, failures, retries."""
+import pytest
+
+pytest.importorskip('airflow')
+
+from ace_hr import operators  # noqa: E402
+from ace_hr.operators import BigQueryProcedureGroupOperator  # noqa: E402
+from ace_hr.retry import LOCK_TIMEOUT, RetryController, RetryPolicy  # noqa: E402
+
+PROJECT = 'amed-dev-analyticsplatform'
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, num_retries=0):
+        return self.result
+
+
+class FakeJobs(object):
+    """jobs.insert and jobs.get; errors maps a procedure to the error of its next job.
+
+    Each job is DONE the first time it is polled.
+    """
+
+    def __init__(self, errors=None):
+        self.errors = dict(errors or {})
+        self.submitted = []
+        self.states = {}
+        self.calls = []
+
+    def jobs(self):
+        return self
+
+    def insert(self, projectId, body):
+        query = body['configuration']['query']['query']
+        procedure = query[len('CALL `'):-len('`();')]
+        job_id = 'job-{}'.format(len(self.submitted))
+        self.calls.append('insert')
+        self.submitted.append(procedure)
+        status = {'state': 'DONE'}
+        if self.errors.get(procedure):
+            status['errorResult'] = {'reason': 'invalidQuery', 'message': self.errors.pop(procedure)}
+        self.states[job_id] = {'status': status, 'statistics': {'startTime': '1000', 'endTime': '3500'}}
+        return Request({'jobReference': {'projectId': projectId, 'jobId': job_id, 'location': 'US'}})
+
+    def get(self, projectId, jobId, location=None):
+        self.calls.append('get')
+        return Request(self.states[jobId])
+
+
+class FakeHook(object):
+    service = None
+
+    def __init__(self, bigquery_conn_id, use_legacy_sql):
+        self.project_id = PROJECT
+
+    def get_service(self):
+        return FakeHook.service
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    monkeypatch.setattr(operators, 'BigQueryHook', FakeHook)
+    FakeHook.service = FakeJobs()
+    return FakeHook.service
+
+
+def group(procedures):
+    return BigQueryProcedureGroupOperator(task_id='tax_dimensions', procedures=procedures, poll_interval=0)
+
+
+def test_a_retry_within_the_try_only_calls_the_failed_procedures(jobs):
+    jobs.errors['ETLConfigACE.LoadDimTaxClass'] = 'Could not serialize access to table due to concurrent update'
+    controller = RetryController({LOCK_TIMEOUT: RetryPolicy(2, 0, 0)}, sleep=lambda seconds: None)
+    execute = controller.wrap_execute(BigQueryProcedureGroupOperator.execute)
+    task = group(['ETLConfigACE.LoadDimTaxClass', 'ETLConfigACE.LoadDimTaxLocality'])
+    results = execute(task, {})
+    assert jobs.submitted == ['ETLConfigACE.LoadDimTaxClass', 'ETLConfigACE.LoadDimTaxLocality',
+                              'ETLConfigACE.LoadDimTaxClass']
+    assert results['ETLConfigACE.LoadDimTaxLocality']['job_id'] == 'job-1'
+    assert results['ETLConfigACE.LoadDimTaxClass']['job_id'] == 'job-2'
+
+
+def test_every_procedure_is_submitted_before_any_is_waited_on(jobs):
+    procedures = ['ETLConfigACE.LoadDimTaxClass', 'ETLConfigACE.LoadDimTaxLocality']
+    task = group(procedures)
+    assert task.procedures == procedures
+    assert 'procedures' in BigQueryProcedureGroupOperator.template_fields
+    results = task.execute({})
+    assert jobs.submitted == procedures
+    assert jobs.calls == ['insert', 'insert', 'get', 'get']
+    assert results == {
+        'ETLConfigACE.LoadDimTaxClass': {'job_id': 'job-0', 'state': 'SUCCESS', 'seconds': 2.5, 'error': None},
+        'ETLConfigACE.LoadDimTaxLocality': {'job_id': 'job-1', 'state': 'SUCCESS', 'seconds': 2.5, 'error': None},
+    }
+
+
+def test_a_failed_procedure_fails_the_task_after_the_others_finish(jobs):
+    from airflow.exceptions import AirflowException
+    jobs.errors['ETLConfigACE.LoadDimTaxClass'] = 'Not found: Table HRPRD_SC.dbo_PS_TAX_CLASS'
+    task = group(['ETLConfigACE.LoadDimTaxClass', 'ETLConfigACE.LoadDimTaxLocality'])
+    with pytest.raises(AirflowException, match='LoadDimTaxClass: Not found: Table') as raised:
+        task.execute({})
+    assert 'LoadDimTaxLocality' not in str(raised.value)
+    assert list(task.succeeded) == ['ETLConfigACE.LoadDimTaxLocality']
@@ -0,0 +1,91 @@
+"""Pipeline stages on threads: source order, errors, an empty source and back-pressure."""
+import random
+import threading
+import time
+
+import pytest
+
+from ace_hr.pipeline import Pipeline
+
+
+def test_outputs_come_back_in_source_order():
+    rand = random.Random(7)
+    delays = [rand.uniform(0, 0.005) for _ in range(50)]
+
+    def slow_square(i):
+        time.sleep(delays[i])
+        return i * i
+
+    pipeline = Pipeline(queue_size=2, poll_interval=0.01)
+    pipeline.source('fetch', range(50))
+    pipeline.stage('square', slow_square, workers=4)
+    pipeline.stage('label', lambda n: 'n{}'.format(n), workers=3)
+    assert pipeline.run() == ['n{}'.format(i * i) for i in range(50)]
+    fetch, square, label = pipeline.metrics()
+    assert (fetch['items'], square['items'], label['items']) == (50, 50, 50)
+    assert square['workers'] == 4
+
+
+def test_the_first_stage_error_is_raised_by_run():
+    def upload(i):
+        if i == 5:
+            raise IOError('503 upload failed for part 5')
+        return i
+
+    pipeline = Pipeline(queue_size=2, poll_interval=0.01)
+    pipeline.source('fetch', range(1000))
+    pipeline.stage('encode', lambda i: i)
+    pipeline.stage('upload', upload, workers=2)
+    with pytest.raises(IOError, match='part 5'):
+        pipeline.run()
+    # The source stopped soon after the failure instead of reading everything
+    assert pipeline.metrics()[0]['items'] < 1000
+
+
+def test_a_source_error_is_raised_by_run():
+    def batches():
+        yield 1
+        raise RuntimeError('source connection reset')
+
+    pipeline = Pipeline(poll_interval=0.01)
+    pipeline.source('fetch', batches())
+    pipeline.stage('encode', lambda i: i)
+    with pytest.raises(RuntimeError, match='connection reset'):
+        pipeline.run()
+
+
+def test_an_empty_source_gives_no_outputs():
+    pipeline = Pipeline(poll_interval=0.01)
+    pipeline.source('fetch', [])
+    pipeline.stage('encode', lambda i: i, workers=2)
+    pipeline.stage('upload', lambda i: i, workers=3)
+    assert pipeline.run() == []
+    assert [stage['items'] for stage in pipeline.metrics()] == [0, 0, 0]
+
+
+def test_a_stalled_stage_holds_the_source_back():
+    released = threading.Event()
+    fetched = []
+
+    def batches():
+        for i in range(100):
+            fetched.append(i)
+            yield i
+
+    def upload(i):
+        released.wait()
+        return i
+
+    pipeline = Pipeline(queue_size=2, poll_interval=0.01)
+    pipeline.source('fetch', batches())
+    pipeline.stage('upload', upload)
+    outputs = []
+    runner = threading.Thread(target=lambda: outputs.extend(pipeline.run()))
+    runner.start()
+    time.sleep(0.2)
+    # One item in the stalled stage, a full queue and one waiting to be put
+    assert len(fetched) <= 2 + 2
+    released.set()
+    runner.join(10)
+    assert outputs == list(range(100))
+    assert pipeline.metrics()[1]['max_queue_depth'] <= 2
@@ -0,0 +1,128 @@
+"""Pre-flight checks against a fake BigQuery client: missing objects, permissions, cost estimates."""
+import collections
+
+import pytest
+
+from ace_hr.preflight import PRICE_PER_TIB, dag_statements, projected_duration, run_preflight
+
+
+class Task(object):
+    def __init__(self, task_id, sql=None, procedures=None, upstream=()):
+        self.task_id = task_id
+        if procedures is not None:
+            self.procedures = procedures
+        self.sql = sql
+        self.upstream_task_ids = set(upstream)
+
+
+class BigQueryOperator(Task):
+    pass
+
+
+class PythonOperator(Task):
+    pass
+
+
+class Dag(collections.namedtuple('Dag', 'dag_id tasks')):
+    def topological_sort(self):
+        done, ordered = set(), []
+        while len(ordered) < len(self.tasks):
+            for task in self.tasks:
+                if task.task_id not in done and task.upstream_task_ids <= done:
+                    done.add(task.task_id)
+                    ordered.append(task)
+        return ordered
+
+
+class FakeClient(object):
+    """Dry runs: tables maps a table to its bytes; denied tables raise a permission error."""
+
+    def __init__(self, tables, routines=(), denied=()):
+        self.tables = tables
+        self.routines = set(routines)
+        self.denied = set(denied)
+        self.dry_runs = []
+
+    def dry_run(self, sql):
+        self.dry_runs.append(sql)
+        total = 0
+        for table in set(word.strip('`;()') for word in sql.split()) & (set(self.tables) | self.denied):
+            if table in self.denied:
+                raise Exception("Access Denied: Table {}: User does not have permission to query "
+                                "table {}".format(table, table))
+            if self.tables[table] is None:
+                raise Exception('Not found: Table amed-dev-analyticsplatform:{}'.format(table))
+            total += self.tables[table]
+        return total
+
+    def routine_exists(self, routine):
+        return routine in self.routines
+
+
+def payroll_dag():
+    return Dag('ACE_HR_payroll', [
+        BigQueryOperator('pay_check_truncate', 'truncate table HRPRD_SC.dbo_PS_PAY_CHECK_STAGING'),
+        BigQueryOperator('pay_check_max_date', 'CREATE OR REPLACE TABLE HRPRD_SC.dbo_PS_PAY_CHECK_MAX AS '
+                         'SELECT MAX(PAY_END_DT) PAY_END_DT FROM HRPRD_SC.dbo_PS_PAY_CHECK',
+                         upstream=['pay_check_truncate']),
+        BigQueryOperator('pay_check_merge', 'CALL `amed-dev-analyticsplatform.ETLConfigACE.MergePayCheck`();',
+                         upstream=['pay_check_max_date']),
+        Task('tax_dimensions', procedures=['amed-dev-analyticsplatform.ETLConfigACE.LoadDimTaxClass'],
+             upstream=['pay_check_merge']),
+        BigQueryOperator('templated', "SELECT * FROM x WHERE d = '{{ ds }}'"),
+        PythonOperator('process_ps_pay_check_max'),
+    ])
+
+
+ROUTINES = ['amed-dev-analyticsplatform.ETLConfigACE.MergePayCheck',
+            'amed-dev-analyticsplatform.ETLConfigACE.LoadDimTaxClass']
+
+
+def test_statements_skip_jinja_and_other_operators():
+    assert [task_id for task_id, _ in dag_statements(payroll_dag())] == [
+        'pay_check_max_date', 'pay_check_merge', 'pay_check_truncate', 'tax_dimensions']
+
+
+def test_cost_is_estimated_per_statement():
+    client = FakeClient({'HRPRD_SC.dbo_PS_PAY_CHECK_STAGING': 0, 'HRPRD_SC.dbo_PS_PAY_CHECK': 2 ** 40},
+                        routines=ROUTINES)
+    rows = dict((task_id, (estimate, cost)) for task_id, estimate, cost, _ in run_preflight(payroll_dag(), client))
+    assert rows['pay_check_max_date'] == (2 ** 40, PRICE_PER_TIB)
+    assert rows['pay_check_truncate'] == (0, 0)
+    # Procedure bodies are not dry-run, only checked to exist
+    assert rows['pay_check_merge'] == (None, None) and rows['tax_dimensions'] == (None, None)
+    assert not any('CALL' in sql for sql in client.dry_runs)
+
+
+def test_missing_table_fails_with_the_task():
+    client = FakeClient({'HRPRD_SC.dbo_PS_PAY_CHECK_STAGING': 0, 'HRPRD_SC.dbo_PS_PAY_CHECK': None},
+                        routines=ROUTINES)
+    with pytest.raises(ValueError, match='1 statement.*\n.*pay_check_max_date: Not found: Table'):
+        run_preflight(payroll_dag(), client)
+
+
+def test_missing_routine_fails_with_the_task():
+    client = FakeClient({'HRPRD_SC.dbo_PS_PAY_CHECK_STAGING': 0, 'HRPRD_SC.dbo_PS_PAY_CHECK': 0},
+                        routines=ROUTINES[:1])
+    with pytest.raises(ValueError) as raised:
+        run_preflight(payroll_dag(), client)
+    assert str(raised.value).splitlines()[1:] == [
+        'tax_dimensions: Not found: Routine amed-dev-analyticsplatform.ETLConfigACE.LoadDimTaxClass']
+
+
+def test_permission_error_is_reported_with_every_other_failure():
+    client = FakeClient({'HRPRD_SC.dbo_PS_PAY_CHECK': 0}, routines=[],
+                        denied=['HRPRD_SC.dbo_PS_PAY_CHECK_STAGING'])
+    with pytest.raises(ValueError) as raised:
+        run_preflight(payroll_dag(), client)
+    lines = str(raised.value).splitlines()
+    assert lines[0] == 'Pre-flight failed for 3 statement(s):'
+    assert lines[2].startswith('pay_check_truncate: Access Denied: Table HRPRD_SC.dbo_PS_PAY_CHECK_STAGING')
+
+
+def test_projected_duration_follows_the_critical_path():
+    durations = {'pay_check_truncate': 10, 'pay_check_max_date': 20, 'pay_check_merge': 300,
+                 'tax_dimensions': 60, 'templated': 500}
+    assert projected_duration(payroll_dag(), durations) == 500
+    durations['templated'] = 5
+    assert projected_duration(payroll_dag(), durations) == 390
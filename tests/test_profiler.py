@@ -0,0 +1,115 @@
+"""Statement profiles of procedure calls, read from a fake BigQuery jobs API."""
+import datetime
+
+import pytest
+
+from ace_hr.profiler import PROFILE_TABLE, child_jobs, profile_procedure_call
+
+
+class Request(object):
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+def child(job_id, line, slot_ms, text):
+    return {'jobReference': {'jobId': job_id},
+            'statistics': {'startTime': '1000', 'endTime': '4000',
+                           'scriptStatistics': {'stackFrames': [{'procedureId': 'ETLConfigACE.LoadDimEmployee',
+                                                                 'startLine': str(line), 'text': text}]},
+                           'query': {'statementType': 'MERGE', 'totalBytesProcessed': '1024',
+                                     'totalSlotMs': str(slot_ms),
+                                     'queryPlan': [{'shuffleOutputBytes': '10'}, {'shuffleOutputBytes': '5'}]}}}
+
+
+class FakeBigQuery(object):
+    """jobs.list by parent job, in pages of one; tables.insert and tabledata.insertAll."""
+
+    def __init__(self, children):
+        self.children = children
+        self.listed = []
+        self.inserted = []
+
+    def jobs(self):
+        return self
+
+    def tables(self):
+        return self
+
+    def tabledata(self):
+        return self
+
+    def list(self, **kwargs):
+        self.listed.append(kwargs)
+        return Request({'jobs': self.children.get(kwargs['parentJobId'], [])[:1], 'page': 0,
+                        'parent': kwargs['parentJobId']})
+
+    def list_next(self, previous_request, previous_response):
+        page = previous_response['page'] + 1
+        jobs = self.children.get(previous_response['parent'], [])[page:page + 1]
+        return Request({'jobs': jobs, 'page': page, 'parent': previous_response['parent']}) if jobs else None
+
+    def insert(self, **kwargs):
+        return Request({})
+
+    def insertAll(self, projectId, datasetId, tableId, body):
+        self.inserted.append((tableId, body['rows']))
+        return Request({})
+
+
+class FakeHook(object):
+    project_id = 'amed-dev-analyticsplatform'
+
+    def __init__(self, service):
+        self.service = service
+
+    def get_service(self):
+        return self.service
+
+
+class TaskInstance(object):
+    task_id = 'loaddimemployee'
+
+    def xcom_pull(self, task_ids, key=None):
+        return 'script_job_1' if key == 'job_id' else None
+
+
+class Dag(object):
+    dag_id = 'ACE_HR_employee'
+
+
+CHILDREN = {'script_job_1': [child('child_1', 12, 500, 'MERGE DimEmployee ...'),
+                             child('child_2', 40, 9000, 'INSERT INTO DimEmployeeHistory ...')]}
+
+
+def test_child_jobs_are_listed_by_parent_only():
+    service = FakeBigQuery(CHILDREN)
+    assert [job['jobReference']['jobId'] for job in child_jobs(service, 'p', 'script_job_1')] == [
+        'child_1', 'child_2']
+    assert service.listed == [{'projectId': 'p', 'parentJobId': 'script_job_1', 'projection': 'full'}]
+
+
+def test_every_statement_of_the_call_is_stored():
+    pytest.importorskip('googleapiclient')
+    service = FakeBigQuery(CHILDREN)
+    context = {'ti': TaskInstance(), 'dag': Dag(), 'execution_date': datetime.datetime(2026, 10, 18, 22, 6)}
+    profile_procedure_call(context, hook=FakeHook(service))
+    [(table, rows)] = service.inserted
+    assert table == PROFILE_TABLE
+    assert [row['insertId'] for row in rows] == ['child_1', 'child_2']
+    assert rows[1]['json'] == {
+        'job_id': 'child_2', 'procedure_id': 'ETLConfigACE.LoadDimEmployee', 'start_line': 40,
+        'statement_type': 'MERGE', 'statement_text': 'INSERT INTO DimEmployeeHistory ...',
+        'total_bytes_processed': 1024, 'total_slot_ms': 9000, 'shuffle_output_bytes': 15, 'elapsed_ms': 3000,
+        'dag_id': 'ACE_HR_employee', 'task_id': 'loaddimemployee', 'execution_date': '2026-10-18T22:06:00',
+        'parent_job_id': 'script_job_1'}
+
+
+def test_profiling_problems_never_fail_the_task():
+    class BrokenHook(FakeHook):
+        def get_service(self):
+            raise IOError('Connection reset by peer')
+    context = {'ti': TaskInstance(), 'dag': Dag(), 'execution_date': datetime.datetime(2026, 10, 18)}
+    profile_procedure_call(context, hook=BrokenHook(None))
@@ -0,0 +1,81 @@
+"""Extract stats on key tuples, and the quality check after each load of a keyed table."""
+import datetime
+
+import pytest
+
+from ace_hr.quality import DataQualityError, ExtractStats, check_loaded_table, loaded_table_sql, \
+    quality_task_id
+
+KEY = ('EMPLID', 'EMPL_RCD')
+
+
+class FakeCursor(object):
+    def __init__(self, row):
+        self.row = row
+        self.sql = []
+
+    def execute(self, sql):
+        self.sql.append(sql)
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeHook(object):
+    def __init__(self, row):
+        self.open_cursor = FakeCursor(row)
+
+    def get_conn(self):
+        return self
+
+    def cursor(self):
+        return self.open_cursor
+
+
+def test_distinct_keys_with_the_same_hash_are_not_duplicates():
+    # hash(-1) == hash(-2) in CPython, so the key tuples share a hash too
+    assert hash((-1,)) == hash((-2,))
+    stats = ExtractStats(['EMPL_RCD'])
+    stats.update_rows([{'EMPL_RCD': -1}, {'EMPL_RCD': -2}])
+    assert stats.duplicate_keys == 0
+    stats.update_rows([{'EMPL_RCD': -1}])
+    assert stats.duplicate_keys == 1
+
+
+def test_loaded_table_sql_counts_rows_and_duplicate_keys():
+    assert loaded_table_sql('amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOB', KEY) == (
+        'SELECT COUNT(*), COUNT(*) - COUNT(DISTINCT TO_JSON_STRING(STRUCT(EMPLID, EMPL_RCD))) '
+        'FROM `amed-dev-analyticsplatform.HRPRD_SC.dbo_PS_JOB`')
+
+
+def test_a_loaded_table_passes_with_rows_and_unique_keys():
+    hook = FakeHook((1200, 0))
+    assert check_loaded_table('HRPRD_SC.dbo_PS_JOB', KEY, hook=hook) == {
+        'table': 'HRPRD_SC.dbo_PS_JOB', 'rows': 1200, 'key': list(KEY), 'duplicate_keys': 0}
+    assert hook.open_cursor.sql == [loaded_table_sql('HRPRD_SC.dbo_PS_JOB', KEY)]
+
+
+@pytest.mark.parametrize('row, problem', [((1200, 3), '3 duplicate keys on'), ((0, 0), 'is empty')])
+def test_a_loaded_table_fails_on_duplicate_keys_or_no_rows(row, problem):
+    with pytest.raises(DataQualityError, match=problem):
+        check_loaded_table('HRPRD_SC.dbo_PS_JOB', KEY, hook=FakeHook(row))
+
+
+def test_check_loads_follows_each_keyed_load():
+    pytest.importorskip('airflow')
+    from airflow.models import DAG
+    from airflow.operators.dummy_operator import DummyOperator
+    from ace_hr.quality import check_loads
+    dag = DAG('ACE_HR_sources_peoplesoft', start_date=datetime.datetime(2020, 1, 1), schedule_interval=None)
+    job = DummyOperator(task_id='peoplesoft_dbo_ps_job_etl', dag=dag)
+    job.parameters = {'outputTable': 'amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_JOB'}
+    addresses = DummyOperator(task_id='peoplesoft_dbo_ps_addresses_etl', dag=dag)
+    addresses.parameters = {'outputTable': 'amed-dev-analyticsplatform:HRPRD_SC.dbo_PS_ADDRESSES'}
+    report = DummyOperator(task_id='report', dag=dag)
+    job >> report
+    [check] = check_loads(dag)
+    assert check.task_id == quality_task_id(job.task_id) == 'peoplesoft_dbo_ps_job_quality'
+    assert check.op_kwargs == {'table': job.parameters['outputTable'],
+                               'key': ['EMPLID', 'EMPL_RCD', 'EFFDT', 'EFFSEQ']}
+    assert check.upstream_task_ids == {job.task_id}
+    assert check.downstream_task_ids == {'report'}
@@ -0,0 +1,69 @@
+"""The source_ready sensor ahead of the source loads."""
+import datetime
+
+import pytest
+
+pytest.importorskip('airflow')
+
+from airflow.models import DAG  # noqa: E402
+from airflow.operators.dummy_operator import DummyOperator  # noqa: E402
+
+from ace_hr import readiness  # noqa: E402
+from ace_hr.readiness import READINESS_VARIABLE, SourceReadySensor, hold_until_ready  # noqa: E402
+
+READINESS = {'peoplesoft': {'conn_id': 'ace_integration_prod09',
+                            'sql': "SELECT 1 FROM dbo.RefreshLog WHERE CompletedAt >= '{{ next_ds }}'"}}
+
+
+class FakeHook(object):
+    def __init__(self, row):
+        self.row = row
+        self.sql = []
+
+    def get_first(self, sql):
+        self.sql.append(sql)
+        return self.row
+
+
+class FakeConnection(object):
+    def __init__(self, hook):
+        self.hook = hook
+
+    def get_hook(self):
+        return self.hook
+
+
+def dag():
+    return DAG('ACE_HR_sources_peoplesoft', start_date=datetime.datetime(2020, 1, 1), schedule_interval=None)
+
+
+def sensor(monkeypatch, row, config=READINESS):
+    hook = FakeHook(row)
+    monkeypatch.setattr(readiness.Variable, 'get', staticmethod(
+        lambda key, default_var=None, deserialize_json=False: config if key == READINESS_VARIABLE else default_var))
+    monkeypatch.setattr(readiness.BaseHook, 'get_connection', staticmethod(
+        lambda conn_id: FakeConnection(hook) if conn_id == 'ace_integration_prod09' else None))
+    return SourceReadySensor(task_id='source_ready', source='peoplesoft', dag=dag()), hook
+
+
+@pytest.mark.parametrize('row, ready', [((1,), True), ((0,), False), (None, False)])
+def test_the_source_is_ready_once_its_query_returns_a_truthy_cell(monkeypatch, row, ready):
+    task, hook = sensor(monkeypatch, row)
+    assert task.poke({'next_ds': '2020-01-17'}) is ready
+    assert hook.sql == ["SELECT 1 FROM dbo.RefreshLog WHERE CompletedAt >= '2020-01-17'"]
+
+
+def test_a_source_without_a_readiness_query_is_ready(monkeypatch):
+    task, hook = sensor(monkeypatch, None, config={})
+    assert task.poke({'next_ds': '2020-01-17'}) is True
+    assert hook.sql == []
+
+
+def test_the_sensor_reschedules_and_holds_back_every_root():
+    sources = dag()
+    loads = [DummyOperator(task_id=task_id, dag=sources) for task_id in ['job_etl', 'dept_tbl_etl']]
+    loads[0] >> DummyOperator(task_id='job_merge', dag=sources)
+    ready = hold_until_ready(sources, 'peoplesoft')
+    assert ready.mode == 'reschedule' and ready.retries == 0
+    assert ready.downstream_task_ids == {'job_etl', 'dept_tbl_etl'}
+    assert sources.roots == [ready]
@@ -0,0 +1,118 @@
+"""Failure classification against payloads recorded from real runs, and the retry policy."""
+import json
+import os
+
+import pytest
+
+from ace_hr.retry import (LOCK_TIMEOUT, PERMANENT, QUOTA, TRANSIENT, RetryController, RetryPolicy,
+                          classify_error)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+with open(os.path.join(FIXTURES, 'error_payloads.json')) as f:
+    PAYLOADS = json.load(f)
+
+
+class FakeHttpError(Exception):
+    """Carries the JSON body in content, as googleapiclient's HttpError does."""
+
+    def __init__(self, status, content):
+        super(FakeHttpError, self).__init__('<HttpError {}>'.format(status))
+        self.content = content
+
+
+@pytest.mark.parametrize('recorded', PAYLOADS, ids=[recorded['name'] for recorded in PAYLOADS])
+def test_classifies_recorded_payload(recorded):
+    assert classify_error(recorded['payload']) == recorded['class']
+
+
+@pytest.mark.parametrize('recorded', [r for r in PAYLOADS if isinstance(r['payload'], dict)],
+                         ids=[r['name'] for r in PAYLOADS if isinstance(r['payload'], dict)])
+def test_classifies_http_error_body(recorded):
+    error = FakeHttpError(recorded['payload']['error']['code'], json.dumps(recorded['payload']).encode('utf-8'))
+    assert classify_error(error) == recorded['class']
+
+
+def test_classifies_the_cause():
+    try:
+        try:
+            raise ValueError('Lock request time out period exceeded.')
+        except ValueError as cause:
+            raise RuntimeError('Dataflow job failed') from cause
+    except RuntimeError as error:
+        assert classify_error(error) == LOCK_TIMEOUT
+
+
+def test_permanent_wins_over_generic_status():
+    assert classify_error('HttpError 503 ... Not found: Table x:y.z') == PERMANENT
+
+
+def failing(errors):
+    calls = []
+
+    def func():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return 'done'
+    return func, calls
+
+
+def test_transient_retried_in_task_with_capped_backoff():
+    sleeps = []
+    controller = RetryController(sleep=sleeps.append, rand=lambda: 1.0)
+    func, calls = failing([Exception('backendError')] * 3)
+    assert controller.call(func) == 'done'
+    assert len(calls) == 4
+    assert sleeps == [30, 60, 120]
+
+
+def test_quota_goes_to_airflow_retries_without_sleeping():
+    sleeps = []
+    controller = RetryController(sleep=sleeps.append)
+    func, calls = failing([Exception('quotaExceeded')])
+    with pytest.raises(Exception):
+        controller.call(func)
+    assert classify_error('quotaExceeded') == QUOTA
+    assert len(calls) == 1 and sleeps == []
+
+
+def test_in_task_sleeps_stay_short():
+    controller = RetryController(rand=lambda: 1.0)
+    for error_class, policy in controller.policies.items():
+        total = sum(controller.delay(error_class, attempt) for attempt in range(policy.attempts))
+        assert total <= 15 * 60, error_class
+
+
+def test_class_budgets_are_separate():
+    sleeps = []
+    controller = RetryController(policies={TRANSIENT: RetryPolicy(1, 1, 1), LOCK_TIMEOUT: RetryPolicy(1, 1, 1)},
+                                 sleep=sleeps.append)
+    func, calls = failing([Exception('backendError'), Exception('was deadlocked on lock resources'),
+                           Exception('Lock request time out period exceeded')])
+    with pytest.raises(Exception):
+        controller.call(func)
+    assert len(calls) == 3
+
+
+class Operator(object):
+    task_id = 'load'
+    retries = 5
+
+
+def test_permanent_failure_zeroes_task_retries():
+    def execute(operator, context):
+        raise Exception('Incorrect syntax near the keyword FROM')
+    operator = Operator()
+    with pytest.raises(Exception):
+        RetryController(sleep=lambda s: None).wrap_execute(execute)(operator, {})
+    assert operator.retries == 0
+
+
+def test_quota_failure_keeps_task_retries():
+    def execute(operator, context):
+        raise Exception('RESOURCE_EXHAUSTED')
+    operator = Operator()
+    with pytest.raises(Exception):
+        RetryController(sleep=lambda s: None).wrap_execute(execute)(operator, {})
+    assert operator.retries == 5
@@ -0,0 +1,89 @@
+"""The row-hash merges run on local engines: unchanged rows are skipped, changed rows replaced."""
+import sqlite3
+
+import pytest
+
+from ace_hr.rowhash import changed_rows_merge_sql, portable_hash_merge_statements, window_hash_merge_sql
+
+TABLE = 'PS_PAY_CHECK'
+
+
+def database(target, staging, watermark):
+    db = sqlite3.connect(':memory:')
+    for table, rows in [(TABLE, target), (TABLE + '_STAGING', staging)]:
+        db.execute('CREATE TABLE {} (EMPLID TEXT, PAY_END_DT TEXT, NET_PAY REAL, ROW_HASH TEXT)'.format(table))
+        db.executemany('INSERT INTO {} VALUES (?, ?, ?, ?)'.format(table),
+                       [row + ('{}|{}|{}'.format(*row),) for row in rows])
+    db.execute('CREATE TABLE {}_MAX (PAY_END_DT TEXT)'.format(TABLE))
+    db.execute('INSERT INTO {}_MAX VALUES (?)'.format(TABLE), (watermark,))
+    return db
+
+
+def merge(db):
+    changes = []
+    with db:
+        for statement in portable_hash_merge_statements(TABLE):
+            changes.append(db.execute(statement).rowcount)
+    return changes
+
+
+def rows(db):
+    return sorted(db.execute('SELECT EMPLID, PAY_END_DT, NET_PAY FROM ' + TABLE).fetchall())
+
+
+def test_unchanged_rows_are_skipped_and_changed_rows_replaced():
+    db = database(
+        target=[('1', '2020-01-03', 100.0), ('2', '2020-01-17', 200.0), ('3', '2020-01-17', 300.0)],
+        staging=[('2', '2020-01-17', 200.0), ('3', '2020-01-17', 350.0), ('4', '2020-01-17', 400.0)],
+        watermark='2020-01-17')
+    deleted, inserted = merge(db)
+    # Only employee 3's old version goes, and its new version and employee 4 come in
+    assert (deleted, inserted) == (1, 2)
+    assert rows(db) == [('1', '2020-01-03', 100.0), ('2', '2020-01-17', 200.0),
+                        ('3', '2020-01-17', 350.0), ('4', '2020-01-17', 400.0)]
+
+
+def test_rows_gone_from_the_window_are_deleted_and_older_rows_kept():
+    db = database(
+        target=[('1', '2020-01-03', 100.0), ('2', '2020-01-17', 200.0)],
+        staging=[],
+        watermark='2020-01-17')
+    assert merge(db) == [1, 0]
+    assert rows(db) == [('1', '2020-01-03', 100.0)]
+
+
+def test_merging_again_changes_nothing():
+    db = database(
+        target=[('1', '2020-01-17', 100.0)],
+        staging=[('1', '2020-01-17', 150.0), ('2', '2020-01-17', 200.0)],
+        watermark='2020-01-17')
+    assert merge(db) == [1, 2]
+    assert merge(db) == [0, 0]
+    assert rows(db) == [('1', '2020-01-17', 150.0), ('2', '2020-01-17', 200.0)]
+
+
+def test_window_merge_only_touches_its_window():
+    sql = window_hash_merge_sql(TABLE, 'STAGED', "T.PAY_END_DT >= '2020-01-01' AND T.PAY_END_DT < '2020-04-01'")
+    assert sql.count("T.PAY_END_DT >= '2020-01-01' AND T.PAY_END_DT < '2020-04-01'") == 2
+
+
+def test_changed_rows_merge_replaces_by_key_and_keeps_the_rest():
+    duckdb = pytest.importorskip('duckdb')
+    db = duckdb.connect()
+    for table in [TABLE, TABLE + '_STAGING_INTRADAY']:
+        db.execute('CREATE TABLE {} (EMPLID TEXT, PAY_END_DT TEXT, NET_PAY DOUBLE, ROW_HASH TEXT)'.format(table))
+    db.execute("INSERT INTO {} VALUES ('1', '2020-01-03', 100, 'a'), ('2', '2020-01-17', 200, 'b'), "
+               "('3', '2020-01-17', 300, 'c')".format(TABLE))
+    # Only employee 2 changed since the last cycle, and employee 4 is new
+    db.execute("INSERT INTO {}_STAGING_INTRADAY VALUES ('2', '2020-01-17', 250, 'b2'), "
+               "('4', '2020-01-17', 400, 'd')".format(TABLE))
+    sql = changed_rows_merge_sql(TABLE, ['EMPLID', 'PAY_END_DT'], TABLE + '_STAGING_INTRADAY')
+    # DuckDB has no script variables
+    declare, script = sql.split(';\n', 1)
+    script = script.replace('first_period', '(' + declare.split('DEFAULT ', 1)[1] + ')')
+    for _ in range(2):
+        for statement in script.split(';'):
+            if statement.strip():
+                db.execute(statement)
+        assert sorted(db.execute('SELECT EMPLID, NET_PAY FROM ' + TABLE).fetchall()) == [
+            ('1', 100), ('2', 250), ('3', 300), ('4', 400)]
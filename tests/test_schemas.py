@@ -0,0 +1,80 @@
+"""Source column types mapped to BigQuery, their drift, the target statements and the registry."""
+from ace_hr.checkpoint import manifest_store
+from ace_hr.schemas import SchemaRegistry, bigquery_field, schema_drift, table_options, target_statements
+
+TABLE = 'HRPRD_SC.dbo_PS_PAY_CHECK'
+SOURCE_TABLE = 'AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_PAY_CHECK'
+FIELDS = [bigquery_field('EMPLID', 'varchar', nullable='NO'),
+          bigquery_field('PAY_END_DT', 'datetime'),
+          bigquery_field('NET_PAY', 'decimal', 18, 3)]
+TARGET = {
+    'schema': {'fields': [{'name': 'EMPLID', 'type': 'STRING', 'mode': 'REQUIRED'},
+                          {'name': 'PAY_END_DT', 'type': 'DATETIME'},
+                          {'name': 'NET_PAY', 'type': 'FLOAT'},
+                          {'name': 'ROW_HASH', 'type': 'STRING'}]},
+    'timePartitioning': {'type': 'MONTH', 'field': 'PAY_END_DT', 'expirationMs': '63072000000'},
+    'requirePartitionFilter': True,
+    'clustering': {'fields': ['EMPLID']},
+}
+
+
+def test_source_types_map_to_exact_bigquery_types():
+    assert FIELDS[0] == {'name': 'EMPLID', 'type': 'STRING', 'mode': 'REQUIRED'}
+    assert FIELDS[1] == {'name': 'PAY_END_DT', 'type': 'DATETIME', 'mode': 'NULLABLE'}
+    assert FIELDS[2] == {'name': 'NET_PAY', 'type': 'NUMERIC', 'mode': 'NULLABLE', 'precision': '18', 'scale': '3'}
+    assert bigquery_field('AMOUNT', 'DECIMAL', 38, 10)['type'] == 'BIGNUMERIC'
+    assert bigquery_field('AMOUNT', 'numeric', 30, 0)['type'] == 'BIGNUMERIC'
+    assert bigquery_field('AMOUNT', 'numeric', 38, 9)['type'] == 'NUMERIC'
+    assert bigquery_field('NOTES', 'sql_variant')['type'] == 'STRING'
+
+
+def test_schema_drift_lists_added_removed_and_retyped_columns():
+    new = [FIELDS[0], bigquery_field('PAY_END_DT', 'date'), bigquery_field('NET_PAY', 'decimal', 19, 3),
+           bigquery_field('SEPCHK', 'smallint')]
+    assert schema_drift(FIELDS, new) == {
+        'added': ['SEPCHK'],
+        'removed': [],
+        'changed': [['PAY_END_DT', 'DATETIME', 'DATE'], ['NET_PAY', 'NUMERIC(18, 3)', 'NUMERIC(19, 3)']],
+    }
+    assert schema_drift(new, FIELDS)['removed'] == ['SEPCHK']
+    assert not any(schema_drift(FIELDS, list(FIELDS)).values())
+
+
+def test_target_statements_add_missing_columns_and_leave_mismatches_unless_retyped():
+    fields = FIELDS + [bigquery_field('SEPCHK', 'smallint')]
+    add = 'ALTER TABLE {} ADD COLUMN IF NOT EXISTS `SEPCHK` INT64'.format(TABLE)
+    assert target_statements(TABLE, fields, TARGET) == [add]
+    assert target_statements(TABLE, fields, TARGET, retype=True) == [
+        add,
+        'CREATE OR REPLACE TABLE {0} PARTITION BY DATETIME_TRUNC(PAY_END_DT, MONTH) CLUSTER BY EMPLID '
+        'OPTIONS (require_partition_filter = TRUE, partition_expiration_days = 730) '
+        'AS SELECT * REPLACE (CAST(`NET_PAY` AS NUMERIC) AS `NET_PAY`) FROM {0}'.format(TABLE)]
+
+
+def test_a_retype_of_an_unpartitioned_table_is_a_plain_replace():
+    target = {'schema': TARGET['schema']}
+    assert target_statements(TABLE, FIELDS, target, retype=True) == [
+        'CREATE OR REPLACE TABLE {0} AS SELECT * REPLACE (CAST(`NET_PAY` AS NUMERIC) AS `NET_PAY`) FROM {0}'.format(
+            TABLE)]
+
+
+def test_table_options_keep_ingestion_time_and_range_partitioning():
+    assert table_options({'timePartitioning': {'type': 'DAY'}}, {}) == 'PARTITION BY _PARTITIONDATE'
+    assert table_options({'rangePartitioning': {
+        'field': 'EMPL_RCD', 'range': {'start': '0', 'end': '100', 'interval': '10'}}}, {}) == (
+        'PARTITION BY RANGE_BUCKET(EMPL_RCD, GENERATE_ARRAY(0, 100, 10))')
+
+
+def test_the_registry_keeps_a_history_of_each_change(tmp_path):
+    store = manifest_store(str(tmp_path))
+    registry = SchemaRegistry(store)
+    assert registry.register(SOURCE_TABLE, FIELDS) is None
+    assert registry.register(SOURCE_TABLE, FIELDS) == {'added': [], 'removed': [], 'changed': []}
+    changed = FIELDS[:2] + [bigquery_field('SEPCHK', 'smallint')]
+    assert registry.register(SOURCE_TABLE, changed) == {'added': ['SEPCHK'], 'removed': ['NET_PAY'], 'changed': []}
+    assert registry.fields(SOURCE_TABLE) == changed
+    # A second registry on the same store reads what the first wrote
+    history = SchemaRegistry(manifest_store(str(tmp_path))).store.read('schemas/' + SOURCE_TABLE)['history']
+    assert [entry['drift'] for entry in history] == [
+        None, {'added': ['SEPCHK'], 'removed': ['NET_PAY'], 'changed': []}]
+    assert registry.fields('AceIntegrationPROD09_GCP.PeopleSoft.dbo_PS_JOB') is None
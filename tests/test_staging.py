@@ -0,0 +1,83 @@
+"""Staging prefixes on a local directory standing in for the bucket."""
+import datetime
+import os
+
+from ace_hr.staging import STAGING_DIR, LocalStagingStore, cleanup, staging_prefix, sweep, usage
+
+NOW = datetime.datetime(2020, 1, 17, 12, 0)
+
+
+def stage(prefix, name, written=None, size=10):
+    """Writes a file of size bytes under prefix, last modified at written (UTC)."""
+    path = os.path.join(prefix, name)
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    if written is not None:
+        seconds = (written - datetime.datetime(1970, 1, 1)).total_seconds()
+        os.utime(path, (seconds, seconds))
+    return path
+
+
+def test_each_job_gets_its_own_prefix_and_retries_share_it(tmp_path):
+    location = str(tmp_path / 'load')
+    job = staging_prefix(location + '/', 'scheduled__2020-01-16T07:00:00', 'peoplesoft-dbo-ps-job')
+    assert job == '{}/{}/scheduled__2020-01-16T07:00:00/peoplesoft-dbo-ps-job/'.format(location, STAGING_DIR)
+    assert staging_prefix(location, 'scheduled__2020-01-16T07:00:00', 'peoplesoft-dbo-ps-job') == job
+    assert staging_prefix(location, 'scheduled__2020-01-17T07:00:00', 'peoplesoft-dbo-ps-job') != job
+    assert staging_prefix(location, 'scheduled__2020-01-16T07:00:00', 'peoplesoft-dbo-ps-dept-tbl') != job
+    assert staging_prefix(location, None, 'backfill-pay-check').endswith('/adhoc/backfill-pay-check/')
+
+
+def test_cleanup_removes_only_the_succeeded_job(tmp_path):
+    location = str(tmp_path)
+    succeeded = staging_prefix(location, 'run1', 'job-a')
+    running = staging_prefix(location, 'run1', 'job-b')
+    stage(succeeded, 'load/part-0.avro')
+    stage(succeeded, 'temp/staging.jar')
+    kept = stage(running, 'load/part-0.avro')
+    cleanup([succeeded], LocalStagingStore())
+    assert not os.path.exists(succeeded)
+    assert os.path.exists(kept)
+
+
+def test_a_failed_cleanup_is_left_to_the_sweeper(tmp_path):
+    class BrokenStore(LocalStagingStore):
+        def delete_prefix(self, prefix):
+            raise IOError('403 storage.objects.delete denied')
+
+    prefix = staging_prefix(str(tmp_path), 'run1', 'job-a')
+    stage(prefix, 'part-0.avro')
+    cleanup([prefix], BrokenStore())
+    assert os.path.exists(prefix)
+
+
+def test_sweep_removes_only_job_prefixes_idle_past_the_maximum_age(tmp_path):
+    location = str(tmp_path)
+    abandoned = staging_prefix(location, 'run1', 'job-a')
+    stage(abandoned, 'load/part-0.avro', NOW - datetime.timedelta(hours=30))
+    stage(abandoned, 'load/part-1.avro', NOW - datetime.timedelta(hours=26))
+    # Started long ago but still writing, so the newest object keeps it
+    active = staging_prefix(location, 'run1', 'job-b')
+    stage(active, 'load/part-0.avro', NOW - datetime.timedelta(hours=30))
+    stage(active, 'load/part-1.avro', NOW - datetime.timedelta(minutes=5))
+    legacy = stage(location, 'legacy/part-0.avro', NOW - datetime.timedelta(days=30))
+    store = LocalStagingStore()
+    assert sweep(location, 24, store, now=NOW) == [abandoned]
+    assert not os.path.exists(abandoned)
+    assert os.path.exists(active)
+    # Files outside the job prefixes are only reported, never swept
+    assert os.path.exists(legacy)
+    assert sweep(location, 24, store, now=NOW) == []
+
+
+def test_usage_counts_each_run_scope_and_the_legacy_files(tmp_path):
+    location = str(tmp_path)
+    stage(staging_prefix(location, 'run1', 'job-a'), 'part-0.avro', size=100)
+    stage(staging_prefix(location, 'run1', 'job-b'), 'part-0.avro', size=50)
+    stage(staging_prefix(location, 'run2', 'job-a'), 'part-0.avro', size=25)
+    stage(location, 'legacy/part-0.avro', size=5)
+    report = usage(location, LocalStagingStore())
+    assert (report['objects'], report['bytes']) == (4, 180)
+    assert report['scopes'] == {'run1': {'objects': 2, 'bytes': 150}, 'run2': {'objects': 1, 'bytes': 25}}
@@ -0,0 +1,149 @@
+"""StorageWriteSink on the offline write service: atomic commit and abort, offsets, type conversion."""
+import datetime
+import decimal
+import sqlite3
+
+import pytest
+
+from ace_hr.quality import DataQualityError, ExtractStats, source_count
+from ace_hr.storagewrite import InMemoryWriteService, StorageWriteSink, StreamOffsetError, convert_row, \
+    extract_rows
+
+TABLE = 'projects/amed-dev-analyticsplatform/datasets/HRPRD_SC/tables/dbo_PS_JOB'
+SCHEMA = [('EMPLID', 'STRING'), ('EMPL_RCD', 'INT64')]
+
+
+def rows(n, start=0):
+    return [{'EMPLID': str(i), 'EMPL_RCD': 0} for i in range(start, start + n)]
+
+
+def test_rows_appear_only_on_commit():
+    service = InMemoryWriteService()
+    with StorageWriteSink(service, TABLE, SCHEMA, batch_rows=3) as sink:
+        sink.write(rows(7))
+        # Two full batches are appended, but nothing is visible yet
+        assert sink.offset == 6
+        assert service.table_rows(TABLE) == []
+    assert len(service.table_rows(TABLE)) == 7
+    assert sink.offset == 7
+
+
+def test_failed_extract_leaves_the_table_unchanged():
+    service = InMemoryWriteService()
+    with StorageWriteSink(service, TABLE, SCHEMA) as sink:
+        sink.write(rows(2))
+    with pytest.raises(RuntimeError):
+        with StorageWriteSink(service, TABLE, SCHEMA, batch_rows=2) as sink:
+            sink.write(rows(5, start=2))
+            raise RuntimeError('source connection reset')
+    assert service.table_rows(TABLE) == [{'EMPLID': '0', 'EMPL_RCD': 0}, {'EMPLID': '1', 'EMPL_RCD': 0}]
+    # The abandoned stream is finalized and can never be committed afterwards
+    abandoned = sink.stream
+    with pytest.raises(StreamOffsetError):
+        service.append(abandoned, rows(1), 4)
+
+
+def test_a_failed_abort_does_not_hide_the_extract_failure():
+    class BrokenFinalize(InMemoryWriteService):
+        def finalize(self, stream):
+            raise IOError('503 finalize unavailable')
+
+    service = BrokenFinalize()
+    with pytest.raises(RuntimeError, match='source connection reset'):
+        with StorageWriteSink(service, TABLE, SCHEMA) as sink:
+            sink.write(rows(2))
+            raise RuntimeError('source connection reset')
+    assert service.table_rows(TABLE) == []
+
+
+def test_retried_append_cannot_write_rows_twice():
+    service = InMemoryWriteService()
+    stream = service.create_stream(TABLE)
+    service.append(stream, rows(3), 0)
+    # The first append landed but its response was lost; the retry reuses offset 0
+    with pytest.raises(StreamOffsetError, match='holds 3 rows'):
+        service.append(stream, rows(3), 0)
+    with pytest.raises(StreamOffsetError):
+        service.append(stream, rows(1), 5)
+    service.append(stream, rows(1, start=3), 3)
+    assert service.finalize(stream) == 4
+
+
+def test_commit_needs_finalized_streams_of_the_table():
+    service = InMemoryWriteService()
+    stream = service.create_stream(TABLE)
+    service.append(stream, rows(1), 0)
+    with pytest.raises(ValueError):
+        service.commit(TABLE, [stream])
+    service.finalize(stream)
+    with pytest.raises(ValueError):
+        service.commit(TABLE.replace('dbo_PS_JOB', 'dbo_PS_EMPLOYMENT'), [stream])
+    service.commit(TABLE, [stream])
+    with pytest.raises(ValueError):
+        service.commit(TABLE, [stream])
+    assert len(service.table_rows(TABLE)) == 1
+
+
+def test_values_are_converted_for_their_column_types():
+    schema = [('S', 'STRING'), ('I', 'INT64'), ('F', 'FLOAT64'), ('B', 'BOOL'), ('N', 'NUMERIC'),
+              ('D', 'DATE'), ('DT', 'DATETIME'), ('T', 'TIME'), ('TS', 'TIMESTAMP'), ('X', 'BYTES'),
+              ('MISSING', 'STRING')]
+    row = {'S': 12, 'I': decimal.Decimal('42'), 'F': decimal.Decimal('1.5'), 'B': 1,
+           'N': decimal.Decimal('1234.5600'), 'D': datetime.datetime(1970, 1, 11, 8, 30),
+           'DT': datetime.datetime(2020, 1, 17, 8, 30, 5), 'T': datetime.time(8, 30),
+           'TS': datetime.datetime(1970, 1, 1, 1, 0, 0, 250), 'X': b'\x00\x01', 'MISSING': None}
+    assert convert_row(schema, row) == {
+        'S': '12', 'I': 42, 'F': 1.5, 'B': True, 'N': '1234.5600', 'D': 10,
+        'DT': '2020-01-17 08:30:05', 'T': '08:30:00', 'TS': 3600000250, 'X': b'\x00\x01'}
+
+
+def test_timestamps_with_an_offset_are_stored_in_utc():
+    eastern = datetime.timezone(datetime.timedelta(hours=-5))
+    assert convert_row([('TS', 'TIMESTAMP')], {'TS': datetime.datetime(1970, 1, 1, 0, 0, tzinfo=eastern)}) == \
+        {'TS': 5 * 3600 * 1000000}
+
+
+def source(n, duplicate=False):
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE job (EMPLID TEXT, EMPL_RCD INTEGER)')
+    connection.executemany('INSERT INTO job VALUES (?, ?)', [(str(i), 0) for i in range(n)])
+    if duplicate:
+        connection.execute("INSERT INTO job VALUES ('0', 0)")
+    return connection
+
+
+def extract(connection, service):
+    # What python_extract does, against a local source and the offline service
+    query = 'SELECT EMPLID, EMPL_RCD FROM job'
+    stats = ExtractStats(('EMPLID', 'EMPL_RCD'))
+    expected = source_count(connection, query)
+    with StorageWriteSink(service, TABLE, SCHEMA, batch_rows=4) as sink:
+        batch = list(extract_rows(connection, query, fetch_size=4))
+        stats.update_rows(batch)
+        sink.write(batch)
+        stats.check(expected)
+    return sink.offset
+
+
+def test_extract_commits_when_quality_passes():
+    service = InMemoryWriteService()
+    assert extract(source(10), service) == 10
+    assert len(service.table_rows(TABLE)) == 10
+
+
+def test_extract_with_duplicate_keys_commits_nothing():
+    service = InMemoryWriteService()
+    with pytest.raises(DataQualityError, match='duplicate keys'):
+        extract(source(10, duplicate=True), service)
+    assert service.table_rows(TABLE) == []
+
+
+def test_proto_encoding_round_trips():
+    pytest.importorskip('google.protobuf')
+    from ace_hr.storagewrite import ProtoRowEncoder
+    schema = [('EMPLID', 'STRING'), ('EMPL_RCD', 'INT64'), ('EFFDT', 'DATE'), ('ANNUAL_RT', 'NUMERIC')]
+    encoder = ProtoRowEncoder(schema)
+    row = convert_row(schema, {'EMPLID': 'E1', 'EMPL_RCD': 0, 'EFFDT': datetime.date(2020, 1, 1),
+                               'ANNUAL_RT': decimal.Decimal('52000.000')})
+    decoded = encoder.message_class.FromString(encoder.encode([row])[0])
+    assert (decoded.EMPLID, decoded.EMPL_RCD, decoded.EFFDT, decoded.ANNUAL_RT) == ('E1', 0, 18262, '52000.000')